@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApplicantsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.applicants"
+
+    def ready(self):
+        # registering the signal receivers for the applicants_count counter
+        from apps.applicants import receivers  # noqa: F401
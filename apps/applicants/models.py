@@ -1,5 +1,6 @@
 import uuid
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 from apps.applicants import constants
@@ -16,6 +17,12 @@ class Applicants(models.Model):
 
     class Meta:
         db_table = "tbl_applicants"
+        indexes = [
+            # applied jobs of a job seeker newest first, ApplicationStats
+            models.Index(fields=["user", "-created_at"], name="applicant_user_created_idx"),
+            # applicants of a job by status, CompanyStats
+            models.Index(fields=["job", "status"], name="applicant_job_status_idx"),
+        ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
@@ -32,3 +39,20 @@ class Applicants(models.Model):
     # all the application on that particular case will be gone
     is_deleted = models.BooleanField(default=False, null=True, editable=False)
     is_active = models.BooleanField(default=True, null=True)
+
+
+class ArchivedApplicant(models.Model):
+    """
+    Cold storage for the applications of archived jobs,
+    see apps.jobs.models.ArchivedJob
+    """
+
+    class Meta:
+        db_table = "tbl_applicants_archive"
+
+    id = models.UUIDField(primary_key=True)
+    job_id = models.UUIDField(db_index=True)
+    user_id = models.UUIDField(db_index=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
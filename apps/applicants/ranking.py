@@ -0,0 +1,64 @@
+"""
+Skill match scores of the applicants of a job, for employers ranking them.
+
+The scores of all the applicants of a job are computed at once by
+score_applicants and cached in Django's cache. The cached scores are
+reused until the job is saved (its updated_at moves), the profile of one
+of its applicants is saved (the latest of their updated_at moves) or the
+job gets an applicant the scores don't cover.
+"""
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.applicants.models import Applicants
+from apps.jobs.recommendations.applicants import score_applicants
+
+# seconds the scores of a job stay cached
+SCORES_TIMEOUT = 60 * 60
+
+
+def _scores_key(job_id):
+    return f"applicants:scores:{job_id}"
+
+
+def applicant_scores(job, applicant_ids, profiles_updated_at):
+    """
+    Return the score of every application in applicant_ids, the ids of
+    the applications to job, a dict with its pk, skills_required,
+    experience and updated_at. profiles_updated_at is the latest
+    updated_at of the applicants' profiles.
+    """
+
+    version = (job["updated_at"], profiles_updated_at)
+    cached = cache.get(_scores_key(job["pk"]))
+    if cached is not None and cached["version"] == version:
+        scores = cached["scores"]
+        if all(applicant_id in scores for applicant_id in applicant_ids):
+            return scores
+
+    applicants = list(
+        Applicants.objects.filter(job_id=job["pk"]).values(
+            "id", "user__experience", "user__professional_skills"
+        )
+    )
+    vector = score_applicants(
+        job["skills_required"],
+        job["experience"],
+        [
+            {
+                "experience": applicant["user__experience"],
+                "professional_skills": applicant["user__professional_skills"],
+            }
+            for applicant in applicants
+        ],
+        timezone.now().year,
+    )
+    scores = {
+        applicant["id"]: float(score) for applicant, score in zip(applicants, vector)
+    }
+
+    cache.set(
+        _scores_key(job["pk"]), {"version": version, "scores": scores}, SCORES_TIMEOUT
+    )
+    return scores
@@ -0,0 +1,36 @@
+"""
+Signal receivers keeping Job.applicants_count in step with tbl_applicants.
+
+The counter is changed with a single UPDATE ... SET applicants_count =
+applicants_count +/- 1, so concurrent applications never lose an increment.
+"""
+
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.applicants.models import Applicants
+from apps.jobs.models import Job
+
+
+@receiver(post_save, sender=Applicants)
+def increment_applicants_count(sender, instance, created, **kwargs):
+    """Count a new application against its job"""
+
+    if created:
+        Job.all_objects.filter(pk=instance.job_id).update(
+            applicants_count=F("applicants_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Applicants)
+def decrement_applicants_count(sender, instance, origin=None, **kwargs):
+    """Remove a deleted application from its job's count"""
+
+    if (origin.model if isinstance(origin, QuerySet) else type(origin)) is Job:
+        # deleted with its job, there is no count left to keep
+        return
+
+    Job.all_objects.filter(pk=instance.job_id, applicants_count__gt=0).update(
+        applicants_count=F("applicants_count") - 1
+    )
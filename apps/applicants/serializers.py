@@ -22,6 +22,10 @@ class ApplicantModelSerializer(serializers.Serializer):
     status = serializers.CharField()
 
 
+class RankedApplicantSerializer(ApplicantModelSerializer):
+    match_score = serializers.FloatField()
+
+
 class ApplyToJobSerializer(serializers.Serializer):
     job_id = serializers.CharField(required=True)
 
@@ -1,3 +1,210 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.applicants.models import Applicants
+from apps.applicants.serializers import AppliedJobSerializer
+from apps.jobs.models import Company, Job
+from apps.userprofile.models import UserProfile
+
+
+class ApplicantsCountTestCase(TestCase):
+    def setUp(self):
+        employer = User.objects.create_user(
+            email="employer@testing.com", name="Employer", user_type="Employer"
+        )
+        company = Company.objects.create(
+            creator=employer,
+            name="Testing name",
+            location="Testing Location",
+            about="Testing about",
+            founded_year=2011,
+        )
+        self.job = Job.objects.create(
+            company=company,
+            employer=employer,
+            job_role="Security Engineer",
+            location="Remote",
+            job_type="full time",
+            vacancy_position=1,
+            industry="Security",
+        )
+
+        self.job_seeker = User.objects.create_user(
+            email="seeker@testing.com", name="Seeker", user_type="Job Seeker"
+        )
+        self.job_seeker.is_profile_completed = True
+        self.job_seeker.save()
+        self.profile = UserProfile.objects.create(user=self.job_seeker)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.job_seeker)
+
+    def test_apply_and_delete_keep_the_counter_in_sync(self):
+        response = self.client.post("/apply/job", {"job_id": str(self.job.job_id)})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applicants_count, 1)
+
+        response = self.client.get(f"/jobs/{self.job.job_id}/")
+        self.assertEqual(response.data["total_applicants"], 1)
+        self.assertTrue(response.data["has_applied"])
+
+        Applicants.objects.get(job=self.job).delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applicants_count, 0)
+
+    def test_has_applied_is_resolved_for_the_listed_jobs(self):
+        other_job = Job.objects.create(
+            company=self.job.company,
+            employer=self.job.employer,
+            job_role="SOC Analyst",
+            location="Remote",
+            job_type="full time",
+            vacancy_position=1,
+            industry="Security",
+        )
+        Applicants.objects.create(job=self.job, user=self.profile)
+
+        response = self.client.get("/jobs/")
+        has_applied = {job["job_id"]: job["has_applied"] for job in response.data["results"]}
+        self.assertEqual(
+            has_applied, {str(self.job.job_id): True, str(other_job.job_id): False}
+        )
+
+        self.client.force_authenticate(None)
+        response = self.client.get("/jobs/")
+        self.assertNotIn("has_applied", response.data["results"][0])
+
+    def test_rebuild_command_repairs_drifted_counts(self):
+        Applicants.objects.create(job=self.job, user=self.profile)
+        Job.objects.filter(pk=self.job.pk).update(applicants_count=42)
+
+        call_command("rebuild_applicant_counts", batch_size=1, stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applicants_count, 1)
+
+    def test_applied_jobs_match_the_model_serializer(self):
+        Applicants.objects.create(job=self.job, user=self.profile)
+
+        response = self.client.get("/applied_jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        applicants = Applicants.objects.filter(user=self.profile).order_by("-created_at")
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render(AppliedJobSerializer(applicants, many=True).data),
+        )
+
+
+class RankedApplicantsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email="employer@testing.com", name="Employer", user_type="Employer"
+        )
+        self.employer.is_profile_completed = True
+        self.employer.save()
+        company = Company.objects.create(
+            creator=self.employer,
+            name="Testing name",
+            location="Testing Location",
+            about="Testing about",
+            founded_year=2011,
+        )
+        self.job = Job.objects.create(
+            company=company,
+            employer=self.employer,
+            job_role="Penetration Tester",
+            location="Remote",
+            job_type="full time",
+            vacancy_position=1,
+            industry="Security",
+            skills_required="burp suite, nmap, python",
+            experience=3,
+        )
+
+        year = timezone.now().year
+        self.profiles = {}
+        for name, experience, skills in (
+            ("Partial", "3", [("python", 4, year)]),
+            ("Expert", "5", [("burp suite", 4, year), ("nmap", 3, year), ("python", 2, year)]),
+            ("Junior", "0", [("burp suite", 1, year), ("nmap", 1, year), ("python", 1, year)]),
+            ("Unrelated", "8", [("figma", 6, year)]),
+        ):
+            seeker = User.objects.create_user(
+                email=f"{name.lower()}@testing.com", name=name, user_type="Job Seeker"
+            )
+            profile = UserProfile.objects.create(
+                user=seeker,
+                experience=experience,
+                professional_skills=[
+                    {"skill_name": skill, "total_yoe": total_yoe, "last_used": last_used}
+                    for skill, total_yoe, last_used in skills
+                ],
+            )
+            Applicants.objects.create(job=self.job, user=profile)
+            self.profiles[name] = profile
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def ranked(self):
+        response = self.client.get(f"/applicants/{self.job.job_id}/ranked")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [applicant["user"]["user"]["name"] for applicant in response.data["results"]]
+
+    def test_applicants_are_ranked_by_skill_match_and_experience(self):
+        self.assertEqual(self.ranked(), ["Expert", "Junior", "Partial", "Unrelated"])
+
+        response = self.client.get(f"/applicants/{self.job.job_id}/ranked?limit=1&offset=1")
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(response.data["results"][0]["user"]["user"]["name"], "Junior")
+        self.assertEqual(response.data["results"][0]["match_score"], 0.6188)
+
+        other_employer = User.objects.create_user(
+            email="other@testing.com", name="Other", user_type="Employer"
+        )
+        other_employer.is_profile_completed = True
+        other_employer.save()
+        self.client.force_authenticate(other_employer)
+        response = self.client.get(f"/applicants/{self.job.job_id}/ranked")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_scores_are_cached_until_the_job_or_a_profile_changes(self):
+        self.ranked()
+        with self.assertNumQueries(3):
+            # the job, the applicant ids and the page
+            self.ranked()
+
+        # profiles of people who did not apply don't matter
+        UserProfile.objects.create(
+            user=User.objects.create_user(
+                email="bystander@testing.com", name="Bystander", user_type="Job Seeker"
+            )
+        )
+        with self.assertNumQueries(3):
+            self.ranked()
+
+        profile = self.profiles["Unrelated"]
+        profile.experience = "3"
+        profile.professional_skills = [
+            {"skill_name": "burp suite", "total_yoe": 9, "last_used": timezone.now().year},
+            {"skill_name": "nmap", "total_yoe": 9, "last_used": timezone.now().year},
+            {"skill_name": "python", "total_yoe": 9, "last_used": timezone.now().year},
+        ]
+        profile.save()
+        self.assertEqual(self.ranked()[0], "Unrelated")
 
-# Create your tests here.
+        self.job.skills_required = "python"
+        self.job.save()
+        self.assertEqual(self.ranked(), ["Partial", "Unrelated", "Expert", "Junior"])
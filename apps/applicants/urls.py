@@ -3,12 +3,18 @@ from django.urls import path
 from apps.applicants.views import (
     AllApplicantsOfCompany,
     ApplyToJob,
+    RankedApplicantsOfJob,
     UpdateApplicationStatus, GetAppliedJobs,
     ApplicationStats
 )
 
 urlpatterns = [
     path("applicants/", AllApplicantsOfCompany.as_view(), name="applicants"),
+    path(
+        "applicants/<uuid:job_id>/ranked",
+        RankedApplicantsOfJob.as_view(),
+        name="rankedapplicants",
+    ),
     path("applied_jobs/",GetAppliedJobs.as_view(), name="applied_jobs"),
     path("apply/job", ApplyToJob.as_view(), name="applytojob"),
     path(
@@ -2,19 +2,24 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import exceptions, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.db.models import Count, Q
 
 from apps.accounts.permissions import IsEmployer, IsJobSeeker, IsProfileCompleted
 from apps.applicants.models import Applicants
+from apps.applicants.ranking import applicant_scores
 from apps.applicants.serializers import (
     ApplicantModelSerializer,
     ApplyToJobSerializer,
+    RankedApplicantSerializer,
     UpdateApplicationStatusSerializer, AppliedJobSerializer,
     ApplicationStatsResponseSerializer
 )
 from apps.jobs.models import Job
 from apps.userprofile.models import UserProfile
+from apps.utils.pagination import DefaultPagination
 from apps.utils.responses import InternalServerError
+from apps.utils.serializers import ValuesSerializer
 
 
 class AllApplicantsOfCompany(APIView):
@@ -37,6 +42,58 @@ class AllApplicantsOfCompany(APIView):
         )
 
 
+class RankedApplicantsOfJob(APIView):
+    """
+    Applicants of one of the employer's jobs, best skill match first.
+
+    Every applicant's professional skills and experience are scored
+    against the job's skills_required and experience, see
+    apps.applicants.ranking. The ranking is paginated, only the profiles
+    of the page are read.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEmployer, IsProfileCompleted]
+    pagination_class = DefaultPagination
+
+    @extend_schema(
+        responses={200: RankedApplicantSerializer(many=True)}, tags=["applications"]
+    )
+    def get(self, request, job_id):
+        job = (
+            Job.all_objects.filter(pk=job_id, employer=request.user)
+            .values("pk", "skills_required", "experience", "updated_at")
+            .first()
+        )
+        if job is None:
+            raise exceptions.NotFound()
+
+        applications = list(
+            Applicants.objects.filter(job_id=job_id)
+            .order_by("created_at", "id")
+            .values_list("id", "user__updated_at")
+        )
+        applicant_ids = [applicant_id for applicant_id, _ in applications]
+        scores = applicant_scores(
+            job,
+            applicant_ids,
+            max((updated_at for _, updated_at in applications), default=None),
+        )
+        # equal scores are ranked by application time, so pages are stable
+        ranked = sorted(applicant_ids, key=lambda applicant_id: -scores[applicant_id])
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(ranked, request, view=self)
+        applicants = Applicants.objects.select_related("job", "user__user").in_bulk(page)
+        for applicant_id in page:
+            applicants[applicant_id].match_score = round(scores[applicant_id], 4)
+
+        return paginator.get_paginated_response(
+            RankedApplicantSerializer(
+                [applicants[applicant_id] for applicant_id in page], many=True
+            ).data
+        )
+
+
 class ApplyToJob(APIView):
     """Apply to a job"""
 
@@ -50,6 +107,7 @@ class ApplyToJob(APIView):
         # fetching job and user profile to create an application
         user_profile = UserProfile.objects.get(user_id=request.user.id)
         try:
+            # soft deleted jobs can't be applied to
             job = Job.objects.get(job_id=serializer.data["job_id"])
         except Job.DoesNotExist:
             raise exceptions.NotFound()
@@ -61,8 +119,11 @@ class ApplyToJob(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        application = Applicants(job=job, user=user_profile)
-        application.save()
+        # the application and the job's applicants_count increment
+        # are committed together
+        with transaction.atomic():
+            application = Applicants(job=job, user=user_profile)
+            application.save()
 
         return Response(
             {"msg": "Created", "application_id": application.id},
@@ -122,8 +183,11 @@ class GetAppliedJobs(APIView):
                 )
         else:
             applicants = Applicants.objects.filter(user_id=user_id).order_by('-created_at')
+            # rendered from values() rows joined with the job,
+            # instead of one Job query per application
+            serializer = ValuesSerializer(AppliedJobSerializer())
             return Response(
-                AppliedJobSerializer(applicants, many=True).data,
+                serializer.serialize(serializer.values(applicants)),
                 status=status.HTTP_200_OK
             )
 
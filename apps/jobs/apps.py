@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.jobs"
+
+    def ready(self):
+        # registering the signal receivers keeping caches in sync with the jobs
+        from apps.jobs import receivers  # noqa: F401
+        from apps.jobs import cache
+
+        cache.check_shared_backend()
@@ -0,0 +1,182 @@
+"""
+Versioned response cache for anonymous job reads.
+
+Rendered responses are stored in Django's cache under a key built from the
+scheme, host and path (paginated bodies hold absolute next/previous links),
+the normalized query string, the negotiated media type and a version
+counter per table the response depends on. Writes never delete cache
+entries, they bump the version of the table they touched (see receivers.py),
+which makes every key built with the old version unreachable. Stale entries
+then simply expire.
+"""
+
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+JOB = "job"
+COMPANY = "company"
+APPLICANTS = "applicants"
+TABLES = (JOB, COMPANY, APPLICANTS)
+
+HITS = "hits"
+MISSES = "misses"
+
+CACHE_HEADER = "X-Cache"
+
+# backends whose entries are not seen by other processes
+LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def check_shared_backend():
+    """
+    Refuse a process local cache backend: every worker would keep its own
+    versions and never see the writes of the others
+    """
+
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend in LOCAL_BACKENDS and not settings.JOBS_CACHE_ALLOW_LOCAL:
+        raise ImproperlyConfigured(
+            f"{backend} is local to each process, the job cache versions need a "
+            "shared cache backend. Set CACHE_BACKEND and CACHE_LOCATION, or "
+            "JOBS_CACHE_ALLOW_LOCAL=True for a single process."
+        )
+
+
+def _version_key(table):
+    return f"jobs:version:{table}"
+
+
+def _stats_key(outcome):
+    return f"jobs:response-cache:{outcome}"
+
+
+def _increment(key, initial):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # key is missing or was evicted
+        cache.add(key, initial, timeout=None)
+        return cache.get(key, initial)
+
+
+def get_versions(tables=TABLES):
+    """Return the current version of every table in tables"""
+
+    keys = [_version_key(table) for table in tables]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # a version that disappeared restarts from the clock, so it can
+            # never collide with a version a cached entry was built with
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_version(table):
+    """Invalidate every cached response that depends on table"""
+
+    _increment(_version_key(table), time.time_ns())
+
+
+def record(outcome):
+    _increment(_stats_key(outcome), 1)
+
+
+def get_stats():
+    """Return the hit/miss counters of the response cache"""
+
+    counters = cache.get_many([_stats_key(HITS), _stats_key(MISSES)])
+    hits = counters.get(_stats_key(HITS), 0)
+    misses = counters.get(_stats_key(MISSES), 0)
+    total = hits + misses
+
+    return {
+        HITS: hits,
+        MISSES: misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+        "versions": dict(zip(TABLES, get_versions())),
+    }
+
+
+def normalize_query(query_params):
+    """Return the query string with keys and values sorted and blanks dropped"""
+
+    items = sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        for value in values
+        if value != ""
+    )
+    return urlencode(items)
+
+
+def build_key(request, tables=TABLES):
+    versions = ":".join(str(version) for version in get_versions(tables))
+    digest = hashlib.sha1(
+        "|".join(
+            [
+                request.scheme,
+                request.get_host(),
+                request.path,
+                normalize_query(request.query_params),
+                str(request.accepted_media_type),
+                versions,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"jobs:response:{digest}"
+
+
+def lookup(request):
+    """
+    Return the cached response for an anonymous GET, or None.
+
+    On a miss the key is remembered on the request so store() can fill
+    it once the response has been rendered.
+    """
+
+    if request.method != "GET" or request.user.is_authenticated:
+        return None
+
+    key = build_key(request)
+    cached = cache.get(key)
+    if cached is None:
+        request.response_cache_key = key
+        record(MISSES)
+        return None
+
+    record(HITS)
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response[CACHE_HEADER] = "HIT"
+    return response
+
+
+def store(request, response):
+    """Cache the rendered bytes of a response looked up with lookup()"""
+
+    key = getattr(request, "response_cache_key", None)
+    if key is None or not isinstance(response, Response) or response.status_code != 200:
+        return response
+
+    response.render()
+    cache.set(
+        key,
+        (response.content, response["Content-Type"]),
+        timeout=settings.JOBS_RESPONSE_CACHE_TIMEOUT,
+    )
+    response[CACHE_HEADER] = "MISS"
+    return response
@@ -39,6 +39,32 @@ trending_keywords = [
     "SOC Analyst",
 ]
 
+# live trending keywords, see apps/jobs/utils/trending.py
+TRENDING_KEYWORDS_LIMIT = len(trending_keywords)
+TRENDING_KEYWORDS_CAPACITY = 200  # keywords tracked in memory per worker
+TRENDING_KEYWORDS_HALF_LIFE = 6 * 60 * 60  # seconds for a search to lose half its weight
+TRENDING_KEYWORDS_FLUSH_INTERVAL = 60  # seconds between flushes to the database
+TRENDING_KEYWORDS_CACHE_TIMEOUT = 60  # seconds the top keywords are cached
+
+# fields of a job combined into its "description" block
+JOB_DESCRIPTION_FIELDS = (
+    "about",
+    "job_responsibilities",
+    "skills_required",
+    "education_or_certifications",
+)
+
+# ?view=summary on /jobs/ returns the slim list representation
+SUMMARY_VIEW = "summary"
+
+# experience facet of /jobs/facets, (name, min years, max years or None)
+EXPERIENCE_BUCKETS = (
+    ("0-1", 0, 1),
+    ("2-4", 2, 4),
+    ("5-9", 5, 9),
+    ("10+", 10, None),
+)
+
 EMPLOYER_ID = "employer_id"
 USER_ID = "user_id"
 JOB_ID = "job_id"
@@ -53,6 +79,8 @@ PROFILE_PICTURE_DOCUMENT_TYPE = "profile_picture"
 COVER_LETTER_DOCUMENT_TYPE = "cover_letter"
 
 ITEMS_PER_PAGE = 5
+PAGINATION_QUERY_PARAM = "pagination"
+CURSOR_PAGINATION = "cursor"
 PAST_3_WEEK_DATETIME_DAYS18 = 18
 
 EMPLOYER = "Employer"
@@ -74,3 +102,34 @@ WORK_EXPERIENCE_OPTIONAL_FIELDS = {
     FOUND_THROUGH_NULL: False,
     COMPANY_ID: "N/A",
 }
+
+JOBS_BULK_CREATE_LIMIT = 1000  # postings accepted by one POST /jobs/bulk
+JOBS_BULK_CREATE_BATCH_SIZE = 500  # rows per INSERT statement
+JOBS_BULK_UPDATE_LIMIT = 1000  # job ids accepted by one POST /jobs/bulk_status
+
+# operations of POST /jobs/bulk_status and the outcome reported per job id
+CLOSE_JOBS = "close"
+DELETE_JOBS = "delete"
+JOB_CLOSED = "closed"
+JOB_DELETED = "deleted"
+JOB_ALREADY_CLOSED = "already_closed"
+JOB_ALREADY_DELETED = "already_deleted"
+JOB_NOT_FOUND = "not_found"
+JOB_FORBIDDEN = "forbidden"
+
+JOBS_ARCHIVE_AFTER_DAYS = 90  # days a soft deleted job stays in tbl_job
+
+SEARCH_MODE_QUERY_PARAM = "search_mode"
+FUZZY_SEARCH = "fuzzy"  # ?search_mode=fuzzy tolerates misspelled words
+JOBS_AUTOCOMPLETE_LIMIT = 10  # suggestions returned by default
+JOBS_AUTOCOMPLETE_MAX_LIMIT = 50
+JOBS_RECOMMENDED_MAX_RESULTS = 200  # best matching jobs kept for /jobs/recommended
+JOBS_SIMILAR_LIMIT = 10  # jobs returned by /jobs/{id}/similar
+ALLOW_DUPLICATE_QUERY_PARAM = "allow_duplicate"  # ?allow_duplicate=true posts a repost anyway
+# /jobs/export formats, not ?format= which DRF keeps for choosing a renderer
+EXPORT_FORMAT_QUERY_PARAM = "export_format"
+NDJSON_EXPORT = "ndjson"
+CSV_EXPORT = "csv"
+EXPORT_FORMATS = (NDJSON_EXPORT, CSV_EXPORT)
+EXPORT_CONTENT_TYPES = {NDJSON_EXPORT: "application/x-ndjson", CSV_EXPORT: "text/csv"}
+JOBS_EXPORT_CHUNK_SIZE = 2000  # rows fetched from the database at a time
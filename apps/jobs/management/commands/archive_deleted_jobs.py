@@ -0,0 +1,106 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.applicants.models import Applicants, ArchivedApplicant
+from apps.jobs.constants import values
+from apps.jobs.models import ArchivedJob, Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Move jobs soft deleted more than --days days ago, together with "
+        "their applications, from tbl_job and tbl_applicants to the "
+        "tbl_job_archive and tbl_applicants_archive cold tables. Jobs are "
+        "moved in batches, each copied and deleted in one short "
+        "transaction, so an interrupted run is resumed by running it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=values.JOBS_ARCHIVE_AFTER_DAYS,
+            help="Days since deletion after which a job is archived (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of jobs moved per transaction (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        # soft deletes set updated_at, which is then taken as the deletion
+        # time, see ArchivedJob.deleted_at
+        deleted = Job.all_objects.filter(is_deleted=True, updated_at__lt=cutoff)
+
+        total_jobs = total_applications = 0
+        started = time.perf_counter()
+        while True:
+            job_ids = list(
+                deleted.order_by("updated_at", "job_id").values_list("job_id", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not job_ids:
+                break
+
+            with transaction.atomic():
+                jobs = list(
+                    deleted.select_for_update().filter(job_id__in=job_ids).values()
+                )
+                job_ids = [job["job_id"] for job in jobs]
+                applications = list(Applicants.objects.filter(job_id__in=job_ids).values())
+
+                ArchivedJob.objects.bulk_create(
+                    [
+                        ArchivedJob(
+                            job_id=job["job_id"],
+                            company_id=job["company_id"],
+                            employer_id=job["employer_id"],
+                            created_at=job["created_at"],
+                            deleted_at=job["updated_at"],
+                            data=job,
+                        )
+                        for job in jobs
+                    ]
+                )
+                ArchivedApplicant.objects.bulk_create(
+                    [
+                        ArchivedApplicant(
+                            id=application["id"],
+                            job_id=application["job_id"],
+                            user_id=application["user_id"],
+                            created_at=application["created_at"],
+                            data=application,
+                        )
+                        for application in applications
+                    ]
+                )
+
+                # deleting through the ORM runs the receivers keeping the
+                # category rollup and the response cache in sync, the
+                # applications go with the cascade
+                Job.all_objects.filter(job_id__in=job_ids).delete()
+
+            total_jobs += len(jobs)
+            total_applications += len(applications)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Archived {total_jobs} jobs and {total_applications} applications "
+                f"({total_jobs / elapsed:.0f} jobs/s)"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done, {total_jobs} jobs deleted before {cutoff.isoformat()} and "
+                f"{total_applications} applications archived"
+            )
+        )
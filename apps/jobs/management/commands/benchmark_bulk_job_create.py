@@ -0,0 +1,73 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.jobs.models import Job
+from apps.jobs.utils import benchmarking
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare creating job postings one POST /jobs/ at a time with a "
+        "single POST /jobs/bulk. Data is seeded in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        rng = random.Random(0)
+
+        with benchmarking.rolled_back():
+            employer = benchmarking.seed(jobs=0, companies=1, job_seekers=0)["employers"][0]
+            User.objects.filter(pk=employer.pk).update(is_profile_completed=True)
+            employer.refresh_from_db()
+
+            client = APIClient(HTTP_HOST="localhost")
+            client.force_authenticate(employer)
+
+            postings = [self.posting(rng) for _ in range(items)]
+            self.stdout.write(f"{items} postings\n")
+
+            with CaptureQueriesContext(connection) as queries, benchmarking.timer() as elapsed:
+                for posting in postings:
+                    client.post("/jobs/", dict(posting), format="json")
+            self.report("one POST /jobs/ per posting", items, elapsed, queries)
+
+            with CaptureQueriesContext(connection) as queries, benchmarking.timer() as elapsed:
+                response = client.post("/jobs/bulk/", postings, format="json")
+            self.report("POST /jobs/bulk", items, elapsed, queries)
+
+            created = Job.objects.filter(employer=employer).count()
+            self.stdout.write(f"\nstatus {response.status_code}, {created} jobs in the table")
+
+    @staticmethod
+    def posting(rng):
+        job = benchmarking.build_job(None, None, rng)
+        return {
+            field: getattr(job, field)
+            for field in (
+                "job_role",
+                "location",
+                "experience",
+                "job_type",
+                "vacancy_position",
+                "industry",
+                "category",
+                "is_featured",
+                "skills_required",
+                "about",
+            )
+        }
+
+    def report(self, title, items, elapsed, queries):
+        seconds = elapsed["seconds"]
+        self.stdout.write(
+            f"{title:30} {seconds * 1000:10.1f} ms   {items / seconds:>9.0f} postings/s"
+            f"   {len(queries):>6} queries"
+        )
@@ -0,0 +1,108 @@
+import math
+import random
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.jobs.constants import values
+from apps.jobs.models import Job
+from apps.jobs.recommendations import skill_matrix
+from apps.jobs.recommendations.recommender import JobRecommender
+from apps.jobs.recommendations.skills import parse_skills, profile_skills, to_number
+from apps.jobs.utils import benchmarking
+from apps.userprofile.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Time /jobs/recommended scoring on --jobs postings: building the "
+        "skill matrix, refreshing it after a job changed, and ranking the "
+        "jobs of a profile with the vectorized matrix-vector product next "
+        "to the same scoring done job by job in Python. Data is seeded in "
+        "a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=100000)
+        parser.add_argument("--profiles", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+
+        with benchmarking.rolled_back():
+            benchmarking.seed(jobs=options["jobs"], companies=50, job_seekers=options["profiles"])
+            Job.objects.update(is_active=True)
+            profiles = list(
+                UserProfile.objects.values("experience", "professional_skills")[
+                    : options["profiles"]
+                ]
+            )
+            self.stdout.write(f"{options['jobs']} active jobs, {len(profiles)} profiles\n")
+
+            recommender = JobRecommender()
+            with benchmarking.timer() as elapsed:
+                recommender.sync()
+            matrix = recommender.matrix
+            self.stdout.write(
+                f"matrix built in {elapsed['seconds']:.2f}s, {len(matrix.columns)} skills, "
+                f"{matrix.entries} entries"
+            )
+
+            job = Job.objects.first()
+            with benchmarking.timer() as elapsed:
+                job.skills_required += ", threat hunting"
+                recommender.index_jobs([job])
+                matrix.refresh()
+            self.stdout.write(
+                f"job updated and weights refreshed in {elapsed['seconds'] * 1000:.1f} ms\n"
+            )
+
+            timings = []
+            for profile in profiles:
+                with benchmarking.timer() as elapsed:
+                    recommender.recommend(profile, limit=values.JOBS_RECOMMENDED_MAX_RESULTS)
+                timings.append(elapsed["seconds"] * 1000)
+            self.report("matrix-vector product", timings)
+
+            rows = {
+                job_id: (parse_skills(skills), experience)
+                for job_id, skills, experience in Job.objects.values_list(
+                    "pk", "skills_required", "experience"
+                )
+            }
+            timings = []
+            for profile in rng.sample(profiles, min(len(profiles), 5)):
+                with benchmarking.timer() as elapsed:
+                    self.score_in_python(matrix, rows, profile)
+                timings.append(elapsed["seconds"] * 1000)
+            self.report("job by job in Python", timings)
+
+    @staticmethod
+    def score_in_python(matrix, rows, profile):
+        skills = profile_skills(profile["professional_skills"], timezone.now().year)
+        experience = to_number(profile["experience"])
+        idf = {skill: matrix.idf[column] for skill, column in matrix.columns.items()}
+        query_norm = sum((weight * idf.get(skill, 0)) ** 2 for skill, weight in skills.items())
+
+        scores = []
+        for job_id, (job_skills, job_experience) in rows.items():
+            dot = sum(skills.get(skill, 0) * idf[skill] ** 2 for skill in job_skills)
+            if dot:
+                norm = sum(idf[skill] ** 2 for skill in job_skills) ** 0.5
+                surplus = experience - job_experience
+                if surplus >= 0:
+                    fit = max(1 - surplus * skill_matrix.EXPERIENCE_SURPLUS_PENALTY, 0.5)
+                else:
+                    fit = math.exp(surplus / skill_matrix.EXPERIENCE_SHORTFALL_SCALE)
+                blend = 1 - skill_matrix.EXPERIENCE_FIT_WEIGHT * (1 - fit)
+                scores.append((dot / norm / query_norm**0.5 * blend, job_id))
+        scores.sort(reverse=True)
+        return scores[: values.JOBS_RECOMMENDED_MAX_RESULTS]
+
+    def report(self, title, timings):
+        timings.sort()
+        self.stdout.write(
+            f"{title:25} p50 {statistics.median(timings):8.2f} ms"
+            f"   p95 {timings[max(int(len(timings) * 0.95) - 1, 0)]:8.2f} ms"
+        )
@@ -0,0 +1,148 @@
+import random
+import statistics
+import string
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.jobs.models import Job
+from apps.jobs.search.backends import InvertedIndexBackend
+from apps.jobs.utils import benchmarking
+
+QUERIES = [
+    "python",
+    "security engineer",
+    "remote",
+    "malware analyst bangalore",
+    "kubernetes aws",
+    "reverse engineering",
+    "pen",
+    "threat incident response",
+]
+MISSPELLED = [
+    "pyhton",
+    "secrity enginer",
+    "devloper",
+    "malwar analist",
+    "kubernets",
+    "penetraton",
+    "compny",
+]
+PREFIXES = ["s", "se", "sec", "ana", "pu", "comp", "new y"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the search backend with the icontains scan of the old "
+        "SearchFilter on --jobs postings: index build time, then p50/p95 "
+        "latency of a search returning the ids of a first page. The index "
+        "keeps the JOBS_SEARCH_MAX_RESULTS most relevant matches. The "
+        "latency of fuzzy searches for misspelled words and of autocomplete "
+        "suggestions is reported too. --words synthetic words are spread "
+        "over the skills, for a realistic vocabulary. Data is "
+        "seeded in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=100000)
+        parser.add_argument("--words", type=int, default=20000)
+        parser.add_argument("--rounds", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=10)
+
+    def handle(self, *args, **options):
+        rounds, page_size = options["rounds"], options["page_size"]
+
+        with benchmarking.rolled_back():
+            benchmarking.seed(jobs=options["jobs"], companies=50, job_seekers=0)
+            self.add_vocabulary(options["words"])
+            self.stdout.write(f"{options['jobs']} jobs, {rounds} rounds per query\n")
+
+            backend = InvertedIndexBackend()
+            with benchmarking.timer() as elapsed:
+                backend.sync()
+            self.stdout.write(
+                f"index built in {elapsed['seconds']:.2f}s, "
+                f"{len(backend.index.terms)} terms\n"
+            )
+
+            def icontains(*fields):
+                def search(query):
+                    condition = Q()
+                    for term in query.split():
+                        matches = Q()
+                        for field in fields:
+                            matches |= Q(**{f"{field}__icontains": term})
+                        condition &= matches
+                    jobs = Job.objects.filter(condition)
+                    return jobs.count(), list(
+                        jobs.order_by("-created_at").values_list("pk", flat=True)[:page_size]
+                    )
+
+                return search
+
+            def indexed(fuzzy):
+                def search(query):
+                    # as JobSearchFilter, the ranked ids are intersected with tbl_job
+                    job_ids = backend.search(
+                        query, limit=settings.JOBS_SEARCH_MAX_RESULTS, fuzzy=fuzzy
+                    )
+                    page = set(
+                        Job.objects.filter(pk__in=job_ids[:page_size]).values_list(
+                            "pk", flat=True
+                        )
+                    )
+                    return len(job_ids), [job_id for job_id in job_ids if job_id in page]
+
+                return search
+
+            for title, search, queries in (
+                ("icontains", icontains("job_role", "location"), QUERIES),
+                ("inverted index", indexed(False), QUERIES),
+                (
+                    "icontains, misspelled",
+                    icontains("job_role", "skills_required", "company__name"),
+                    MISSPELLED,
+                ),
+                ("fuzzy, misspelled", indexed(True), MISSPELLED),
+            ):
+                timings, matches = [], []
+                for query in queries:
+                    for _ in range(rounds):
+                        with benchmarking.timer() as elapsed:
+                            count, _ = search(query)
+                        timings.append(elapsed["seconds"] * 1000)
+                    matches.append(count)
+
+                timings.sort()
+                self.stdout.write(
+                    f"{title:22} p50 {statistics.median(timings):8.2f} ms"
+                    f"   p95 {timings[int(len(timings) * 0.95) - 1]:8.2f} ms"
+                    f"   matches per query {matches}"
+                )
+
+            timings = []
+            for prefix in PREFIXES:
+                for _ in range(rounds):
+                    with benchmarking.timer() as elapsed:
+                        backend.suggest(prefix)
+                    timings.append(elapsed["seconds"] * 1000)
+
+            timings.sort()
+            self.stdout.write(
+                f"{'autocomplete':22} p50 {statistics.median(timings):8.3f} ms"
+                f"   p95 {timings[int(len(timings) * 0.95) - 1]:8.3f} ms"
+                f"   {len(backend.autocomplete.index)} distinct values"
+            )
+
+    @staticmethod
+    def add_vocabulary(words):
+        rng = random.Random(0)
+        vocabulary = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+            for _ in range(words)
+        ]
+        jobs = list(Job.objects.only("pk", "skills_required"))
+        for job in jobs:
+            job.skills_required += ", " + ", ".join(rng.sample(vocabulary, 2))
+        Job.objects.bulk_update(jobs, ["skills_required"], batch_size=1000)
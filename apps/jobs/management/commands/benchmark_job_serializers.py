@@ -0,0 +1,81 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.jobs.constants.values import JOB_DESCRIPTION_FIELDS
+from apps.jobs.models import Job
+from apps.jobs.serializers import JobSerializer, JobSummarySerializer, JobValuesSerializer
+from apps.jobs.utils import benchmarking
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare fetch + serialization time and payload size of a page of "
+        "jobs for the full JobSerializer, the summary list serializer and a "
+        "sparse fieldset, each rendered from model instances and from "
+        "values() rows. Data is seeded in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=100)
+        parser.add_argument("--rounds", type=int, default=50)
+
+    def handle(self, *args, **options):
+        items, rounds = options["items"], options["rounds"]
+        long_text = "Responsibilities and requirements of the role. " * 60
+
+        variants = [
+            ("full JobSerializer", JobSerializer, "", ()),
+            ("?view=summary", JobSummarySerializer, "", JOB_DESCRIPTION_FIELDS),
+            (
+                "?fields=job_id,job_role,location,company",
+                JobSerializer,
+                "fields=job_id,job_role,location,company",
+                JOB_DESCRIPTION_FIELDS,
+            ),
+        ]
+
+        with benchmarking.rolled_back():
+            benchmarking.seed(jobs=items, companies=5, job_seekers=1)
+            Job.objects.update(
+                about=long_text,
+                job_responsibilities=long_text,
+                skills_required=long_text,
+                education_or_certifications=long_text,
+            )
+
+            factory = APIRequestFactory()
+            renderer = JSONRenderer()
+            self.stdout.write(f"{items} jobs per page, {rounds} rounds\n")
+
+            for title, serializer_class, query, deferred in variants:
+                request = Request(factory.get(f"/jobs/?{query}"))
+                context = {"request": request}
+
+                def instances():
+                    page = list(Job.objects.defer(*deferred).order_by("-created_at")[:items])
+                    return serializer_class(page, many=True, context=context).data
+
+                def rows():
+                    serializer = JobValuesSerializer(serializer_class(context=context))
+                    page = list(serializer.values(Job.objects.order_by("-created_at"))[:items])
+                    return serializer.serialize(page)
+
+                for path, render in (("instances", instances), ("values()", rows)):
+                    timings, payload = [], b""
+
+                    for _ in range(rounds):
+                        with benchmarking.timer() as elapsed:
+                            payload = renderer.render(render())
+                        timings.append(elapsed["seconds"] * 1000)
+
+                    median = statistics.median(timings)
+                    self.stdout.write(
+                        f"{title:45} {path:10} median {median:8.2f} ms"
+                        f"   p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms"
+                        f"   {items / median * 1000:>9.0f} rows/s"
+                        f"   payload {len(payload):>9} bytes"
+                    )
@@ -0,0 +1,109 @@
+import random
+import statistics
+import string
+
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from apps.jobs import similarity
+from apps.jobs.models import Job, JobSignature
+from apps.jobs.similarity import minhash
+from apps.jobs.utils import benchmarking
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare /jobs/{id}/similar lookups through the LSH buckets with "
+        "comparing the job's signature to the signature of every job, on "
+        "--jobs postings whose descriptions draw from --words synthetic "
+        "words, in families of --family-size reworded copies of the same "
+        "description. Data is seeded in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=20000)
+        parser.add_argument("--words", type=int, default=5000)
+        parser.add_argument("--family-size", type=int, default=5)
+        parser.add_argument("--lookups", type=int, default=50)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+
+        with benchmarking.rolled_back():
+            benchmarking.seed(jobs=options["jobs"], companies=50, job_seekers=0)
+            vocabulary = [
+                "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                for _ in range(options["words"])
+            ]
+            jobs = list(Job.objects.only("pk", "about"))
+            for position, job in enumerate(jobs):
+                if position % options["family_size"] == 0:
+                    words = rng.sample(vocabulary, 20)
+                reworded = list(words)
+                for replaced in rng.sample(range(len(words)), 2):
+                    reworded[replaced] = rng.choice(vocabulary)
+                job.about = " ".join(reworded)
+            Job.objects.bulk_update(jobs, ["about"], batch_size=1000)
+
+            with benchmarking.timer() as elapsed:
+                call_command("build_job_signatures", "--all", stdout=open("/dev/null", "w"))
+            self.stdout.write(
+                f"{len(jobs)} jobs signed in {elapsed['seconds']:.2f}s "
+                f"({len(jobs) / elapsed['seconds']:.0f} jobs/s)\n"
+            )
+
+            active = Job.objects.all()
+            targets = rng.sample([job.pk for job in jobs], options["lookups"])
+
+            timings, found = [], {}
+            for job_id in targets:
+                with benchmarking.timer() as elapsed:
+                    found[job_id] = set(similarity.similar_jobs(job_id, active, 10))
+                timings.append(elapsed["seconds"] * 1000)
+            self.report("LSH buckets", timings, found.values())
+
+            sizes = []
+            for job_id in targets:
+                target = np.frombuffer(
+                    JobSignature.objects.get(job_id=job_id).minhash, dtype=np.uint32
+                )
+                sizes.append(similarity.candidates(job_id, target, active).count())
+            sizes.sort()
+            self.stdout.write(
+                f"{'':16} candidates compared: mean {statistics.mean(sizes):.1f}"
+                f"   p95 {sizes[max(int(len(sizes) * 0.95) - 1, 0)]}"
+                f"   of {len(jobs) - 1} jobs"
+            )
+
+            timings, expected = [], {}
+            for job_id in targets[:10]:
+                with benchmarking.timer() as elapsed:
+                    expected[job_id] = {pk for _, pk in self.compare_all(job_id)}
+                timings.append(elapsed["seconds"] * 1000)
+            self.report("every signature", timings, expected.values())
+
+            recalled = sum(len(found[job_id] & jobs) for job_id, jobs in expected.items())
+            total = sum(len(jobs) for jobs in expected.values())
+            self.stdout.write(f"\nLSH buckets found {recalled} of the {total} jobs found comparing every signature")
+
+    @staticmethod
+    def compare_all(job_id):
+        target = np.frombuffer(JobSignature.objects.get(job_id=job_id).minhash, dtype=np.uint32)
+        ranked = []
+        for candidate_id, signature in JobSignature.objects.exclude(job_id=job_id).values_list(
+            "job_id", "minhash"
+        ):
+            score = minhash.similarity(target, np.frombuffer(signature, dtype=np.uint32))
+            if score >= similarity.MIN_SIMILARITY:
+                ranked.append((score, candidate_id))
+        ranked.sort(reverse=True)
+        return ranked[:10]
+
+    def report(self, title, timings, found):
+        timings.sort()
+        self.stdout.write(
+            f"{title:16} p50 {statistics.median(timings):8.2f} ms"
+            f"   p95 {timings[max(int(len(timings) * 0.95) - 1, 0)]:8.2f} ms"
+            f"   {statistics.mean(len(jobs) for jobs in found):.1f} similar jobs"
+        )
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs import similarity
+from apps.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the MinHash signatures used by /jobs/{id}/similar for the "
+        "jobs that have none, or for every job with --all (after a queryset "
+        "update of job_role, skills_required or about, which skips the "
+        "receivers). Jobs are walked in job_id order with keyset iteration "
+        "and signed in batches, an interrupted run is resumed by running "
+        "it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Compute the signatures of every job again",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of jobs signed per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        jobs = Job.all_objects.order_by("job_id")
+        if not options["all"]:
+            jobs = jobs.filter(signature__isnull=True)
+
+        position, total = None, 0
+        started = time.perf_counter()
+        while True:
+            batch = jobs if position is None else jobs.filter(job_id__gt=position)
+            batch = list(batch.values("pk", *similarity.SIGNATURE_FIELDS)[: options["batch_size"]])
+            if not batch:
+                break
+
+            similarity.index_jobs(batch)
+
+            total += len(batch)
+            position = batch[-1]["pk"]
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Signed {total} jobs ({total / elapsed:.0f} jobs/s)")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done, {total} jobs signed in {elapsed:.2f}s "
+                f"({total / elapsed if elapsed else 0:.0f} jobs/s)"
+            )
+        )
@@ -0,0 +1,89 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.jobs.constants import values
+from apps.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Deactivate active jobs posted more than --days days ago. Jobs are "
+        "walked in (created_at, job_id) order with keyset iteration and "
+        "deactivated in batches, one short transaction per batch, so the "
+        "command can run on a schedule against a live database. Every "
+        "batch is committed on its own and deactivated jobs no longer "
+        "match, so an interrupted run is resumed by running it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=values.PAST_3_WEEK_DATETIME_DAYS18,
+            help="Age in days after which a job expires (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of jobs deactivated per UPDATE (default: 1000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches, to leave room for other writers",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        # every row of tbl_job, soft deleted jobs are not left active either
+        stale = Job.all_objects.filter(is_active=True, created_at__lt=cutoff).order_by(
+            "created_at", "job_id"
+        )
+
+        position, total = None, 0
+        started = time.perf_counter()
+        while True:
+            jobs = stale
+            if position is not None:
+                created_at, job_id = position
+                jobs = jobs.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, job_id__gt=job_id)
+                )
+
+            batch = list(jobs.values_list("created_at", "job_id")[:batch_size])
+            if not batch:
+                break
+
+            with transaction.atomic():
+                # is_active is checked again as the job could have
+                # changed since the batch was read
+                total += Job.all_objects.filter(
+                    job_id__in=[job_id for _, job_id in batch], is_active=True
+                ).update(is_active=False, updated_at=timezone.now())
+
+            position = batch[-1]
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Deactivated {total} jobs, up to {position[0].isoformat()} "
+                f"({total / elapsed:.0f} rows/s)"
+            )
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done, {total} jobs older than {cutoff.isoformat()} deactivated "
+                f"in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+        )
@@ -0,0 +1,96 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.jobs.utils import benchmarking
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset inside a rolled back transaction, call the "
+        "job and applicant endpoints and print every query they run together "
+        "with the database's EXPLAIN output, to check the indexes are used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=50000)
+        parser.add_argument("--applications", type=int, default=200000)
+        parser.add_argument("--job-seekers", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with benchmarking.rolled_back():
+            self.stdout.write("Seeding...")
+            data = benchmarking.seed(
+                jobs=options["jobs"],
+                applications=options["applications"],
+                job_seekers=options["job_seekers"],
+            )
+            employer, job_seeker = data["employers"][0], data["job_seekers"][0]
+            User.objects.filter(pk__in=[employer.pk, job_seeker.pk]).update(
+                is_profile_completed=True
+            )
+            employer.refresh_from_db()
+            job_seeker.refresh_from_db()
+
+            anonymous = self.client()
+            as_employer = self.client(employer)
+            as_job_seeker = self.client(job_seeker)
+
+            endpoints = [
+                ("GET /jobs/ (anonymous)", anonymous, "/jobs/"),
+                ("GET /jobs/ (job seeker)", as_job_seeker, "/jobs/"),
+                ("GET /jobs/ deep cursor page", anonymous, self.deep_cursor(anonymous)),
+                (
+                    "GET /jobs/ active and featured",
+                    anonymous,
+                    "/jobs/?is_active=true&is_featured=true",
+                ),
+                (
+                    "GET /jobs/ category, job_type and experience",
+                    anonymous,
+                    "/jobs/?category=security&job_type=full%20time&min_exp=2&max_exp=6",
+                ),
+                ("GET /jobs/employer/", as_employer, "/jobs/employer/"),
+                ("GET /company/stats", as_employer, "/company/stats"),
+                ("GET /applicants/", as_employer, "/applicants/"),
+                ("GET /applied_jobs/", as_job_seeker, "/applied_jobs/"),
+                ("GET /application/stats", as_job_seeker, "/application/stats"),
+            ]
+            for title, client, url in endpoints:
+                self.explain_endpoint(title, client, url)
+
+    @staticmethod
+    def client(user=None):
+        client = APIClient(HTTP_HOST="localhost")
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+    @staticmethod
+    def deep_cursor(client, pages=50):
+        """Follow the cursor links a few pages deep and return the next one"""
+
+        url = "/jobs/?pagination=cursor&limit=100"
+        for _ in range(pages):
+            next_url = client.get(url).data["next"]
+            if next_url is None:
+                break
+            url = next_url
+        return url
+
+    def explain_endpoint(self, title, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{title} -> {response.status_code}"))
+        for query in context.captured_queries:
+            sql = query["sql"]
+            self.stdout.write(f"\n  {sql}")
+            self.stdout.write(f"  time: {query['time']}s")
+            joins_applicants = f"JOIN {connection.ops.quote_name('tbl_applicants')}" in sql
+            self.stdout.write(f"  joins tbl_applicants: {'yes' if joins_applicants else 'no'}")
+            for line in benchmarking.explain(sql):
+                self.stdout.write(f"    {line}")
+        self.stdout.write("")
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.applicants.models import Applicants
+from apps.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Job.applicants_count from tbl_applicants. Jobs are walked "
+        "in primary key order and updated in batches, one short transaction "
+        "per batch, so the command is safe to run against a live database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of jobs recounted per UPDATE (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        applications = (
+            Applicants.objects.filter(job=OuterRef("pk"))
+            .order_by()
+            .values("job")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+
+        # soft deleted jobs keep their applications, and so their counts
+        last_job_id, total = None, 0
+        while True:
+            jobs = Job.all_objects.order_by("job_id")
+            if last_job_id is not None:
+                jobs = jobs.filter(job_id__gt=last_job_id)
+
+            job_ids = list(jobs.values_list("job_id", flat=True)[:batch_size])
+            if not job_ids:
+                break
+
+            with transaction.atomic():
+                Job.all_objects.filter(job_id__in=job_ids).update(
+                    applicants_count=Coalesce(Subquery(applications), Value(0))
+                )
+
+            total += len(job_ids)
+            last_job_id = job_ids[-1]
+            self.stdout.write(f"Recounted applicants for {total} jobs")
+
+        self.stdout.write(self.style.SUCCESS(f"Done, {total} jobs recounted"))
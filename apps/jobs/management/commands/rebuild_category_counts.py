@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.jobs.models import Job, JobCategoryCount
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the jobs per category rollup (tbl_job_category_count) from "
+        "tbl_job. Meant to run periodically to reconcile any drift in the "
+        "incrementally maintained counts."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # locking the rollup rows first, so the adjustments of jobs
+            # saved while tbl_job is counted wait for the swap instead of
+            # landing on rows about to be replaced
+            list(JobCategoryCount.objects.select_for_update().values_list("pk", flat=True))
+
+            # the rollup counts every row of tbl_job, soft deleted jobs included
+            groups = {}
+            for row in (
+                Job.all_objects.order_by()
+                .values(*JobCategoryCount.KEY_FIELDS)
+                .annotate(jobs_count=Count("pk"))
+            ):
+                key = (row["category"] or "", row["job_type"], bool(row["is_active"]))
+                groups[key] = groups.get(key, 0) + row["jobs_count"]
+
+            JobCategoryCount.objects.all().delete()
+            JobCategoryCount.objects.bulk_create(
+                JobCategoryCount(
+                    category=category,
+                    job_type=job_type,
+                    is_active=is_active,
+                    jobs_count=jobs_count,
+                )
+                for (category, job_type, is_active), jobs_count in groups.items()
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(groups)} category count groups")
+        )
@@ -1,8 +1,13 @@
 import uuid
+from collections import Counter
 
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, JSONObject
 
 from apps.accounts.models import User
+from apps.jobs import signals
 from apps.jobs.constants import values
 from apps.jobs.constants.values import GENDER, HIRING_STATUS, JOB_TYPE, STATUS_CHOICES
 
@@ -46,12 +51,171 @@ class Company(models.Model):
     short_story = models.TextField(default=None, null=True)
     speciality = models.TextField(default=None, null=True)
 
+    # last change, the Last-Modified/ETag of /company/{id}/
+    updated_at = models.DateTimeField(auto_now=True)
+
     # deletion check for the company should not be present as on delete
     # of the user auth the company will be deleted as well as there is cascade
     # policy
     is_deleted = models.BooleanField(default=False, editable=False)
 
 
+class JobQuerySet(models.QuerySet):
+    """
+    Job queryset that keeps the category rollup in sync and reports
+    bulk inserts and updates through jobs_created and jobs_updated
+    """
+
+    def update(self, **kwargs):
+        moved_fields = {
+            field: kwargs[field] for field in JobCategoryCount.KEY_FIELDS if field in kwargs
+        }
+        if not moved_fields:
+            rows = super().update(**kwargs)
+        else:
+            # values given as expressions (F(), Case(), ...) depend on the
+            # row, they are evaluated with the groups like the UPDATE will
+            computed = {
+                f"moved_{field}": value
+                for field, value in moved_fields.items()
+                if hasattr(value, "resolve_expression")
+            }
+            # the rollup groups leaving are read in the same transaction as
+            # the update so they match the rows that actually changed
+            with transaction.atomic(using=self.db):
+                groups = list(
+                    self.order_by()
+                    .annotate(**computed)
+                    .values(*JobCategoryCount.KEY_FIELDS, *computed)
+                    .annotate(jobs_count=Count("pk"))
+                )
+                rows = super().update(**kwargs)
+                for group in groups:
+                    count = group.pop("jobs_count")
+                    new_values = {name[len("moved_"):]: group.pop(name) for name in computed}
+                    JobCategoryCount.objects.move(
+                        group, {**group, **moved_fields, **new_values}, count
+                    )
+
+        if rows:
+            signals.jobs_updated.send(sender=self.model, fields=frozenset(kwargs))
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips post_save, so the rollup is adjusted here,
+        # in the same transaction as the inserts
+        with transaction.atomic(using=self.db):
+            jobs = super().bulk_create(objs, *args, **kwargs)
+
+            groups = Counter(
+                tuple(getattr(job, field) for field in JobCategoryCount.KEY_FIELDS)
+                for job in jobs
+            )
+            for group, count in groups.items():
+                JobCategoryCount.objects.adjust(*group, delta=count)
+
+        if jobs:
+            signals.jobs_created.send(sender=self.model, jobs=jobs)
+        return jobs
+
+    def order_by_ids(self, job_ids):
+        """Sort the jobs in the order of job_ids, a ranking computed in Python"""
+
+        if not job_ids:
+            return self
+        return self.order_by(
+            Case(
+                *(When(pk=job_id, then=Value(rank)) for rank, job_id in enumerate(job_ids)),
+                output_field=models.IntegerField(),
+            )
+        )
+
+    def facet_counts(self):
+        """
+        Return the number of jobs in this queryset per category, job type
+        and experience bucket, with one grouped query per facet. Values
+        are sorted by count, experience buckets keep their order.
+        """
+
+        jobs = self.order_by()
+        experience_bucket = Case(
+            *(
+                When(
+                    experience__gte=low,
+                    **({"experience__lte": high} if high is not None else {}),
+                    then=Value(name),
+                )
+                for name, low, high in values.EXPERIENCE_BUCKETS
+            ),
+            default=Value(None),
+            output_field=models.CharField(),
+        )
+
+        def count(field, expression=None):
+            rows = jobs.annotate(**{field: expression}) if expression is not None else jobs
+            return [
+                {"value": row[field], "count": row["count"]}
+                for row in rows.values(field).annotate(count=Count("pk")).order_by("-count", field)
+            ]
+
+        experience = {row["value"]: row["count"] for row in count("bucket", experience_bucket)}
+        return {
+            "category": count("category"),
+            "job_type": count("job_type"),
+            # every bucket, in order, even the empty ones
+            "experience": [
+                {"value": name, "count": experience.get(name, 0)}
+                for name, _, _ in values.EXPERIENCE_BUCKETS
+            ],
+        }
+
+    def with_applicants_by_status(self):
+        """
+        Annotate applicants_by_status, the number of applications of each
+        job per application status, counted in the same query.
+
+        Every status is a correlated count served by the (job, status)
+        index of tbl_applicants, so the listing is not grouped and its
+        COUNT(*) for pagination does not touch tbl_applicants at all.
+        """
+
+        # tbl_applicants is owned by the applicants app, which imports this module
+        applicants = self.model._meta.get_field("applicants").related_model
+
+        def count_status(status):
+            applications = (
+                applicants.objects.filter(job=OuterRef("pk"), status=status)
+                .order_by()
+                .values("job")
+                .annotate(count=Count("pk"))
+                .values("count")
+            )
+            return Coalesce(Subquery(applications), 0)
+
+        return self.annotate(
+            applicants_by_status=JSONObject(
+                **{status: count_status(status) for status, _ in STATUS_CHOICES}
+            )
+        )
+
+
+class LiveJobManager(models.Manager.from_queryset(JobQuerySet)):
+    """
+    Default Job manager, leaving out soft deleted jobs.
+
+    `is_deleted = false OR is_deleted IS NULL` (rather than a NOT) keeps
+    the condition usable as an index lookup, see job_live_created_idx.
+    Job.all_objects still sees every row.
+    """
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(models.Q(is_deleted=False) | models.Q(is_deleted__isnull=True))
+        )
+
+
 class Job(models.Model):
     """
     Represents a job posting with related details.
@@ -62,6 +226,32 @@ class Job(models.Model):
 
     class Meta:
         db_table = values.DB_TABLE_JOBS
+        # related lookups, e.g. an application's job, also reach deleted jobs
+        base_manager_name = "all_objects"
+        indexes = [
+            # default listing order, also the key of the cursor pagination
+            models.Index(fields=["-created_at", "job_id"], name="job_created_idx"),
+            # is_active/is_featured filters on the listing, newest first
+            models.Index(
+                fields=["is_active", "is_featured", "-created_at"],
+                name="job_active_featured_idx",
+            ),
+            # JobsFilter category/job_type/experience range lookups
+            models.Index(
+                fields=["category", "job_type", "experience"],
+                name="job_category_type_exp_idx",
+            ),
+            # employer dashboard, an employer's jobs newest first
+            models.Index(fields=["employer", "-created_at"], name="job_employer_created_idx"),
+            # jobs changed since a point in time, the search index catch up
+            models.Index(fields=["updated_at"], name="job_updated_idx"),
+            # live (not soft deleted) jobs newest first, the default manager
+            models.Index(
+                fields=["is_deleted", "-created_at", "job_id"], name="job_live_created_idx"
+            ),
+            # active jobs of a company, counted by the company directory
+            models.Index(fields=["company", "is_active"], name="job_company_active_idx"),
+        ]
 
     job_id = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False, null=False
@@ -94,6 +284,10 @@ class Job(models.Model):
     is_deleted = models.BooleanField(default=False, null=True, editable=False)
     is_featured = models.BooleanField(default=False, null=True)
 
+    # denormalized number of applications, kept in sync by the applicants
+    # app so listings don't have to join and group tbl_applicants
+    applicants_count = models.PositiveIntegerField(default=0, editable=False)
+
     # These fields will be displayed as a part of "description" field and the
     # body of the job
     job_responsibilities = models.TextField(default="No Job Responsibilities provided")
@@ -101,6 +295,181 @@ class Job(models.Model):
     education_or_certifications = models.TextField(default="No Education details provided")
     about = models.TextField(default="No description provided")
 
+    objects = LiveJobManager()
+    all_objects = JobQuerySet.as_manager()
+
+
+class JobCategoryCountManager(models.Manager):
+    def adjust(self, category, job_type, is_active, delta):
+        """Add delta to the count of a (category, job_type, is_active) group"""
+
+        if not delta:
+            return
+
+        # category is nullable on Job, but NULLs never collide in a unique
+        # constraint so they are stored as an empty string here
+        group = {"category": category or "", "job_type": job_type, "is_active": bool(is_active)}
+        if self.filter(**group).update(jobs_count=F("jobs_count") + delta):
+            return
+
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(jobs_count=delta, **group)
+        except IntegrityError:
+            # created concurrently, the row is there now
+            self.filter(**group).update(jobs_count=F("jobs_count") + delta)
+
+    def move(self, old_group, new_group, count=1):
+        """Move count jobs from one group to another"""
+
+        if old_group == new_group:
+            return
+        if old_group is not None:
+            self.adjust(delta=-count, **old_group)
+        if new_group is not None:
+            self.adjust(delta=count, **new_group)
+
+
+class JobCategoryCount(models.Model):
+    """
+    Rollup of the number of jobs per category, job type and active flag.
+
+    Maintained on every job save, delete and queryset update, so counting
+    jobs by category reads a handful of rows instead of grouping tbl_job.
+    The rebuild_category_counts command reconciles it with tbl_job.
+
+    Every row of tbl_job is counted, like Job.all_objects sees them, soft
+    deleted jobs included until they are archived. Soft deleting a job
+    makes it inactive, so the is_active=True groups are the live jobs
+    listings show.
+    """
+
+    KEY_FIELDS = ("category", "job_type", "is_active")
+
+    class Meta:
+        db_table = "tbl_job_category_count"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "job_type", "is_active"],
+                name="job_category_count_unique",
+            )
+        ]
+
+    category = models.CharField(max_length=20, default="")
+    job_type = models.CharField(max_length=80, choices=JOB_TYPE)
+    is_active = models.BooleanField()
+    jobs_count = models.IntegerField(default=0)
+
+    objects = JobCategoryCountManager()
+
+
+class TrendingKeyword(models.Model):
+    """
+    Search keyword popularity shared by all workers.
+
+    rank is log2 of the time decayed search count plus now / half life,
+    which orders keywords by their decayed count at any point in time
+    without rewriting every row as time passes.
+    """
+
+    class Meta:
+        db_table = "tbl_trending_keyword"
+
+    keyword = models.CharField(max_length=100, unique=True)
+    rank = models.FloatField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class ArchivedJob(models.Model):
+    """
+    Cold storage for soft deleted jobs moved out of tbl_job by the
+    archive_deleted_jobs command.
+
+    The job row is kept as a JSON document so archived rows survive later
+    changes to the Job model; only the columns archived jobs are looked
+    up by are real columns.
+
+    Jobs have no deletion timestamp, deleted_at is the updated_at of the
+    job when it was archived. A soft delete sets it, but a job changed
+    after its deletion gets the time of that change instead.
+    """
+
+    class Meta:
+        db_table = "tbl_job_archive"
+
+    job_id = models.UUIDField(primary_key=True)
+    company_id = models.UUIDField(db_index=True)
+    employer_id = models.UUIDField(db_index=True)
+    created_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+
+class JobSignature(models.Model):
+    """
+    MinHash signature of the job_role, skills_required and about of a
+    job, see apps.jobs.similarity
+    """
+
+    class Meta:
+        db_table = "tbl_job_signature"
+
+    job = models.OneToOneField(
+        Job, on_delete=models.CASCADE, primary_key=True, related_name="signature"
+    )
+    minhash = models.BinaryField()
+
+
+class JobSignatureBucket(models.Model):
+    """
+    Locality sensitive hashing bucket of one band of a JobSignature, jobs
+    sharing a bucket are candidates for being similar
+    """
+
+    class Meta:
+        db_table = "tbl_job_signature_bucket"
+        indexes = [
+            # the jobs in the buckets of a signature, /jobs/{id}/similar
+            models.Index(fields=["bucket", "job"], name="job_signature_bucket_idx"),
+        ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="signature_buckets")
+    bucket = models.BigIntegerField()
+
+
+class JobFingerprint(models.Model):
+    """
+    SimHash fingerprint of the role and description of a job, to spot
+    reposts of a job, see apps.jobs.similarity
+    """
+
+    class Meta:
+        db_table = "tbl_job_fingerprint"
+
+    job = models.OneToOneField(
+        Job, on_delete=models.CASCADE, primary_key=True, related_name="fingerprint"
+    )
+    simhash = models.BigIntegerField()
+
+
+class JobFingerprintBand(models.Model):
+    """
+    One band of the bits of a JobFingerprint. Near-duplicate fingerprints
+    share a band, and reposts are only looked for within a company.
+    """
+
+    class Meta:
+        db_table = "tbl_job_fingerprint_band"
+        indexes = [
+            # the jobs of a company sharing a band with a fingerprint
+            models.Index(fields=["company", "band", "job"], name="job_fingerprint_band_idx"),
+        ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="fingerprint_bands")
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="+")
+    band = models.IntegerField()
+
 
 class ContactMessage(models.Model):
     """Represents contact_us model.
@@ -0,0 +1,167 @@
+"""
+Signal receivers keeping derived job data in sync with tbl_job:
+the anonymous response cache versions, the category rollup, the search
+and autocomplete indexes, the recommendation matrix, and the similarity
+signatures and repost fingerprints.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.jobs import cache, recommendations, search, similarity
+from apps.jobs.models import Company, Job, JobCategoryCount
+from apps.jobs.signals import jobs_created, jobs_updated
+
+
+# job fields whose cached representations depend on the APPLICANTS version
+APPLICANT_FIELDS = frozenset({"applicants_count"})
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(jobs_created, sender=Job)
+@receiver(jobs_updated, sender=Job)
+def invalidate_jobs(sender, fields=None, **kwargs):
+    if fields is not None and fields <= APPLICANT_FIELDS:
+        # an application count changed, which the search index and the
+        # recommendations following the JOB version don't read
+        cache.bump_version(cache.APPLICANTS)
+        return
+    cache.bump_version(cache.JOB)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_companies(sender, **kwargs):
+    cache.bump_version(cache.COMPANY)
+
+
+@receiver(post_save, sender="applicants.Applicants")
+@receiver(post_delete, sender="applicants.Applicants")
+def invalidate_applicants(sender, **kwargs):
+    cache.bump_version(cache.APPLICANTS)
+
+
+def category_group(job):
+    """Return the rollup group of a job, None if part of it wasn't loaded"""
+
+    values = job.__dict__
+    if any(field not in values for field in JobCategoryCount.KEY_FIELDS):
+        return None
+    return {field: values[field] for field in JobCategoryCount.KEY_FIELDS}
+
+
+@receiver(post_init, sender=Job)
+def remember_category_group(sender, instance, **kwargs):
+    # the group the job is counted in, to know where to move it from on save
+    instance._category_group = category_group(instance)
+
+
+@receiver(post_save, sender=Job)
+def count_saved_job(sender, instance, created, **kwargs):
+    group = category_group(instance)
+    if created:
+        JobCategoryCount.objects.move(None, group)
+    elif instance._category_group is not None:
+        JobCategoryCount.objects.move(instance._category_group, group)
+    instance._category_group = group
+
+
+@receiver(post_delete, sender=Job)
+def uncount_deleted_job(sender, instance, **kwargs):
+    JobCategoryCount.objects.move(instance._category_group or category_group(instance), None)
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance, **kwargs):
+    search.get_backend().index_jobs([instance])
+
+
+@receiver(jobs_created, sender=Job)
+def index_created_jobs(sender, jobs, **kwargs):
+    search.get_backend().index_jobs(jobs)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job(sender, instance, **kwargs):
+    search.get_backend().remove_jobs([instance.pk])
+
+
+@receiver(post_save, sender=Company)
+def index_saved_company(sender, instance, **kwargs):
+    search.get_backend().index_companies([instance])
+
+
+@receiver(post_delete, sender=Company)
+def unindex_deleted_company(sender, instance, **kwargs):
+    search.get_backend().remove_companies([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def recommend_saved_job(sender, instance, **kwargs):
+    recommendations.get_recommender().index_jobs([instance])
+
+
+@receiver(jobs_created, sender=Job)
+def recommend_created_jobs(sender, jobs, **kwargs):
+    recommendations.get_recommender().index_jobs(jobs)
+
+
+@receiver(post_delete, sender=Job)
+def unrecommend_deleted_job(sender, instance, **kwargs):
+    recommendations.get_recommender().remove_jobs([instance.pk])
+
+
+def signature_document(job, fields):
+    return {"pk": job.pk, **{field: getattr(job, field) for field in fields}}
+
+
+def fingerprint_document(job):
+    return {
+        "company_id": job.company_id,
+        **signature_document(job, similarity.FINGERPRINT_FIELDS),
+    }
+
+
+def signature_text(job, fields=similarity.SIGNATURE_FIELDS):
+    """The text a job is signed (or fingerprinted) from, None if part of it wasn't loaded"""
+
+    values = job.__dict__
+    if any(field not in values for field in fields):
+        return None
+    return similarity.job_text(values, fields)
+
+
+@receiver(post_init, sender=Job)
+def remember_signature_text(sender, instance, **kwargs):
+    # to only compute the signature and fingerprint again when the text changed
+    instance._signature_text = signature_text(instance)
+    instance._fingerprint_text = signature_text(instance, similarity.FINGERPRINT_FIELDS)
+
+
+@receiver(post_save, sender=Job)
+def sign_saved_job(sender, instance, created, **kwargs):
+    text = signature_text(instance)
+    if text is not None and (created or text != instance._signature_text):
+        similarity.index_jobs([signature_document(instance, similarity.SIGNATURE_FIELDS)])
+        instance._signature_text = text
+
+
+@receiver(jobs_created, sender=Job)
+def sign_created_jobs(sender, jobs, **kwargs):
+    similarity.index_jobs(
+        signature_document(job, similarity.SIGNATURE_FIELDS) for job in jobs
+    )
+
+
+@receiver(post_save, sender=Job)
+def fingerprint_saved_job(sender, instance, created, **kwargs):
+    text = signature_text(instance, similarity.FINGERPRINT_FIELDS)
+    if text is not None and (created or text != instance._fingerprint_text):
+        similarity.fingerprint_jobs([fingerprint_document(instance)])
+        instance._fingerprint_text = text
+
+
+@receiver(jobs_created, sender=Job)
+def fingerprint_created_jobs(sender, jobs, **kwargs):
+    similarity.fingerprint_jobs(fingerprint_document(job) for job in jobs)
@@ -0,0 +1,18 @@
+"""
+Recommendation of jobs to job seekers.
+
+Active jobs are matched with the professional skills and experience of a
+profile through a SkillMatrix, a sparse TF-IDF matrix of the skills of
+the jobs kept in process memory by the JobRecommender.
+"""
+
+from functools import lru_cache
+
+from apps.jobs.recommendations.recommender import JobRecommender
+
+
+@lru_cache(maxsize=None)
+def get_recommender():
+    """Return the job recommender, created once per process"""
+
+    return JobRecommender()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from apps.jobs.recommendations.skill_matrix import blend, experience_fit
+from apps.jobs.recommendations.skills import parse_skills, profile_skills, to_number
+
+# the weight profile_skills gives two years of recent experience in a
+# skill, a required skill the applicant has at least that much gets full
+# credit and less experienced ones a share of it
+FULL_CREDIT_WEIGHT = 1 + np.log1p(2)
+
+
+def score_applicants(skills_required, experience, profiles, year):
+    """
+    Return the score of every profile, dicts with their experience and
+    professional_skills, for a job requiring skills_required and
+    experience years, as an array in the order of profiles.
+
+    The profiles' weights of the required skills are laid out in one
+    (profiles x required skills) matrix, the skill match of all the
+    applicants is its capped row mean, blended with their experience fit.
+    """
+
+    required = {skill: column for column, skill in enumerate(parse_skills(skills_required))}
+    weights = np.zeros((len(profiles), len(required)), dtype=np.float64)
+    experiences = np.zeros(len(profiles), dtype=np.float64)
+
+    for row, profile in enumerate(profiles):
+        experiences[row] = to_number(profile["experience"])
+        for skill, weight in profile_skills(profile["professional_skills"], year).items():
+            column = required.get(skill)
+            if column is not None:
+                weights[row, column] = weight
+
+    if required:
+        similarity = np.minimum(weights / FULL_CREDIT_WEIGHT, 1).mean(axis=1)
+    else:
+        similarity = np.zeros(len(profiles), dtype=np.float64)
+    return blend(similarity, experience_fit(experiences - experience))
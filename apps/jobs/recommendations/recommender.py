@@ -0,0 +1,112 @@
+import threading
+
+from django.utils import timezone
+
+from apps.jobs import cache
+from apps.jobs.models import Job
+from apps.jobs.recommendations.skill_matrix import SkillMatrix
+from apps.jobs.recommendations.skills import parse_skills, profile_skills, to_number
+from apps.jobs.search.backends import SYNC_OVERLAP
+
+
+class JobRecommender:
+    """
+    Ranks the active jobs for a job seeker's profile with a SkillMatrix
+    of the skills_required of every active, live job.
+
+    Kept up to date the same way as the search index: built on the first
+    recommendation, updated right away by the receivers for jobs saved in
+    this process, and caught up through job_updated_idx whenever the job
+    version of the response cache moved.
+    """
+
+    def __init__(self):
+        self.matrix = None
+        self.version = None
+        self.synced_at = None
+        self.lock = threading.RLock()
+
+    def recommend(self, profile, limit=None):
+        """
+        Return the ids of the active jobs matching the professional skills
+        of profile, a dict with its experience and professional_skills,
+        best first
+        """
+
+        skills = profile_skills(profile["professional_skills"], timezone.now().year)
+        if not skills:
+            return []
+
+        with self.lock:
+            self.sync()
+            return [
+                job_id
+                for job_id, _ in self.matrix.score(
+                    skills, to_number(profile["experience"]), limit
+                )
+            ]
+
+    def index_jobs(self, jobs):
+        with self.lock:
+            if self.matrix is None:
+                return
+            for job in jobs:
+                self.add_job(
+                    job.pk,
+                    {
+                        field: getattr(job, field)
+                        for field in ("is_active", "is_deleted", "skills_required", "experience")
+                    },
+                )
+
+    def remove_jobs(self, job_ids):
+        with self.lock:
+            if self.matrix is None:
+                return
+            for job_id in job_ids:
+                self.matrix.remove(job_id)
+
+    def add_job(self, job_id, job):
+        if job["is_active"] and not job["is_deleted"]:
+            self.matrix.add(job_id, parse_skills(job["skills_required"]), job["experience"])
+        else:
+            self.matrix.remove(job_id)
+
+    def sync(self):
+        """Bring the matrix up to date with tbl_job"""
+
+        # read before the jobs, a change made meanwhile moves the
+        # version again and is picked up by the next sync
+        version = cache.get_versions([cache.JOB])[0]
+        if self.matrix is not None and version == self.version:
+            return
+
+        started = timezone.now()
+        if self.matrix is None:
+            self.matrix = SkillMatrix()
+            # live active jobs, the catch up reads every row to see the
+            # jobs that were deactivated or soft deleted
+            jobs = Job.objects.filter(is_active=True)
+        else:
+            jobs = Job.all_objects.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP)
+
+        try:
+            for job in (
+                jobs.order_by()
+                .values("pk", "is_active", "is_deleted", "skills_required", "experience")
+                .iterator(chunk_size=2000)
+            ):
+                self.add_job(job.pop("pk"), job)
+        except BaseException:
+            # a partial matrix would never be completed
+            self.rebuild()
+            raise
+
+        self.version = version
+        self.synced_at = started
+
+    def rebuild(self):
+        """Drop the matrix, it is built again on the next recommendation"""
+
+        with self.lock:
+            self.matrix = None
@@ -0,0 +1,213 @@
+import numpy as np
+
+# compact once this many rows, and this share of them, are dead
+COMPACT_MIN_DEAD = 1000
+COMPACT_DEAD_RATIO = 0.25
+
+# share of the score given by the experience fit, the rest is skill match
+EXPERIENCE_FIT_WEIGHT = 0.3
+# missing years of experience divide the fit by e every this many years
+EXPERIENCE_SHORTFALL_SCALE = 2.0
+# every year of experience above the required one lowers the fit by this
+EXPERIENCE_SURPLUS_PENALTY = 0.02
+
+
+def experience_fit(surplus):
+    """
+    Fit between 0 and 1 of the years of experience someone has above (or,
+    when negative, below) the years required, for an array of surpluses
+    """
+
+    return np.where(
+        surplus >= 0,
+        np.maximum(1 - surplus * EXPERIENCE_SURPLUS_PENALTY, 0.5),
+        np.exp(np.minimum(surplus, 0) / EXPERIENCE_SHORTFALL_SCALE),
+    )
+
+
+def blend(similarity, fit):
+    """Score of skill similarities weighed down by poor experience fits"""
+
+    return similarity * (1 - EXPERIENCE_FIT_WEIGHT + EXPERIENCE_FIT_WEIGHT * fit)
+
+
+def grow(values, size):
+    """Return values, or a copy with room for at least size items"""
+
+    if size <= len(values):
+        return values
+    grown = np.zeros(max(size, 2 * len(values), 64), dtype=values.dtype)
+    grown[: len(values)] = values
+    return grown
+
+
+class SkillMatrix:
+    """
+    Sparse TF-IDF matrix of the skills of jobs, one row per job and one
+    column per distinct skill.
+
+    The non zero entries are kept in coordinate form, parallel arrays of
+    row and column numbers appended as rows are added, so adding a row is
+    amortized O(skills of the row). Removing a row only marks it dead;
+    compact() reclaims the entries once enough of them piled up.
+
+    The TF-IDF weights of the entries, l2 normalized per row, depend on
+    the document frequency of every skill. They are recomputed, with a
+    few vectorized operations over all entries, on the first score()
+    after a change. Scoring is then a single sparse matrix-vector
+    product, np.bincount of the entry weights times the query weights of
+    their column, summed per row.
+
+    The matrix is not thread safe, callers serialize access to it.
+    """
+
+    def __init__(self):
+        self.columns = {}  # skill -> column
+        self.document_frequency = np.zeros(0, dtype=np.float64)
+
+        self.keys = []  # key per row, None once dead
+        self.rows = {}  # key -> row
+        self.live = np.zeros(0, dtype=bool)
+        self.experience = np.zeros(0, dtype=np.float64)
+        self.starts = np.zeros(0, dtype=np.int64)  # first entry of every row
+        self.ends = np.zeros(0, dtype=np.int64)
+
+        self.entry_rows = np.zeros(0, dtype=np.int32)
+        self.entry_columns = np.zeros(0, dtype=np.int32)
+        self.entries = 0
+        self.dead = 0
+
+        self.weights = None  # TF-IDF weight of every entry, None when stale
+        self.idf = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def add(self, key, skills, experience):
+        """Add a row, replacing the one previously added under key"""
+
+        self.remove(key)
+
+        columns = []
+        for skill in dict.fromkeys(skills):
+            column = self.columns.get(skill)
+            if column is None:
+                column = self.columns[skill] = len(self.columns)
+                self.document_frequency = grow(self.document_frequency, column + 1)
+            columns.append(column)
+
+        row = len(self.keys)
+        self.keys.append(key)
+        self.rows[key] = row
+        self.live = grow(self.live, row + 1)
+        self.experience = grow(self.experience, row + 1)
+        self.starts = grow(self.starts, row + 1)
+        self.ends = grow(self.ends, row + 1)
+        self.live[row] = True
+        self.experience[row] = experience
+        self.starts[row] = self.entries
+        self.ends[row] = self.entries + len(columns)
+
+        end = self.entries + len(columns)
+        self.entry_rows = grow(self.entry_rows, end)
+        self.entry_columns = grow(self.entry_columns, end)
+        self.entry_rows[self.entries : end] = row
+        self.entry_columns[self.entries : end] = columns
+        self.entries = end
+
+        self.document_frequency[columns] += 1
+        self.weights = None
+
+    def remove(self, key):
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+
+        self.keys[row] = None
+        self.live[row] = False
+        self.document_frequency[self.entry_columns[self.starts[row] : self.ends[row]]] -= 1
+        self.dead += 1
+        self.weights = None
+
+        if self.dead >= COMPACT_MIN_DEAD and self.dead >= len(self.keys) * COMPACT_DEAD_RATIO:
+            self.compact()
+
+    def compact(self):
+        """Drop the entries of dead rows and renumber the live ones"""
+
+        count = len(self.keys)
+        live = self.live[:count]
+        remap = np.cumsum(live) - 1
+
+        entry_rows = self.entry_rows[: self.entries]
+        kept = live[entry_rows]
+        self.entry_rows = remap[entry_rows[kept]].astype(np.int32)
+        self.entry_columns = self.entry_columns[: self.entries][kept]
+        self.entries = len(self.entry_rows)
+
+        lengths = (self.ends[:count] - self.starts[:count])[live]
+        self.ends = np.cumsum(lengths)
+        self.starts = self.ends - lengths
+        self.experience = self.experience[:count][live]
+        self.keys = [key for key in self.keys if key is not None]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self.live = np.ones(len(self.keys), dtype=bool)
+        self.dead = 0
+        self.weights = None
+
+    def refresh(self):
+        """Recompute the TF-IDF weights of the entries"""
+
+        count = len(self.keys)
+        rows = self.entry_rows[: self.entries]
+        columns = self.entry_columns[: self.entries]
+
+        # smoothed idf, as scikit-learn's TfidfVectorizer
+        self.idf = (
+            np.log((1 + len(self.rows)) / (1 + self.document_frequency[: len(self.columns)])) + 1
+        )
+        weights = self.idf[columns] * self.live[rows]
+        norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=count))
+        norms[norms == 0] = 1
+        self.weights = weights / norms[rows]
+
+    def score(self, skills, experience, limit=None):
+        """
+        Return (key, score) of the rows sharing a skill with the skills
+        weights, best first. The cosine similarity of the TF-IDF vectors
+        is blended with the fit of experience against every row's.
+        """
+
+        if not self.rows:
+            return []
+        if self.weights is None:
+            self.refresh()
+
+        query = np.zeros(len(self.columns), dtype=np.float64)
+        for skill, weight in skills.items():
+            column = self.columns.get(skill)
+            if column is not None:
+                query[column] = weight
+        query *= self.idf
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        query /= norm
+
+        count = len(self.keys)
+        similarity = np.bincount(
+            self.entry_rows[: self.entries],
+            weights=self.weights * query[self.entry_columns[: self.entries]],
+            minlength=count,
+        )
+
+        scores = blend(similarity, experience_fit(experience - self.experience[:count]))
+
+        matches = np.flatnonzero(scores > 0)
+        if limit is not None and len(matches) > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        matches = matches[np.argsort(-scores[matches], kind="stable")]
+        return [(self.keys[row], float(scores[row])) for row in matches]
@@ -0,0 +1,53 @@
+import math
+import re
+
+# skills are listed separated by commas, semicolons, pipes or new lines
+SKILL_SEPARATORS_RE = re.compile(r"[,;|\n]+")
+
+# a skill last used this many years ago counts half as much
+RECENCY_HALF_LIFE_YEARS = 3
+
+
+def normalize_skill(skill):
+    return " ".join(str(skill).lower().split())
+
+
+def parse_skills(text):
+    """Distinct normalized skills of a skills_required text, in order"""
+
+    skills = (normalize_skill(skill) for skill in SKILL_SEPARATORS_RE.split(text or ""))
+    return list(dict.fromkeys(skill for skill in skills if skill))
+
+
+def profile_skills(professional_skills, year):
+    """
+    Weight of every skill of a profile's professional_skills, growing
+    with the years of experience in it and decaying with the years since
+    it was last used
+    """
+
+    weights = {}
+    if not isinstance(professional_skills, list):
+        return weights
+
+    for entry in professional_skills:
+        if not isinstance(entry, dict):
+            continue
+        skill = normalize_skill(entry.get("skill_name") or "")
+        if not skill:
+            continue
+
+        total_yoe = max(to_number(entry.get("total_yoe")), 0)
+        last_used = to_number(entry.get("last_used")) or year
+        weight = (1 + math.log1p(total_yoe)) * 0.5 ** (
+            max(year - last_used, 0) / RECENCY_HALF_LIFE_YEARS
+        )
+        weights[skill] = max(weights.get(skill, 0.0), weight)
+    return weights
+
+
+def to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,20 @@
+"""
+Full text search of jobs.
+
+The backend is pluggable through the JOBS_SEARCH_BACKEND setting, the
+dotted path of a SearchBackend subclass. The default InvertedIndexBackend
+keeps a BM25 ranked inverted index in process memory and works on every
+database.
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Return the configured search backend, created once per process"""
+
+    return import_string(settings.JOBS_SEARCH_BACKEND)()
@@ -0,0 +1,153 @@
+import heapq
+from bisect import bisect_left, insort
+
+# kinds of suggestion
+JOB_ROLE = "job_role"
+LOCATION = "location"
+COMPANY = "company"
+
+# sorts after every key a prefix can start
+LAST_CHARACTER = chr(0x10FFFF)
+
+# prefixes up to this long match a large share of the values, their
+# suggestions are kept until a value they match changes
+CACHED_PREFIX_LENGTH = 2
+CACHED_SUGGESTIONS = 50
+
+
+def normalize(text):
+    """Lowercased text with runs of whitespace collapsed"""
+
+    return " ".join(text.lower().split())
+
+
+class PrefixIndex:
+    """
+    Distinct (kind, text) values with a weight, looked up by prefix.
+
+    Every value is kept in a sorted array once per word it contains, keyed
+    by the normalized text starting at that word, so "ana" suggests both
+    "Analytics" and "Malware Analyst". A prefix lookup is a bisect followed
+    by a scan of the keys it prefixes.
+
+    Weights are adjusted with add(); a value whose weight drops to zero
+    is removed.
+    """
+
+    def __init__(self):
+        self.weights = {}
+        self.entries = []  # sorted (key, kind, text)
+        self.cache = {}  # suggestions of the short prefixes
+
+    def __len__(self):
+        return len(self.weights)
+
+    def add(self, kind, text, delta=1):
+        """Adjust the weight of a value by delta"""
+
+        text = " ".join((text or "").split())
+        if not text or not delta:
+            return
+
+        value = (kind, text)
+        for key in self.keys(text):
+            for length in range(1, CACHED_PREFIX_LENGTH + 1):
+                self.cache.pop(key[:length], None)
+
+        weight = self.weights.get(value, 0) + delta
+        if weight > 0:
+            if value not in self.weights:
+                for key in self.keys(text):
+                    insort(self.entries, (key, kind, text))
+            self.weights[value] = weight
+        elif value in self.weights:
+            del self.weights[value]
+            for key in self.keys(text):
+                del self.entries[bisect_left(self.entries, (key, kind, text))]
+
+    @staticmethod
+    def keys(text):
+        words = normalize(text).split(" ")
+        return {" ".join(words[start:]) for start in range(len(words))}
+
+    def suggest(self, prefix, limit=10):
+        """Return (kind, text, weight) of the heaviest values matching prefix"""
+
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        if len(prefix) <= CACHED_PREFIX_LENGTH and limit <= CACHED_SUGGESTIONS:
+            if prefix not in self.cache:
+                self.cache[prefix] = self.lookup(prefix, CACHED_SUGGESTIONS)
+            return self.cache[prefix][:limit]
+        return self.lookup(prefix, limit)
+
+    def lookup(self, prefix, limit):
+        entries = self.entries
+        start = bisect_left(entries, (prefix,))
+        end = bisect_left(entries, (prefix + LAST_CHARACTER,), start)
+        matches = {(kind, text) for _, kind, text in entries[start:end]}
+
+        # heaviest first, ties in alphabetical order
+        weights = self.weights
+        best = heapq.nsmallest(limit, matches, key=lambda value: (-weights[value], value[1]))
+        return [(kind, text, weights[kind, text]) for kind, text in best]
+
+
+class Autocomplete:
+    """
+    Suggestions of job roles, locations and company names, weighted by
+    their number of active job postings.
+
+    The role, location and company of every indexed job are remembered
+    so a job saved again or removed moves its counts without reading
+    tbl_job. Company names are indexed separately, a company is suggested
+    once it has postings.
+    """
+
+    def __init__(self):
+        self.index = PrefixIndex()
+        self.jobs = {}
+        self.company_names = {}
+        self.company_jobs = {}
+
+    def add_job(self, job_id, job_role, location, company_id):
+        """Count a job, replacing the one previously added under job_id"""
+
+        self.remove_job(job_id)
+        self.jobs[job_id] = (job_role, location, company_id)
+        self.index.add(JOB_ROLE, job_role)
+        self.index.add(LOCATION, location)
+        self.count_company(company_id, 1)
+
+    def remove_job(self, job_id):
+        job = self.jobs.pop(job_id, None)
+        if job is not None:
+            job_role, location, company_id = job
+            self.index.add(JOB_ROLE, job_role, -1)
+            self.index.add(LOCATION, location, -1)
+            self.count_company(company_id, -1)
+
+    def set_company(self, company_id, name):
+        jobs = self.company_jobs.get(company_id, 0)
+        self.index.add(COMPANY, self.company_names.get(company_id), -jobs)
+        self.company_names[company_id] = name
+        self.index.add(COMPANY, name, jobs)
+
+    def remove_company(self, company_id):
+        # the jobs of the company keep their count, they are removed
+        # on their own when the deletion cascades
+        name = self.company_names.pop(company_id, None)
+        self.index.add(COMPANY, name, -self.company_jobs.get(company_id, 0))
+
+    def count_company(self, company_id, delta):
+        jobs = self.company_jobs.get(company_id, 0) + delta
+        if jobs:
+            self.company_jobs[company_id] = jobs
+        else:
+            self.company_jobs.pop(company_id, None)
+        self.index.add(COMPANY, self.company_names.get(company_id), delta)
+
+    def suggest(self, prefix, limit=10):
+        return self.index.suggest(prefix, limit)
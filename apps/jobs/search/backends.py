@@ -0,0 +1,225 @@
+import threading
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.jobs import cache
+from apps.jobs.models import Company, Job
+from apps.jobs.search.autocomplete import Autocomplete
+from apps.jobs.search.inverted_index import InvertedIndex
+
+# jobs changed this long before the last sync are read again, so clock
+# skew between workers and long transactions don't hide changes
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+class SearchBackend:
+    """
+    Interface of the job search backends, the one used is set by the
+    JOBS_SEARCH_BACKEND setting
+    """
+
+    def search(self, query, limit=None, fuzzy=False):
+        """
+        Return the ids of the jobs matching query, most relevant first.
+        A fuzzy search tolerates misspelled words.
+        """
+
+        raise NotImplementedError
+
+    def suggest(self, prefix, limit=10):
+        """
+        Return (kind, text, count) of the job roles, locations and company
+        names matching prefix, those with the most job postings first
+        """
+
+        raise NotImplementedError
+
+    def index_jobs(self, jobs):
+        """Called with jobs that were created or saved"""
+
+    def remove_jobs(self, job_ids):
+        """Called with the ids of jobs that were deleted"""
+
+    def index_companies(self, companies):
+        """Called with companies that were created or saved"""
+
+    def remove_companies(self, company_ids):
+        """Called with the ids of companies that were deleted"""
+
+
+class InvertedIndexBackend(SearchBackend):
+    """
+    Searches an InvertedIndex of the live jobs, and suggests from an
+    Autocomplete of the roles, locations and companies of the active
+    ones, both kept in process memory.
+
+    The indexes are built on the first lookup. Jobs and companies saved in
+    this process are indexed right away by the receivers. Changes made by
+    other workers or by queryset updates are caught up with before a
+    lookup, whenever the job or company version of the response cache
+    moved: the rows updated since the last sync are re-read, using
+    job_updated_idx for jobs.
+
+    The name of the company is indexed with every job. Renaming a company
+    re-reads its jobs.
+
+    Ids can be stale for jobs deleted by other workers, callers intersect
+    the ids with tbl_job anyway.
+    """
+
+    field_weights = {
+        "job_role": 3.0,
+        "skills_required": 2.0,
+        "location": 1.5,
+        "company_name": 1.5,
+        "about": 1.0,
+        "job_responsibilities": 1.0,
+    }
+    # the fields whose words a fuzzy search matches misspelled
+    fuzzy_fields = ("job_role", "skills_required", "company_name")
+    # tbl_job columns read, the company name comes from the autocomplete and
+    # is_active decides whether the job is suggested
+    job_fields = (
+        "job_role",
+        "skills_required",
+        "location",
+        "about",
+        "job_responsibilities",
+        "company_id",
+        "is_active",
+    )
+
+    def __init__(self):
+        self.index = None
+        self.autocomplete = None
+        self.versions = None
+        self.synced_at = None
+        self.lock = threading.RLock()
+
+    def search(self, query, limit=None, fuzzy=False):
+        with self.lock:
+            self.sync()
+            return [job_id for job_id, _ in self.index.search(query, limit, fuzzy)]
+
+    def suggest(self, prefix, limit=10):
+        with self.lock:
+            self.sync()
+            return self.autocomplete.suggest(prefix, limit)
+
+    def index_jobs(self, jobs):
+        with self.lock:
+            if self.index is None:
+                return
+            for job in jobs:
+                if job.is_deleted:
+                    self.remove_job(job.pk)
+                else:
+                    self.add_job(job.pk, {field: getattr(job, field) for field in self.job_fields})
+
+    def remove_jobs(self, job_ids):
+        with self.lock:
+            if self.index is None:
+                return
+            for job_id in job_ids:
+                self.remove_job(job_id)
+
+    def index_companies(self, companies):
+        with self.lock:
+            if self.index is None:
+                return
+            renamed = [
+                company.pk for company in companies if self.set_company(company.pk, company.name)
+            ]
+            if renamed:
+                # live jobs only, soft deleted ones are not in the index
+                self.load_jobs(Job.objects.filter(company_id__in=renamed))
+
+    def remove_companies(self, company_ids):
+        with self.lock:
+            if self.index is None:
+                return
+            for company_id in company_ids:
+                self.autocomplete.remove_company(company_id)
+
+    def add_job(self, job_id, job):
+        company_id = job["company_id"]
+        job["company_name"] = self.autocomplete.company_names.get(company_id)
+        self.index.add(job_id, job)
+        if job["is_active"]:
+            self.autocomplete.add_job(job_id, job["job_role"], job["location"], company_id)
+        else:
+            # searchable, callers filter on is_active, but never suggested
+            self.autocomplete.remove_job(job_id)
+
+    def remove_job(self, job_id):
+        self.index.remove(job_id)
+        self.autocomplete.remove_job(job_id)
+
+    def set_company(self, company_id, name):
+        """Index the name of a company, True if jobs were indexed with another one"""
+
+        # its inactive jobs are in the search index too, without being counted
+        renamed = (
+            company_id in self.autocomplete.company_names
+            and self.autocomplete.company_names[company_id] != name
+        )
+        self.autocomplete.set_company(company_id, name)
+        return renamed
+
+    def load_jobs(self, jobs):
+        """Index the rows of a queryset of jobs, removing the soft deleted ones"""
+
+        for job in (
+            jobs.order_by().values("pk", "is_deleted", *self.job_fields).iterator(chunk_size=2000)
+        ):
+            job_id = job.pop("pk")
+            if job.pop("is_deleted"):
+                self.remove_job(job_id)
+            else:
+                self.add_job(job_id, job)
+
+    def sync(self):
+        """Bring the indexes up to date with tbl_job and tbl_company"""
+
+        # read before the rows, a change made meanwhile moves the
+        # versions again and is picked up by the next sync
+        versions = cache.get_versions([cache.JOB, cache.COMPANY])
+        if self.index is not None and versions == self.versions:
+            return
+
+        started = timezone.now()
+        companies = Company.objects.order_by()
+        if self.index is None:
+            self.index = InvertedIndex(self.field_weights, fuzzy_fields=self.fuzzy_fields)
+            self.autocomplete = Autocomplete()
+            # live jobs, the catch up reads every row to see soft deletes
+            jobs = Job.objects.all()
+        else:
+            since = self.synced_at - SYNC_OVERLAP
+            companies = companies.filter(updated_at__gte=since)
+            jobs = Job.all_objects.filter(updated_at__gte=since)
+
+        try:
+            renamed = [
+                company["pk"]
+                for company in companies.values("pk", "name").iterator(chunk_size=2000)
+                if self.set_company(company["pk"], company["name"])
+            ]
+            if renamed:
+                jobs = jobs | Job.all_objects.filter(company_id__in=renamed)
+            self.load_jobs(jobs)
+        except BaseException:
+            # a partial index would never be completed
+            self.rebuild()
+            raise
+
+        self.versions = versions
+        self.synced_at = started
+
+    def rebuild(self):
+        """Drop the indexes, they are built again on the next lookup"""
+
+        with self.lock:
+            self.index = None
+            self.autocomplete = None
@@ -0,0 +1,81 @@
+from django.conf import settings
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from apps.jobs.constants import values
+from apps.jobs.search import get_backend
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    ?search= matched by the configured search backend instead of LIKE
+    '%term%' scans. The settings.JOBS_SEARCH_MAX_RESULTS most relevant
+    jobs passing the other filters are kept.
+
+    Query words match whole words of the jobs and, from 3 letters, the
+    beginning of longer words ("sec" finds "security"). Unlike the
+    icontains lookups of DRF's SearchFilter, a fragment from the middle
+    of a word ("curity") matches nothing.
+
+    The filter runs after the other filter backends: the matches are
+    checked against the already filtered queryset, best first and a
+    batch at a time, so the cap never drops a match the filters let
+    through in favour of one they reject.
+
+    Without ?ordering= the kept ids, best first, are left on the request
+    as search_ranking: listings page through that list and only sort the
+    rows of the page by relevance, see JobViewSets.list_rows.
+
+    Views with a false search_capped attribute (the export) get every
+    match as search_ranking, and the queryset is left unfiltered for
+    them to read the matches in batches.
+
+    With ?search_mode=fuzzy, words of the role, skills and company name
+    are also matched when misspelled, by trigram similarity.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        fuzzy = request.query_params.get(values.SEARCH_MODE_QUERY_PARAM) == values.FUZZY_SEARCH
+        job_ids = get_backend().search(" ".join(terms), fuzzy=fuzzy)
+
+        if not getattr(view, "search_capped", True):
+            # every match, the view reads them a batch at a time, checking
+            # them against the queryset as it goes
+            request.search_ranking = job_ids
+            return queryset
+
+        job_ids = self.narrow(queryset, job_ids)
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            request.search_ranking = job_ids
+        return queryset.filter(pk__in=job_ids)
+
+    @staticmethod
+    def narrow(queryset, job_ids):
+        """The first JOBS_SEARCH_MAX_RESULTS of the ranked job_ids in queryset"""
+
+        limit = settings.JOBS_SEARCH_MAX_RESULTS
+        kept = []
+        for start in range(0, len(job_ids), limit):
+            batch = job_ids[start : start + limit]
+            passing = set(queryset.filter(pk__in=batch).order_by().values_list("pk", flat=True))
+            kept.extend(job_id for job_id in batch if job_id in passing)
+            if len(kept) >= limit:
+                break
+        return kept[:limit]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": values.SEARCH_MODE_QUERY_PARAM,
+                "required": False,
+                "in": "query",
+                "description": "Set to fuzzy to also match misspelled words",
+                "schema": {"type": "string", "enum": [values.FUZZY_SEARCH]},
+            },
+        ]
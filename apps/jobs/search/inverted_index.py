@@ -0,0 +1,253 @@
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+
+from apps.jobs.search.text import tokenize
+from apps.jobs.search.trigrams import TrigramIndex
+
+# query tokens at least this long also match the indexed terms they prefix
+MIN_PREFIX_LENGTH = 3
+# at most this many indexed terms are searched for one query token
+MAX_PREFIX_EXPANSIONS = 50
+# a prefix match scores less than the same match on the whole word
+PREFIX_MATCH_WEIGHT = 0.5
+# at most this many similar terms are searched for one fuzzy query token
+MAX_FUZZY_EXPANSIONS = 20
+
+# compact once this many documents, and this share of them, are dead
+COMPACT_MIN_DEAD = 1000
+COMPACT_DEAD_RATIO = 0.25
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index ranking documents with BM25.
+
+    Documents are dicts of text fields; every field has a weight which
+    multiplies the frequency of its terms, so a term in the title counts
+    more than the same term in the body (a simplified BM25F).
+
+    Every added document gets the next ordinal, and the postings of a term
+    are three parallel arrays, ordinals, weighted term frequencies and
+    the part of those frequencies from the fuzzy_fields, appended in
+    ordinal order. Re-adding or removing a document only
+    marks its old ordinal dead; compact() reclaims the space once enough
+    of them piled up.
+
+    A query matches the documents containing all of its tokens (or, for
+    tokens of MIN_PREFIX_LENGTH or more, a term they prefix), the same
+    semantics as DRF's SearchFilter.
+
+    The terms of the fuzzy_fields are also kept in a TrigramIndex. In a
+    fuzzy search a query token matches the terms similar to it as well,
+    weighted by their similarity, so misspelled words still find the
+    documents. Such a similar term only matches, and is only scored, in
+    the fuzzy_fields of the documents.
+
+    The index is not thread safe, callers serialize access to it.
+    """
+
+    def __init__(self, field_weights, k1=1.2, b=0.75, fuzzy_fields=()):
+        self.field_weights = field_weights
+        self.fuzzy_fields = fuzzy_fields
+        self.k1 = k1
+        self.b = b
+
+        self.postings = {}
+        self.terms = []  # sorted vocabulary, for prefix matches
+        self.keys = []  # document key per ordinal, None once dead
+        self.document_terms = []  # terms of the document per ordinal
+        self.document_frequency = {}  # number of live documents per term
+        self.ordinals = {}
+        self.lengths = array("f")
+        self.total_length = 0.0
+        self.dead = 0
+        self.trigrams = TrigramIndex()
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __contains__(self, key):
+        return key in self.ordinals
+
+    def add(self, key, document):
+        """Index a document, replacing the one previously added under key"""
+
+        self.remove(key)
+
+        frequencies, fuzzy_frequencies = {}, {}
+        for field, weight in self.field_weights.items():
+            for token in tokenize(document.get(field) or ""):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                if field in self.fuzzy_fields:
+                    fuzzy_frequencies[token] = fuzzy_frequencies.get(token, 0.0) + weight
+                    self.trigrams.add(token)
+
+        ordinal = len(self.keys)
+        self.keys.append(key)
+        self.document_terms.append(tuple(frequencies))
+        self.ordinals[key] = ordinal
+        length = sum(frequencies.values())
+        self.lengths.append(length)
+        self.total_length += length
+
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = (array("I"), array("f"), array("f"))
+                self.terms.insert(bisect_left(self.terms, term), term)
+            postings[0].append(ordinal)
+            postings[1].append(frequency)
+            postings[2].append(fuzzy_frequencies.get(term, 0.0))
+            self.document_frequency[term] = self.document_frequency.get(term, 0) + 1
+
+    def remove(self, key):
+        ordinal = self.ordinals.pop(key, None)
+        if ordinal is None:
+            return
+
+        self.keys[ordinal] = None
+        for term in self.document_terms[ordinal]:
+            self.document_frequency[term] -= 1
+        self.document_terms[ordinal] = ()
+        self.total_length -= self.lengths[ordinal]
+        self.dead += 1
+
+        if self.dead >= COMPACT_MIN_DEAD and self.dead >= len(self.keys) * COMPACT_DEAD_RATIO:
+            self.compact()
+
+    def compact(self):
+        """Drop the postings of dead documents and renumber the live ones"""
+
+        remap = array("q", [-1]) * len(self.keys)
+        keys, document_terms, lengths = [], [], array("f")
+        for ordinal, key in enumerate(self.keys):
+            if key is not None:
+                remap[ordinal] = len(keys)
+                keys.append(key)
+                document_terms.append(self.document_terms[ordinal])
+                lengths.append(self.lengths[ordinal])
+
+        postings = {}
+        for term, (ordinals, frequencies, fuzzy_frequencies) in self.postings.items():
+            live = (array("I"), array("f"), array("f"))
+            for ordinal, frequency, fuzzy_frequency in zip(
+                ordinals, frequencies, fuzzy_frequencies
+            ):
+                new_ordinal = remap[ordinal]
+                if new_ordinal >= 0:
+                    live[0].append(new_ordinal)
+                    live[1].append(frequency)
+                    live[2].append(fuzzy_frequency)
+            if live[0]:
+                postings[term] = live
+
+        self.postings = postings
+        self.terms = sorted(postings)
+        for term, count in self.document_frequency.items():
+            if not count:
+                self.trigrams.remove(term)
+        self.document_frequency = {
+            term: count for term, count in self.document_frequency.items() if count
+        }
+        self.keys = keys
+        self.document_terms = document_terms
+        self.ordinals = {key: ordinal for ordinal, key in enumerate(keys)}
+        self.lengths = lengths
+        self.dead = 0
+
+    def expand(self, token, fuzzy=False):
+        """
+        Return the (term, weight, fuzzy_only) triples a query token
+        matches, fuzzy_only for the similar terms that only match in the
+        fuzzy_fields
+        """
+
+        matches = [(token, 1.0, False)] if self.document_frequency.get(token) else []
+        if len(token) >= MIN_PREFIX_LENGTH:
+            position = bisect_left(self.terms, token)
+            while position < len(self.terms) and len(matches) < MAX_PREFIX_EXPANSIONS:
+                term = self.terms[position]
+                if not term.startswith(token):
+                    break
+                if term != token and self.document_frequency[term]:
+                    matches.append((term, PREFIX_MATCH_WEIGHT, False))
+                position += 1
+
+        if fuzzy:
+            weights = {term: (weight, fuzzy_only) for term, weight, fuzzy_only in matches}
+            similar = [
+                (term, score)
+                for term, score in self.trigrams.similar(token)
+                if self.document_frequency.get(term)
+            ]
+            for term, score in similar[:MAX_FUZZY_EXPANSIONS]:
+                weight, fuzzy_only = weights.get(term, (0.0, True))
+                weights[term] = (max(weight, score), fuzzy_only)
+            matches = [(term, weight, fuzzy_only) for term, (weight, fuzzy_only) in weights.items()]
+        return matches
+
+    def search(self, query, limit=None, fuzzy=False):
+        """
+        Return (key, score) of the documents matching query, best first.
+        A fuzzy search also matches the terms similar to the query tokens.
+        """
+
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self.ordinals:
+            return []
+
+        groups = []
+        for token in tokens:
+            matches = self.expand(token, fuzzy)
+            if not matches:
+                return []
+            groups.append(matches)
+
+        # starting with the rarest token keeps the candidate set small
+        groups.sort(
+            key=lambda matches: sum(self.document_frequency[term] for term, *_ in matches)
+        )
+
+        documents = len(self.ordinals)
+        average_length = self.total_length / documents or 1.0
+        k1, b, keys, lengths = self.k1, self.b, self.keys, self.lengths
+
+        scores = None
+        for matches in groups:
+            token_scores = {}
+            for term, match_weight, fuzzy_only in matches:
+                ordinals, frequencies, fuzzy_frequencies = self.postings[term]
+                live = self.document_frequency[term]
+                if not live:
+                    continue
+                idf = math.log(1 + (documents - live + 0.5) / (live + 0.5))
+                if fuzzy_only:
+                    frequencies = fuzzy_frequencies
+                for ordinal, frequency in zip(ordinals, frequencies):
+                    if (
+                        not frequency
+                        or keys[ordinal] is None
+                        or (scores is not None and ordinal not in scores)
+                    ):
+                        continue
+                    norm = k1 * (1 - b + b * lengths[ordinal] / average_length)
+                    score = match_weight * idf * frequency * (k1 + 1) / (frequency + norm)
+                    if score > token_scores.get(ordinal, 0.0):
+                        token_scores[ordinal] = score
+
+            if scores is not None:
+                token_scores = {
+                    ordinal: scores[ordinal] + score for ordinal, score in token_scores.items()
+                }
+            scores = token_scores
+            if not scores:
+                return []
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        return [(keys[ordinal], score) for ordinal, score in ranked]
@@ -0,0 +1,17 @@
+import re
+
+# words, keeping the + and # of c++ or c#
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be by for from has have in is it its of on or our
+    that the their this to was we were will with you your
+    """.split()
+)
+
+
+def tokenize(text):
+    """Lowercased words of text, without stop words"""
+
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
@@ -0,0 +1,77 @@
+import math
+
+# words at least this similar to a query token match it, as the default
+# pg_trgm.similarity_threshold
+MIN_SIMILARITY = 0.3
+
+
+def trigrams(word):
+    """Trigrams of a word padded like pg_trgm, two spaces before and one after"""
+
+    padded = f"  {word} "
+    return frozenset(padded[position : position + 3] for position in range(len(padded) - 2))
+
+
+def similarity(left, right):
+    """Share of the trigrams of two trigram sets they have in common"""
+
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+class TrigramIndex:
+    """
+    Words indexed by their trigrams, to find the words similar to a
+    misspelled one.
+
+    Two words are similar when they share enough of their trigrams
+    (Jaccard similarity). Reaching min_similarity requires sharing at
+    least ceil(min_similarity * n) of the n trigrams of the query, so any
+    match contains one of the n - that + 1 rarest of them: only the words
+    in those postings are scored, the postings of common trigrams like
+    "ing" are never read.
+    """
+
+    def __init__(self):
+        self.postings = {}  # trigram -> set of words
+        self.words = {}  # word -> trigrams
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def add(self, word):
+        if word in self.words:
+            return
+        grams = self.words[word] = trigrams(word)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(word)
+
+    def remove(self, word):
+        grams = self.words.pop(word, None)
+        for gram in grams or ():
+            postings = self.postings[gram]
+            postings.discard(word)
+            if not postings:
+                del self.postings[gram]
+
+    def similar(self, word, min_similarity=MIN_SIMILARITY):
+        """Return (word, similarity) of the indexed words similar to word, best first"""
+
+        grams = trigrams(word)
+        required = math.ceil(min_similarity * len(grams))
+        rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+
+        candidates = set()
+        for gram in rarest[: len(grams) - required + 1]:
+            candidates.update(self.postings.get(gram, ()))
+
+        matches = []
+        for candidate in candidates:
+            score = similarity(grams, self.words[candidate])
+            if score >= min_similarity:
+                matches.append((candidate, score))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
@@ -2,13 +2,44 @@ from re import findall
 
 from rest_framework import serializers
 
+from apps.jobs.constants import values
+from apps.jobs.constants.values import JOB_DESCRIPTION_FIELDS
 from apps.jobs.models import Company, ContactMessage, Job
+from apps.utils.serializers import SparseFieldsetMixin, ValuesSerializer
 
 
-class JobSerializer(serializers.ModelSerializer):
-    """Job object serializer class"""
+def combine_description(data):
+    """
+    Move the description fields of a serialized job into one "description"
+    field, skipping the ones left out by a sparse fieldset or a summary
+    serializer
+    """
 
-    total_applicants = serializers.IntegerField(read_only=True)
+    description = {
+        field: data.pop(field) for field in JOB_DESCRIPTION_FIELDS if field in data
+    }
+    if description:
+        data["description"] = description
+    return data
+
+
+class JobValuesSerializer(ValuesSerializer):
+    """Renders job values() rows the way JobSerializer renders jobs"""
+
+    def finalize(self, data):
+        return combine_description(data)
+
+
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Job object serializer class, supports ?fields= and ?omit=,
+    where "description" stands for the whole description block
+    """
+
+    field_groups = {"description": JOB_DESCRIPTION_FIELDS}
+    values_serializer_class = JobValuesSerializer
+
+    total_applicants = serializers.IntegerField(source="applicants_count", read_only=True)
     has_applied = serializers.BooleanField(read_only=True)
 
     class Meta:
@@ -16,12 +47,12 @@ class JobSerializer(serializers.ModelSerializer):
         we are exlucding some fields in the to_representation method,
         so we don't need to explicitly add the exclude field which contains
         a dict of values to be excluded from the serialized data.
-        "__all__" is necessary because if it's present here, then
-        Job data fields wouldn't be accessible.
+        applicants_count is only excluded because it is already exposed
+        as total_applicants.
         """
 
         model = Job
-        fields = "__all__"
+        exclude = ["applicants_count"]
         read_only_fields = ["employer_id", "company"]
 
     def to_representation(self, instance):
@@ -37,20 +68,7 @@ class JobSerializer(serializers.ModelSerializer):
         if data:
             try:
                 # Combine fields
-                data.update(
-                    {
-                        "description": {
-                            "about": data.pop("about", None),
-                            "job_responsibilities": data.pop(
-                                "job_responsibilities", None
-                            ),
-                            "skills_required": data.pop("skills_required", None),
-                            "education_or_certifications": data.pop(
-                                "education_or_certifications", None
-                            ),
-                        }
-                    }
-                )
+                data = combine_description(data)
 
             except Exception:
                 data = {"error": {"message": "Something Went Wrong"}}
@@ -58,6 +76,61 @@ class JobSerializer(serializers.ModelSerializer):
         return data
 
 
+class JobSummarySerializer(JobSerializer):
+    """
+    Slim job representation for list pages, without the
+    description block and its large text fields
+    """
+
+    class Meta(JobSerializer.Meta):
+        exclude = ["applicants_count", *JOB_DESCRIPTION_FIELDS]
+
+
+class EmployerJobSerializer(JobSerializer):
+    """Job representation on the employer dashboard, with applicant counts per status"""
+
+    applicants_by_status = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+
+class BulkJobSerializer(JobSerializer):
+    """
+    Posting of POST /jobs/bulk. The is_active and is_created flags are
+    not editable on the model, but a posting sets them like a single
+    POST /jobs/ does.
+    """
+
+    is_active = serializers.BooleanField(required=False, default=False)
+    is_created = serializers.BooleanField(required=False, default=False)
+
+
+class BulkJobStatusSerializer(serializers.Serializer):
+    job_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=values.JOBS_BULK_UPDATE_LIMIT,
+    )
+    operation = serializers.ChoiceField(
+        choices=(values.CLOSE_JOBS, values.DELETE_JOBS), default=values.DELETE_JOBS
+    )
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(trim_whitespace=True)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=values.JOBS_AUTOCOMPLETE_MAX_LIMIT,
+        default=values.JOBS_AUTOCOMPLETE_LIMIT,
+    )
+
+
+class AutocompleteSuggestionSerializer(serializers.Serializer):
+    text = serializers.CharField()
+    kind = serializers.CharField()
+    count = serializers.IntegerField()
+
+
 class CompanySerializer(serializers.ModelSerializer):
     """Company object serializer class"""
 
@@ -66,6 +139,15 @@ class CompanySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class CompanyListSerializer(CompanySerializer):
+    """
+    Company of the company directory, with its number of active jobs
+    annotated by the listing's query
+    """
+
+    active_jobs_count = serializers.IntegerField(read_only=True)
+
+
 class ContactUsSerializer(serializers.ModelSerializer):
     """Contact us object serializer class"""
 
@@ -0,0 +1,15 @@
+"""
+Custom signals for changes to jobs that don't go through Model.save().
+
+QuerySet.update() and bulk operations skip post_save, so the job queryset
+sends these instead for anything that has to follow the jobs table.
+"""
+
+from django.dispatch import Signal
+
+# sent after a queryset update changed at least one job,
+# with `fields`, the set of field names that were updated
+jobs_updated = Signal()
+
+# sent after a bulk_create inserted jobs, with `jobs`, the created instances
+jobs_created = Signal()
@@ -0,0 +1,199 @@
+"""
+Similar jobs, found through MinHash signatures, and reposted jobs, found
+through SimHash fingerprints.
+
+The signature of the job_role, skills_required and about of a job is
+computed when the job is saved (see receivers.py) and stored with the
+locality sensitive hashing bucket of each of its bands. The jobs similar
+to one are looked up among the jobs sharing one of its buckets, so a
+lookup costs the size of those buckets rather than the number of jobs.
+Jobs changed with a queryset update, or saved before signatures existed,
+are indexed by the build_job_signatures command.
+
+The fingerprint of the role and description fields of a job is stored
+the same way, with its bands. A new job is a repost of a job of the same
+company when their fingerprints are at most simhash.MAX_DISTANCE bits
+apart, only the company's jobs sharing a band with it are compared. The
+build_job_fingerprints command fingerprints existing jobs.
+"""
+
+import numpy as np
+from django.db import transaction
+
+from apps.jobs.constants.values import JOB_DESCRIPTION_FIELDS
+from apps.jobs.models import (
+    Job,
+    JobFingerprint,
+    JobFingerprintBand,
+    JobSignature,
+    JobSignatureBucket,
+)
+from apps.jobs.similarity import minhash, simhash
+
+SIGNATURE_FIELDS = ("job_role", "skills_required", "about")
+FINGERPRINT_FIELDS = ("job_role", *JOB_DESCRIPTION_FIELDS)
+
+# estimated Jaccard similarity under which jobs are not considered similar,
+# around where the LSH bands of minhash start sharing buckets
+MIN_SIMILARITY = 0.4
+
+
+def job_text(job, fields=SIGNATURE_FIELDS):
+    """
+    The text a job's signature (or fingerprint) is computed from, job is a
+    dict of the fields. Placeholders left by a field's default are
+    skipped, they would make unrelated jobs look alike.
+    """
+
+    return " ".join(
+        job[field]
+        for field in fields
+        if job[field] and job[field] != Job._meta.get_field(field).default
+    )
+
+
+def index_jobs(jobs):
+    """Compute and store the signatures of jobs, dicts with their pk and SIGNATURE_FIELDS"""
+
+    job_ids, signatures, buckets = [], [], []
+    for job in jobs:
+        job_ids.append(job["pk"])
+        signature = minhash.signature(job_text(job))
+        if signature is None:
+            continue
+        signatures.append(JobSignature(job_id=job["pk"], minhash=signature.tobytes()))
+        buckets.extend(
+            JobSignatureBucket(job_id=job["pk"], bucket=bucket)
+            for bucket in minhash.buckets(signature)
+        )
+
+    with transaction.atomic():
+        JobSignature.objects.filter(job_id__in=job_ids).delete()
+        JobSignatureBucket.objects.filter(job_id__in=job_ids).delete()
+        JobSignature.objects.bulk_create(signatures, batch_size=500)
+        JobSignatureBucket.objects.bulk_create(buckets, batch_size=1000)
+
+
+def similar_jobs(job_id, jobs, limit):
+    """
+    Return the ids of the limit jobs of the jobs queryset most similar to
+    the job job_id, most similar first
+    """
+
+    target = JobSignature.objects.filter(job_id=job_id).values_list("minhash", flat=True).first()
+    if target is None:
+        return []
+    target = np.frombuffer(target, dtype=np.uint32)
+
+    ranked = []
+    for candidate_id, signature in candidates(job_id, target, jobs):
+        similarity = minhash.similarity(target, np.frombuffer(signature, dtype=np.uint32))
+        if similarity >= MIN_SIMILARITY:
+            ranked.append((similarity, candidate_id))
+    ranked.sort(key=lambda match: match[0], reverse=True)
+    return [candidate_id for _, candidate_id in ranked[:limit]]
+
+
+def candidates(job_id, target, jobs):
+    """
+    The (job_id, minhash) of the jobs of the jobs queryset sharing an LSH
+    bucket with target, the signature of the job job_id
+    """
+
+    return JobSignature.objects.filter(
+        job__in=jobs.filter(
+            pk__in=JobSignatureBucket.objects.filter(
+                bucket__in=minhash.buckets(target)
+            ).values("job")
+        ).exclude(pk=job_id)
+    ).values_list("job_id", "minhash")
+
+
+def fingerprint_jobs(jobs):
+    """
+    Compute and store the fingerprints of jobs, dicts with their pk,
+    company_id and FINGERPRINT_FIELDS
+    """
+
+    job_ids, fingerprints, bands = [], [], []
+    for job in jobs:
+        job_ids.append(job["pk"])
+        fingerprint = simhash.fingerprint(job_text(job, FINGERPRINT_FIELDS))
+        if fingerprint is None:
+            continue
+        fingerprints.append(JobFingerprint(job_id=job["pk"], simhash=fingerprint))
+        bands.extend(
+            JobFingerprintBand(job_id=job["pk"], company_id=job["company_id"], band=band)
+            for band in simhash.bands(fingerprint)
+        )
+
+    with transaction.atomic():
+        JobFingerprint.objects.filter(job_id__in=job_ids).delete()
+        JobFingerprintBand.objects.filter(job_id__in=job_ids).delete()
+        JobFingerprint.objects.bulk_create(fingerprints, batch_size=500)
+        JobFingerprintBand.objects.bulk_create(bands, batch_size=1000)
+
+
+def find_duplicate(company_id, job, jobs):
+    """
+    Return the id of the job of the company, among the jobs queryset,
+    closest to being a repost of job (a dict of its FINGERPRINT_FIELDS),
+    None if none is a near-duplicate of it
+    """
+
+    return find_duplicates(company_id, [job], jobs)[0]
+
+
+def find_duplicates(company_id, postings, jobs):
+    """
+    find_duplicate for several postings of a company at once, with one
+    query. A posting that is no repost of a job of the queryset can still
+    repeat an earlier posting of the list: its position in the list is
+    returned instead of a job id.
+    """
+
+    fingerprints = [simhash.fingerprint(job_text(job, FINGERPRINT_FIELDS)) for job in postings]
+    bands = {
+        band
+        for fingerprint in fingerprints
+        if fingerprint is not None
+        for band in simhash.bands(fingerprint)
+    }
+
+    banded = {}
+    if bands:
+        candidates = JobFingerprint.objects.filter(
+            job__in=jobs.filter(
+                pk__in=JobFingerprintBand.objects.filter(
+                    company_id=company_id, band__in=bands
+                ).values("job")
+            )
+        ).values_list("job_id", "simhash")
+        for candidate_id, candidate in candidates:
+            for band in simhash.bands(candidate):
+                banded.setdefault(band, []).append((candidate_id, candidate))
+
+    duplicates, posted = [], {}
+    for position, fingerprint in enumerate(fingerprints):
+        if fingerprint is None:
+            duplicates.append(None)
+            continue
+
+        duplicate = None
+        for candidates in (banded, posted):
+            closest = None
+            for band in simhash.bands(fingerprint):
+                for candidate_id, candidate in candidates.get(band, ()):
+                    distance = simhash.distance(fingerprint, candidate)
+                    if distance <= simhash.MAX_DISTANCE and (
+                        closest is None or distance < closest[0]
+                    ):
+                        closest = (distance, candidate_id)
+            if closest is not None:
+                duplicate = closest[1]
+                break
+        duplicates.append(duplicate)
+
+        for band in simhash.bands(fingerprint):
+            posted.setdefault(band, []).append((position, fingerprint))
+    return duplicates
@@ -0,0 +1,78 @@
+import hashlib
+
+import numpy as np
+
+from apps.jobs.search.text import tokenize
+
+# number of hash functions of a signature, split in BANDS bands of
+# ROWS rows. Two jobs share a bucket with probability 1 - (1 - s^ROWS)^BANDS
+# for a Jaccard similarity s: ~0.003 at s = 0.1, ~0.05 at 0.2, ~0.56 at 0.4,
+# ~0.87 at 0.5 and ~0.99 at 0.6, the curve rises around
+# (1 / BANDS)^(1 / ROWS) ~ 0.42, kept close to similarity.MIN_SIMILARITY.
+# Changing these needs the signatures rebuilt (build_job_signatures --all)
+PERMUTATIONS = 128
+BANDS = 32
+ROWS = PERMUTATIONS // BANDS
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# the hash functions (a * x + b) % MERSENNE_PRIME, fixed so signatures
+# computed by every process and release can be compared
+_generator = np.random.RandomState(20240601)
+_A = _generator.randint(1, 1 << 31, size=PERMUTATIONS).astype(np.uint64)
+_B = _generator.randint(0, 1 << 31, size=PERMUTATIONS).astype(np.uint64)
+
+
+def shingles(text):
+    """The distinct words of text, and the pairs of consecutive ones"""
+
+    tokens = tokenize(text)
+    return set(tokens) | {f"{first} {second}" for first, second in zip(tokens, tokens[1:])}
+
+
+def signature(text):
+    """
+    MinHash signature of the shingles of text, PERMUTATIONS uint32, None
+    when text has no words
+    """
+
+    values = np.array(
+        [
+            int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little")
+            for shingle in shingles(text)
+        ],
+        dtype=np.uint64,
+    )
+    if not len(values):
+        return None
+
+    hashed = (np.outer(values, _A) + _B) % MERSENNE_PRIME & MAX_HASH
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def buckets(minhash):
+    """LSH bucket of every band of a signature, as signed 64 bit integers"""
+
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                band.to_bytes(1, "little") + minhash[band * ROWS : (band + 1) * ROWS].tobytes(),
+                digest_size=8,
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(left, right):
+    """
+    Jaccard similarity of two texts estimated from their signatures, 0
+    for signatures computed with another number of PERMUTATIONS
+    """
+
+    if len(left) != len(right):
+        return 0.0
+    return float(np.count_nonzero(left == right)) / len(left)
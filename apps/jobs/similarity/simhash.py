@@ -0,0 +1,66 @@
+import hashlib
+from collections import Counter
+
+import numpy as np
+
+from apps.jobs.search.text import tokenize
+
+BITS = 64
+
+# fingerprints at most MAX_DISTANCE bits apart are near-duplicates: a
+# posting of 60 words with one word changed is ~4 bits away, two unrelated
+# ones ~32. Split in BANDS bands of BITS // BANDS bits, two such
+# fingerprints have at least one band in common (pigeonhole), so only the
+# jobs sharing a band with a fingerprint have to be compared with it.
+MAX_DISTANCE = 7
+BANDS = MAX_DISTANCE + 1
+BAND_BITS = BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def features(text):
+    """Words and pairs of consecutive words of text, with their number of occurrences"""
+
+    tokens = tokenize(text)
+    return Counter(tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])])
+
+
+def fingerprint(text):
+    """
+    64 bit SimHash of text, as a signed integer to fit a BigIntegerField,
+    None when text has no words.
+
+    Every bit is the sign of the sum of the weights of the features whose
+    hash has it set, minus the weights of those whose hash has not. Texts
+    sharing most of their features get fingerprints differing in few bits.
+    """
+
+    weights = features(text)
+    if not weights:
+        return None
+
+    hashes = np.frombuffer(
+        b"".join(
+            hashlib.blake2b(feature.encode(), digest_size=8).digest() for feature in weights
+        ),
+        dtype=np.uint8,
+    ).reshape(-1, 8)
+    bits = np.unpackbits(hashes, axis=1, bitorder="little").astype(np.int64)
+    totals = np.array(list(weights.values()), dtype=np.int64) @ (2 * bits - 1)
+
+    packed = np.packbits(totals > 0, bitorder="little").tobytes()
+    return int.from_bytes(packed, "little", signed=True)
+
+
+def bands(value):
+    """The bits of every band of a fingerprint, prefixed with the band number"""
+
+    return [
+        band << BAND_BITS | (value >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)
+    ]
+
+
+def distance(left, right):
+    """Number of bits two fingerprints differ in"""
+
+    return bin((left ^ right) & ((1 << BITS) - 1)).count("1")
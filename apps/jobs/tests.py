@@ -1,17 +1,95 @@
+import json
+import math
+import tracemalloc
 import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import Case, F, Value, When
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework_simplejwt.tokens import AccessToken
 
+from apps.applicants.models import Applicants, ArchivedApplicant
+from apps.jobs import cache as job_cache, recommendations, search
+from apps.jobs.recommendations.skill_matrix import SkillMatrix
+from apps.jobs.similarity import minhash, simhash
+from apps.jobs.constants import values
+from apps.jobs.search.autocomplete import PrefixIndex
+from apps.jobs.search.inverted_index import InvertedIndex
+from apps.jobs.search.trigrams import TrigramIndex
+from apps.jobs.utils.trending import SpaceSaving, TrendingKeywords
 from apps.jobs.models import User
+from apps.userprofile.models import UserProfile
 
-from .models import Company, Job
+from .models import (
+    ArchivedJob,
+    Company,
+    Job,
+    JobCategoryCount,
+    JobFingerprint,
+    JobSignature,
+    TrendingKeyword,
+)
+from .serializers import JobSerializer, JobSummarySerializer, JobValuesSerializer
 
 # Create your tests here.
 
 
+def create_employer(email="employer@testing.com", name="Employer", is_profile_completed=False):
+    employer = User.objects.create_user(email=email, name=name, user_type="Employer")
+    if is_profile_completed:
+        employer.is_profile_completed = True
+        employer.save()
+    return employer
+
+
+def create_company(creator, **overrides):
+    return Company.objects.create(
+        **{
+            "creator": creator,
+            "name": "Testing name",
+            "location": "Testing Location",
+            "about": "Testing about",
+            "founded_year": 2011,
+            **overrides,
+        }
+    )
+
+
+def build_job(company, **overrides):
+    """An unsaved job of company, posted by its creator unless overridden"""
+
+    return Job(
+        **{
+            "company": company,
+            "employer": company.creator,
+            "job_role": "Security Engineer",
+            "location": "Remote",
+            "job_type": "full time",
+            "vacancy_position": 1,
+            "industry": "Security",
+            **overrides,
+        }
+    )
+
+
+def create_job(company, **overrides):
+    job = build_job(company, **overrides)
+    job.save()
+    return job
+
+
 class JobViewSetsTestCase(TestCase):
     def setUp(self):
         # Create sample data for testing
@@ -58,3 +136,1520 @@ class JobViewSetsTestCase(TestCase):
         # dummy token
         self.access_token = ""
         self.client.credentials(HTTP_ACCESSTOKEN=self.access_token)
+
+
+class JobCursorPaginationTestCase(TestCase):
+    def setUp(self):
+        company = create_company(create_employer())
+        self.jobs = [
+            create_job(company, job_role=f"Security Engineer {index}", category="security")
+            for index in range(7)
+        ]
+
+        self.client = APIClient()
+
+    def test_walks_every_job_once_in_both_directions(self):
+        expected = [
+            str(job_id)
+            for job_id in Job.objects.order_by("-created_at", "job_id").values_list(
+                "job_id", flat=True
+            )
+        ]
+
+        seen, pages = [], []
+        url = "/jobs/?pagination=cursor&limit=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            pages.append(response.data)
+            seen += [job["job_id"] for job in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+
+        previous = self.client.get(pages[-1]["previous"])
+        self.assertEqual(
+            [job["job_id"] for job in previous.data["results"]], expected[3:6]
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/jobs/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_offset_pagination_stays_the_default(self):
+        response = self.client.get("/jobs/?limit=3")
+        self.assertEqual(response.data["count"], 7)
+
+
+class JobResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.employer = create_employer()
+        self.company = create_company(self.employer)
+        self.job = create_job(self.company)
+
+        self.client = APIClient()
+
+    def test_repeated_anonymous_reads_are_served_from_the_cache(self):
+        first = self.client.get("/jobs/?limit=5&offset=0")
+        second = self.client.get("/jobs/?offset=0&limit=5")
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+
+        stats = job_cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_writes_invalidate_cached_responses(self):
+        self.client.get(f"/jobs/{self.job.job_id}/")
+
+        Job.objects.filter(pk=self.job.pk).update(job_role="SOC Analyst")
+        response = self.client.get(f"/jobs/{self.job.job_id}/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["job_role"], "SOC Analyst")
+
+        self.client.get("/jobs/")
+        create_job(self.company, job_role="Malware Analyst")
+        response = self.client.get("/jobs/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_applications_refresh_cached_lists_without_bumping_jobs(self):
+        seeker = User.objects.create_user(
+            email="seeker@testing.com", name="Seeker", user_type="Job Seeker"
+        )
+        self.client.get("/jobs/")
+        job_version = job_cache.get_versions([job_cache.JOB])
+
+        Applicants.objects.create(job=self.job, user=UserProfile.objects.create(user=seeker))
+
+        response = self.client.get("/jobs/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["results"][0]["total_applicants"], 1)
+        self.assertEqual(job_cache.get_versions([job_cache.JOB]), job_version)
+
+    def test_hosts_are_cached_apart(self):
+        for number in range(2):
+            create_job(self.company, job_role=f"Analyst {number}")
+        self.client.get("/jobs/?limit=1")
+
+        response = self.client.get("/jobs/?limit=1", HTTP_HOST="localhost")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertTrue(response.json()["next"].startswith("http://localhost/"))
+
+    def test_process_local_backends_are_refused(self):
+        with self.settings(JOBS_CACHE_ALLOW_LOCAL=False):
+            with self.assertRaises(ImproperlyConfigured):
+                job_cache.check_shared_backend()
+
+            shared = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+            with self.settings(CACHES=shared):
+                job_cache.check_shared_backend()
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.client.force_authenticate(self.employer)
+        self.client.get("/jobs/")
+        response = self.client.get("/jobs/")
+        self.assertNotIn("X-Cache", response)
+
+
+class JobCategoryCountTestCase(TestCase):
+    def setUp(self):
+        self.company = create_company(create_employer())
+        self.client = APIClient()
+
+    def create_job(self, category, is_active=True):
+        return create_job(self.company, category=category, is_active=is_active)
+
+    def get_counts(self, query=""):
+        response = self.client.get(f"/jobs/get_count_by_categories/{query}")
+        return {row["category"]: int(row["count"]) for row in response.data}
+
+    def test_counts_follow_creates_updates_and_deletes(self):
+        security = self.create_job("security")
+        self.create_job("security")
+        self.create_job("development", is_active=False)
+        moved = self.create_job(None)
+
+        moved.category = "development"
+        moved.save()
+        Job.objects.filter(pk=security.pk).update(
+            is_created=False, is_deleted=True, is_active=False
+        )
+
+        self.assertEqual(self.get_counts(), {"security": 2, "development": 2})
+        self.assertEqual(self.get_counts("?live=true"), {"security": 1, "development": 1})
+
+        Job.objects.filter(category="development").delete()
+        self.assertEqual(self.get_counts(), {"security": 2})
+
+    def test_counts_follow_updates_with_expressions(self):
+        self.create_job("security")
+        self.create_job("development")
+        self.create_job(None, is_active=False)
+
+        Job.objects.update(
+            category=Case(
+                When(category="security", then=Value("development")),
+                When(category="development", then=Value("security")),
+                default=Value("design"),
+            ),
+            is_active=~F("is_active"),
+        )
+
+        self.assertEqual(self.get_counts(), {"security": 1, "development": 1, "design": 1})
+        self.assertEqual(self.get_counts("?live=true"), {"design": 1})
+
+    def test_rebuild_matches_the_jobs_table(self):
+        self.create_job("security")
+        self.create_job(None, is_active=False)
+        JobCategoryCount.objects.update(jobs_count=100)
+
+        call_command("rebuild_category_counts", stdout=StringIO())
+
+        self.assertEqual(self.get_counts(), {"security": 1, None: 1})
+        self.assertEqual(self.get_counts("?live=true"), {"security": 1})
+
+
+class TrendingKeywordsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_space_saving_keeps_heavy_hitters_within_capacity(self):
+        sketch = SpaceSaving(capacity=3, half_life=3600, now=0)
+        for keyword in ["python"] * 5 + ["django"] * 3 + ["a", "b", "c"]:
+            sketch.offer(keyword, now=0)
+
+        counts = sketch.drain(now=0)
+        self.assertEqual(len(counts), 3)
+        self.assertEqual(max(counts, key=counts.get), "python")
+
+    def test_recent_searches_outrank_old_ones_after_flush(self):
+        trending = TrendingKeywords(capacity=10, half_life=60, flush_interval=3600)
+        now = 1_000_000
+        for _ in range(4):
+            trending.record("  Web   Security ", now=now)
+        trending.flush(now=now)
+
+        for _ in range(2):
+            trending.record("malware", now=now + 600)
+        trending.flush(now=now + 600)
+
+        top = trending.top(limit=3)
+        self.assertEqual(top[:2], ["malware", "web security"])
+        self.assertEqual(top[2], values.trending_keywords[0])
+
+    def test_keywords_created_by_another_worker_keep_their_counts(self):
+        trending = TrendingKeywords(capacity=10, half_life=60, flush_interval=3600)
+        now = 1_000_000
+        TrendingKeyword.objects.create(keyword="python", rank=math.log2(3) + now / 60)
+        for keyword in ["python", "python", "django"]:
+            trending.record(keyword, now=now)
+
+        # the row appears between the read and the insert
+        with patch.object(
+            TrendingKeyword.objects,
+            "select_for_update",
+            side_effect=[TrendingKeyword.objects.none(), TrendingKeyword.objects.select_for_update()],
+        ):
+            trending.flush(now=now)
+
+        ranks = dict(TrendingKeyword.objects.values_list("keyword", "rank"))
+        self.assertAlmostEqual(ranks["python"], math.log2(5) + now / 60)
+        self.assertAlmostEqual(ranks["django"], now / 60)
+
+    def test_failed_flushes_keep_the_counts_for_the_next_one(self):
+        trending = TrendingKeywords(capacity=10, half_life=60, flush_interval=0)
+        now = trending.last_flush
+        with patch.object(TrendingKeywords, "save", side_effect=DatabaseError("locked")):
+            with self.assertLogs("apps.jobs.utils.trending", "WARNING"):
+                trending.record("python", now=now)
+                trending.record("python", now=now)
+        self.assertFalse(TrendingKeyword.objects.exists())
+
+        trending.record("django", now=now)
+        ranks = dict(TrendingKeyword.objects.values_list("keyword", "rank"))
+        self.assertAlmostEqual(ranks["python"], 1 + now / 60)
+        self.assertAlmostEqual(ranks["django"], now / 60)
+
+    def test_endpoint_falls_back_to_static_keywords(self):
+        response = APIClient().get("/jobs/get_trending_keywords/")
+        self.assertEqual(
+            response.data["data"]["trending_keywords"], values.trending_keywords
+        )
+
+
+class JobSparseFieldsetTestCase(TestCase):
+    def setUp(self):
+        self.job = create_job(create_company(create_employer()))
+        self.client = APIClient()
+
+    def test_full_representation_keeps_the_description_block(self):
+        job = self.client.get("/jobs/").data["results"][0]
+        self.assertEqual(
+            set(job["description"]),
+            {"about", "job_responsibilities", "skills_required", "education_or_certifications"},
+        )
+
+    def test_fields_and_omit(self):
+        job = self.client.get("/jobs/?fields=job_id,job_role,description").data["results"][0]
+        self.assertEqual(set(job), {"job_id", "job_role", "description"})
+
+        job = self.client.get(f"/jobs/{self.job.job_id}/?omit=description,industry").data
+        self.assertNotIn("description", job)
+        self.assertNotIn("industry", job)
+        self.assertIn("job_role", job)
+
+    def test_summary_view_skips_the_description(self):
+        job = self.client.get("/jobs/?view=summary").data["results"][0]
+        self.assertNotIn("description", job)
+        self.assertNotIn("about", job)
+        self.assertEqual(job["job_role"], "Security Engineer")
+
+
+class JobValuesSerializerTestCase(TestCase):
+    def setUp(self):
+        company = create_company(create_employer())
+        for index, (category, is_featured) in enumerate(
+            [("Security", True), (None, None), ("Design", False)]
+        ):
+            create_job(
+                company,
+                job_role=f"Engineer \u00e9 {index}",
+                vacancy_position=index,
+                category=category,
+                is_featured=is_featured,
+                experience=index,
+                applicants_count=index * 3,
+            )
+        self.renderer = JSONRenderer()
+        self.factory = APIRequestFactory()
+
+    def assert_same_output(self, serializer_class, query="", has_applied=False):
+        context = {"request": Request(self.factory.get(f"/jobs/?{query}"))}
+        jobs = list(Job.objects.order_by("-created_at"))
+        if has_applied:
+            for job in jobs:
+                job.has_applied = job.experience % 2 == 0
+
+        serializer = JobValuesSerializer(serializer_class(context=context))
+        rows = list(serializer.values(Job.objects.order_by("-created_at"), "experience"))
+        if has_applied:
+            for row in rows:
+                row["has_applied"] = row["experience"] % 2 == 0
+
+        self.assertEqual(
+            self.renderer.render(serializer.serialize(rows)),
+            self.renderer.render(serializer_class(jobs, many=True, context=context).data),
+        )
+
+    def test_output_is_byte_identical_to_job_serializer(self):
+        self.assert_same_output(JobSerializer)
+        self.assert_same_output(JobSerializer, has_applied=True)
+        self.assert_same_output(JobSerializer, query="fields=job_id,company,description")
+        self.assert_same_output(JobSerializer, query="omit=about,created_at")
+        self.assert_same_output(JobSummarySerializer)
+
+    def test_ordering_by_total_applicants(self):
+        client = APIClient()
+        for ordering, expected in [("total_applicants", [0, 3, 6]), ("-total_applicants", [6, 3, 0])]:
+            response = client.get(f"/jobs/?ordering={ordering}")
+            self.assertEqual([job["total_applicants"] for job in response.data["results"]], expected)
+
+    def test_listing_keeps_cursor_pagination_with_sparse_fieldsets(self):
+        client = APIClient()
+        response = client.get("/jobs/?pagination=cursor&limit=2&fields=job_role")
+        self.assertEqual([set(job) for job in response.data["results"]], [{"job_role"}] * 2)
+
+        response = client.get(response.data["next"])
+        self.assertEqual([job["job_role"] for job in response.data["results"]], ["Engineer \u00e9 0"])
+
+
+class EmployerDashboardTestCase(TestCase):
+    def setUp(self):
+        self.employer = create_employer()
+        self.company = create_company(self.employer)
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def create_jobs(self, count, job_type="full time"):
+        return [
+            create_job(self.company, job_role=f"Engineer {index}", job_type=job_type)
+            for index in range(count)
+        ]
+
+    def apply(self, job, statuses):
+        for index, status_name in enumerate(statuses):
+            seeker = User.objects.create_user(
+                email=f"{job.job_id}-{index}@testing.com", name="Seeker", user_type="Job Seeker"
+            )
+            Applicants.objects.create(
+                job=job, user=UserProfile.objects.create(user=seeker), status=status_name
+            )
+
+    def test_jobs_are_paginated_with_applicants_per_status(self):
+        job, other_job = self.create_jobs(2)
+        self.apply(job, ["applied", "applied", "shortlisted", "rejected"])
+
+        response = self.client.get("/jobs/employer/?limit=1&offset=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+        row = response.data["results"][0]
+        self.assertEqual(row["job_id"], str(job.job_id))
+        self.assertEqual(row["total_applicants"], 4)
+        self.assertEqual(
+            row["applicants_by_status"],
+            {
+                "under-reviewed": 0,
+                "shortlisted": 1,
+                "accepted": 0,
+                "rejected": 1,
+                "on-hold": 0,
+                "applied": 2,
+            },
+        )
+
+        response = self.client.get("/jobs/employer/")
+        self.assertEqual(response.data["results"][0]["applicants_by_status"]["applied"], 0)
+
+    def test_filters_apply_and_only_own_jobs_are_listed(self):
+        self.create_jobs(2)
+        self.create_jobs(1, job_type="part time")
+
+        other = create_employer("other@testing.com", name="Other")
+        create_job(self.company, employer=other, job_role="Not mine", job_type="part time")
+
+        response = self.client.get("/jobs/employer/?job_type=part time")
+        self.assertEqual(response.data["count"], 1)
+
+    def test_query_count_does_not_depend_on_the_page_size(self):
+        for job in self.create_jobs(3):
+            self.apply(job, ["applied", "shortlisted"])
+
+        with self.assertNumQueries(2):
+            self.client.get("/jobs/employer/?limit=1")
+        with self.assertNumQueries(2):
+            response = self.client.get("/jobs/employer/?limit=3")
+        self.assertEqual(len(response.data["results"]), 3)
+
+
+class JobBulkCreateTestCase(TestCase):
+    def setUp(self):
+        self.employer = create_employer(is_profile_completed=True)
+        self.company = create_company(self.employer)
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def posting(self, **overrides):
+        return {
+            "job_role": "Security Engineer",
+            "location": "Remote",
+            "job_type": "full time",
+            "vacancy_position": 2,
+            "industry": "Security",
+            "category": "security",
+            **overrides,
+        }
+
+    def test_valid_postings_are_created_together(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/jobs/bulk/",
+                [self.posting(), self.posting(job_role="SOC Analyst", category=None)],
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        job_inserts = [
+            query for query in queries if query["sql"].startswith('INSERT INTO "tbl_job" ')
+        ]
+        self.assertEqual(len(job_inserts), 1)
+        self.assertEqual(len(response.data["job_ids"]), 2)
+
+        jobs = Job.objects.filter(job_id__in=response.data["job_ids"])
+        self.assertEqual(
+            {(job.job_role, job.company_id, job.employer_id) for job in jobs},
+            {
+                ("Security Engineer", self.company.pk, self.employer.pk),
+                ("SOC Analyst", self.company.pk, self.employer.pk),
+            },
+        )
+        self.assertEqual(
+            set(JobCategoryCount.objects.values_list("category", "jobs_count")),
+            {("security", 1), ("", 1)},
+        )
+
+    def test_active_flag_is_kept_like_a_single_post(self):
+        response = self.client.post(
+            "/jobs/bulk/",
+            [self.posting(is_active=True, is_created=True), self.posting(job_role="SOC Analyst")],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        listed = self.client.get("/jobs/?is_active=true").data["results"]
+        self.assertEqual([job["job_role"] for job in listed], ["Security Engineer"])
+        self.assertTrue(Job.objects.get(job_role="Security Engineer").is_created)
+        self.assertFalse(Job.objects.get(job_role="SOC Analyst").is_active)
+
+    def test_errors_are_reported_per_posting(self):
+        response = self.client.post(
+            "/jobs/bulk/",
+            [self.posting(), self.posting(job_type="forever"), self.posting(job_role="")],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        errors = response.data["errors"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("job_type", errors[1])
+        self.assertIn("job_role", errors[2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_reposts_are_reported_per_posting(self):
+        about = "Run penetration tests of our web applications and review cloud configurations weekly."
+        posted = self.client.post(
+            "/jobs/bulk/", [self.posting(about=about, is_active=True)], format="json"
+        ).data["job_ids"][0]
+        postings = [
+            self.posting(about=about.replace("weekly", "monthly")),
+            self.posting(job_role="Product Designer", about="Design delightful products."),
+            self.posting(job_role="Product Designer", about="Design delightful products."),
+        ]
+
+        response = self.client.post("/jobs/bulk/", postings, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["duplicates"],
+            [{"duplicate_of": posted}, None, {"duplicate_of_posting": 1}],
+        )
+        self.assertEqual(Job.objects.count(), 1)
+
+        response = self.client.post("/jobs/bulk/?allow_duplicate=true", postings, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        job_ids = response.data["job_ids"]
+        self.assertEqual(response.data["duplicates_of"], [posted, None, job_ids[1]])
+
+    def test_only_employers_with_a_company_can_post(self):
+        seeker = User.objects.create_user(
+            email="seeker@testing.com", name="Seeker", user_type="Job Seeker"
+        )
+        seeker.is_profile_completed = True
+        seeker.save()
+        self.client.force_authenticate(seeker)
+        response = self.client.post("/jobs/bulk/", [self.posting()], format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.employer)
+        response = self.client.post("/jobs/bulk/", {"job_role": "Single"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobBulkStatusTestCase(TestCase):
+    def setUp(self):
+        self.employer = create_employer()
+        self.other_employer = create_employer("other@testing.com", name="Other")
+        company = create_company(self.employer)
+        self.mine, self.closed, self.deleted, self.theirs = [
+            create_job(company, employer=employer)
+            for employer in [self.employer] * 3 + [self.other_employer]
+        ]
+        Job.objects.filter(pk__in=[self.mine.pk, self.theirs.pk]).update(is_active=True)
+        Job.objects.filter(pk=self.deleted.pk).update(is_deleted=True)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def post(self, operation, job_ids):
+        return self.client.post(
+            "/jobs/bulk_status/",
+            {"operation": operation, "job_ids": [str(job_id) for job_id in job_ids]},
+            format="json",
+        )
+
+    def outcomes(self, response):
+        return {result["job_id"]: result["status"] for result in response.data["results"]}
+
+    def test_delete_reports_an_outcome_per_job(self):
+        missing = uuid.uuid4()
+        job_ids = [self.mine.pk, self.closed.pk, self.deleted.pk, self.theirs.pk, missing]
+
+        response = self.post("delete", job_ids)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            self.outcomes(response),
+            {
+                self.mine.pk: "deleted",
+                self.closed.pk: "deleted",
+                self.deleted.pk: "already_deleted",
+                self.theirs.pk: "forbidden",
+                missing: "not_found",
+            },
+        )
+
+        self.mine.refresh_from_db()
+        self.assertEqual(
+            (self.mine.is_deleted, self.mine.is_active, self.mine.is_created), (True, False, False)
+        )
+        self.theirs.refresh_from_db()
+        self.assertFalse(self.theirs.is_deleted)
+
+    def test_close_and_moderators(self):
+        response = self.post("close", [self.mine.pk, self.closed.pk, self.deleted.pk])
+        self.assertEqual(
+            self.outcomes(response),
+            {
+                self.mine.pk: "closed",
+                self.closed.pk: "already_closed",
+                self.deleted.pk: "not_found",
+            },
+        )
+        self.assertFalse(Job.objects.get(pk=self.mine.pk).is_active)
+        self.assertEqual(
+            JobCategoryCount.objects.get(is_active=True, category="").jobs_count, 1
+        )
+
+        moderator = User.objects.create_user(
+            email="moderator@testing.com", name="Moderator", user_type="Job Seeker"
+        )
+        self.client.force_authenticate(moderator)
+        self.assertEqual(self.post("close", [self.theirs.pk]).status_code, status.HTTP_403_FORBIDDEN)
+
+        User.objects.filter(pk=moderator.pk).update(is_moderator=True)
+        moderator.refresh_from_db()
+        self.client.force_authenticate(moderator)
+        response = self.post("close", [self.theirs.pk])
+        self.assertEqual(self.outcomes(response), {self.theirs.pk: "closed"})
+
+    def test_queries_do_not_grow_with_the_number_of_jobs(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.post("delete", [self.mine.pk, self.closed.pk])
+        job_updates = [
+            query for query in queries if query["sql"].startswith('UPDATE "tbl_job" ')
+        ]
+        self.assertEqual(len(job_updates), 1)
+
+    def test_invalid_ids_are_rejected(self):
+        response = self.post("delete", ["not-a-uuid"])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("job_ids", response.data)
+
+
+class ExpireJobsTestCase(TestCase):
+    def setUp(self):
+        company = create_company(create_employer())
+        now = timezone.now()
+        self.jobs = {}
+        for age in (1, 10, 30, 30, 45, 90):
+            job = create_job(company, job_role=f"Posted {age} days ago")
+            Job.objects.filter(pk=job.pk).update(
+                is_active=True, created_at=now - timedelta(days=age)
+            )
+            self.jobs.setdefault(age, []).append(job.pk)
+
+    def test_old_jobs_are_deactivated_in_batches(self):
+        output = StringIO()
+        call_command("expire_jobs", days=20, batch_size=2, stdout=output)
+
+        active = set(Job.objects.filter(is_active=True).values_list("pk", flat=True))
+        self.assertEqual(active, {*self.jobs[1], *self.jobs[10]})
+        self.assertIn("Deactivated 4 jobs", output.getvalue())
+        self.assertIn("rows/s", output.getvalue())
+        self.assertEqual(
+            JobCategoryCount.objects.get(is_active=False, category="").jobs_count, 4
+        )
+
+        output = StringIO()
+        call_command("expire_jobs", days=5, batch_size=2, stdout=output)
+        self.assertEqual(
+            set(Job.objects.filter(is_active=True).values_list("pk", flat=True)),
+            set(self.jobs[1]),
+        )
+        self.assertIn("Done, 1 jobs", output.getvalue())
+
+
+class DeletedJobsTestCase(TestCase):
+    def setUp(self):
+        company = create_company(create_employer())
+        self.live, self.deleted, self.old = [
+            create_job(company, job_role=job_role)
+            for job_role in ("Live", "Deleted", "Deleted long ago")
+        ]
+        Job.objects.filter(pk__in=[self.deleted.pk, self.old.pk]).update(
+            is_deleted=True, updated_at=timezone.now()
+        )
+        Job.all_objects.filter(pk=self.old.pk).update(
+            updated_at=timezone.now() - timedelta(days=365)
+        )
+
+        seeker = User.objects.create_user(
+            email="seeker@testing.com", name="Seeker", user_type="Job Seeker"
+        )
+        self.profile = UserProfile.objects.create(user=seeker)
+        self.application = Applicants.objects.create(job=self.old, user=self.profile)
+
+    def test_default_manager_leaves_out_deleted_jobs(self):
+        self.assertEqual(list(Job.objects.values_list("job_role", flat=True)), ["Live"])
+        self.assertEqual(Job.all_objects.count(), 3)
+
+        response = APIClient().get("/jobs/")
+        self.assertEqual([job["job_role"] for job in response.data["results"]], ["Live"])
+        self.assertEqual(
+            APIClient().get(f"/jobs/{self.deleted.pk}/").status_code, status.HTTP_404_NOT_FOUND
+        )
+
+        # applications still reach their deleted job
+        self.assertEqual(Applicants.objects.get().job, self.old)
+
+    def test_archive_moves_long_deleted_jobs_and_applications(self):
+        output = StringIO()
+        call_command("archive_deleted_jobs", days=30, batch_size=1, stdout=output)
+        self.assertIn("Done, 1 jobs", output.getvalue())
+
+        self.assertEqual(
+            set(Job.all_objects.values_list("pk", flat=True)), {self.live.pk, self.deleted.pk}
+        )
+        self.assertFalse(Applicants.objects.exists())
+
+        archived = ArchivedJob.objects.get()
+        self.assertEqual(archived.job_id, self.old.pk)
+        self.assertEqual(archived.data["job_role"], "Deleted long ago")
+        self.assertEqual(archived.data["company_id"], str(self.old.company_id))
+
+        application = ArchivedApplicant.objects.get()
+        self.assertEqual((application.id, application.job_id), (self.application.pk, self.old.pk))
+        self.assertEqual(application.data["status"], "applied")
+
+        self.assertEqual(
+            JobCategoryCount.objects.get(category="", is_active=False).jobs_count, 2
+        )
+
+    def test_archive_queries_do_not_grow_with_applications(self):
+        def archive(applications):
+            job = create_job(self.old.company, job_role="Deleted long ago")
+            for number in range(applications):
+                seeker = User.objects.create_user(
+                    email=f"seeker{applications}-{number}@testing.com",
+                    name="Seeker",
+                    user_type="Job Seeker",
+                )
+                Applicants.objects.create(job=job, user=UserProfile.objects.create(user=seeker))
+            Job.objects.filter(pk=job.pk).update(
+                is_deleted=True, updated_at=timezone.now() - timedelta(days=365)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                call_command("archive_deleted_jobs", days=30, stdout=StringIO())
+            return len(queries)
+
+        # the old job of setUp, with its one application, goes first
+        archive(0)
+        self.assertEqual(archive(2), archive(20))
+        version = job_cache.get_versions([job_cache.APPLICANTS])
+        archive(1)
+        # the receivers of the deleted applications ran
+        self.assertNotEqual(job_cache.get_versions([job_cache.APPLICANTS]), version)
+        self.assertFalse(Applicants.objects.exists())
+        self.assertEqual(ArchivedApplicant.objects.count(), 24)
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = create_company(create_employer())
+        self.job = create_job(self.company)
+        self.client = APIClient()
+        self.url = f"/jobs/{self.job.pk}/"
+
+    def test_unchanged_job_is_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # only the version lookup runs
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        # another representation of the same job
+        response = self.client.get(f"{self.url}?fields=job_role", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_changes_produce_a_new_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        Job.objects.filter(pk=self.job.pk).update(applicants_count=1)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        self.job.refresh_from_db()
+        self.job.job_role = "SOC Analyst"
+        self.job.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data["job_role"], "SOC Analyst")
+
+    def test_company_detail(self):
+        url = f"/company/{self.company.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        self.company.name = "Renamed"
+        self.company.save()
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK
+        )
+
+    def test_unknown_ids_still_404(self):
+        self.assertEqual(
+            self.client.get(f"/jobs/{uuid.uuid4()}/").status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(self.client.get("/jobs/not-a-uuid/").status_code, status.HTTP_404_NOT_FOUND)
+
+
+class JobFacetsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        search.get_backend().rebuild()
+        company = create_company(create_employer())
+        for job_role, category, job_type, experience in [
+            ("Security Engineer", "security", "full time", 0),
+            ("Security Analyst", "security", "full time", 3),
+            ("Security Architect", "security", "contract", 12),
+            ("Software Developer", "development", "full time", 4),
+            ("Designer", None, "internship", 1),
+        ]:
+            create_job(
+                company,
+                job_role=job_role,
+                job_type=job_type,
+                category=category,
+                experience=experience,
+            )
+        self.client = APIClient()
+
+    def test_results_and_facets_of_the_filtered_jobs(self):
+        # the search index catch up of companies and jobs, the count,
+        # the page and one per facet
+        with self.assertNumQueries(7):
+            response = self.client.get("/jobs/facets/?search=security&limit=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        facets = response.data["facets"]
+        self.assertEqual(facets["category"], [{"value": "security", "count": 3}])
+        self.assertEqual(
+            facets["job_type"],
+            [{"value": "full time", "count": 2}, {"value": "contract", "count": 1}],
+        )
+        self.assertEqual(
+            facets["experience"],
+            [
+                {"value": "0-1", "count": 1},
+                {"value": "2-4", "count": 1},
+                {"value": "5-9", "count": 0},
+                {"value": "10+", "count": 1},
+            ],
+        )
+
+    def test_filters_and_cache(self):
+        url = "/jobs/facets/?job_type=full time,internship&view=summary"
+        response = self.client.get(url)
+        self.assertEqual(response.data["count"], 4)
+        self.assertNotIn("description", response.data["results"][0])
+        self.assertEqual(
+            response.data["facets"]["category"],
+            [
+                {"value": "security", "count": 2},
+                {"value": None, "count": 1},
+                {"value": "development", "count": 1},
+            ],
+        )
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+
+class InvertedIndexTestCase(TestCase):
+    def setUp(self):
+        self.index = InvertedIndex({"title": 3.0, "body": 1.0})
+        self.index.add(1, {"title": "Security Engineer", "body": "python and networking"})
+        self.index.add(2, {"title": "Python Developer", "body": "django, security reviews"})
+        self.index.add(3, {"title": "Designer", "body": "figma"})
+
+    def keys(self, query):
+        return [key for key, _ in self.index.search(query)]
+
+    def test_ranking_and_matching(self):
+        # a match in the title outranks one in the body
+        self.assertEqual(self.keys("python"), [2, 1])
+        self.assertEqual(self.keys("security"), [1, 2])
+        # every token has to match
+        self.assertEqual(self.keys("python django"), [2])
+        self.assertEqual(self.keys("python figma"), [])
+        # prefixes of indexed words match too
+        self.assertEqual(self.keys("secur"), [1, 2])
+        self.assertEqual(self.keys("the"), [])
+
+    def test_updates_and_compaction(self):
+        self.index.add(2, {"title": "Designer", "body": "sketch"})
+        self.assertEqual(self.keys("python"), [1])
+        self.assertCountEqual(self.keys("designer"), [2, 3])
+
+        self.index.remove(3)
+        self.index.compact()
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.keys("designer"), [2])
+        self.assertNotIn("figma", self.index.postings)
+
+    def test_fuzzy_matches_only_count_in_the_fuzzy_fields(self):
+        index = InvertedIndex({"title": 3.0, "body": 1.0}, fuzzy_fields=("title",))
+        index.add(1, {"title": "Kubernetes Engineer", "body": "terraform"})
+        index.add(2, {"title": "Designer", "body": "kubernetes dashboards"})
+        self.assertEqual([key for key, _ in index.search("kubernetis", fuzzy=True)], [1])
+        # exact matches still count in every field
+        self.assertCountEqual([key for key, _ in index.search("kubernetes")], [1, 2])
+
+
+class JobSearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        search.get_backend().rebuild()
+        self.company = create_company(create_employer())
+        self.engineer = self.create_job("Security Engineer", "python, burp suite")
+        self.developer = self.create_job("Python Developer", "django, aws")
+        self.analyst = self.create_job("SOC Analyst", "siem, incident response")
+        self.client = APIClient()
+
+    def create_job(self, job_role, skills_required):
+        return create_job(self.company, job_role=job_role, skills_required=skills_required)
+
+    def search(self, query):
+        response = self.client.get(f"/jobs/?search={query}")
+        return [job["job_role"] for job in response.data["results"]]
+
+    def test_results_are_ranked_and_cover_the_description(self):
+        self.assertEqual(self.search("python"), ["Python Developer", "Security Engineer"])
+        self.assertEqual(self.search("incident"), ["SOC Analyst"])
+        self.assertEqual(self.search("python burp"), ["Security Engineer"])
+        self.assertEqual(
+            [
+                job["job_role"]
+                for job in self.client.get("/jobs/?search=python&ordering=created_at").data[
+                    "results"
+                ]
+            ],
+            ["Security Engineer", "Python Developer"],
+        )
+
+    def test_cap_keeps_matches_passing_the_other_filters(self):
+        best, second = self.search("python")
+        Job.objects.filter(job_role=second).update(
+            job_type="internship", updated_at=timezone.now()
+        )
+
+        with self.settings(JOBS_SEARCH_MAX_RESULTS=1):
+            response = self.client.get("/jobs/?search=python&job_type=internship")
+            self.assertEqual(response.data["count"], 1)
+            self.assertEqual(response.data["results"][0]["job_role"], second)
+            # capped to the best match without filters
+            self.assertEqual(self.search("python"), [best])
+
+    def test_pages_are_read_in_relevance_order_without_sorting_in_sql(self):
+        ranked = self.search("python")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/jobs/?search=python&limit=1&offset=1")
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([job["job_role"] for job in response.data["results"]], ranked[1:])
+        self.assertFalse(any("CASE" in query["sql"] for query in queries.captured_queries))
+
+    def test_searches_keep_relevance_order_with_cursor_pagination(self):
+        ranked = self.search("python")
+        response = self.client.get("/jobs/?search=python&pagination=cursor")
+        self.assertEqual([job["job_role"] for job in response.data["results"]], ranked)
+
+    def test_index_follows_saves_updates_and_deletes(self):
+        self.search("python")
+
+        self.analyst.skills_required = "python, splunk"
+        self.analyst.save()
+        self.assertIn("SOC Analyst", self.search("splunk"))
+
+        # changed without save(), e.g. from another worker
+        Job.objects.filter(pk=self.developer.pk).update(
+            job_role="Go Developer", skills_required="go", updated_at=timezone.now()
+        )
+        self.assertCountEqual(self.search("python"), ["Security Engineer", "SOC Analyst"])
+        self.assertEqual(self.search("go"), ["Go Developer"])
+
+        self.engineer.delete()
+        self.assertEqual(self.search("burp"), [])
+
+    def test_fuzzy_search_matches_misspelled_words(self):
+        self.create_job("Penetration Tester", "pentesting, web applications")
+
+        self.assertEqual(self.search("pentseting"), [])
+        self.assertEqual(self.search("pentseting&search_mode=fuzzy"), ["Penetration Tester"])
+        self.assertEqual(self.search("devloper&search_mode=fuzzy"), ["Python Developer"])
+        # exact matches rank before similar words
+        self.assertEqual(self.search("security&search_mode=fuzzy")[0], "Security Engineer")
+
+        # jobs are indexed again with the new name of their company
+        self.company.name = "Cyberdyne Systems"
+        self.company.save()
+        self.assertEqual(len(self.search("cyberdyne")), 4)
+        self.assertEqual(len(self.search("cyberdine&search_mode=fuzzy")), 4)
+
+
+class TrigramIndexTestCase(TestCase):
+    def test_similar_words(self):
+        index = TrigramIndex()
+        for word in ("pentesting", "penetration", "developer", "development", "testing"):
+            index.add(word)
+
+        self.assertEqual([word for word, _ in index.similar("pentseting")], ["pentesting"])
+        self.assertEqual(index.similar("developer")[0], ("developer", 1.0))
+        self.assertEqual(index.similar("xyz"), [])
+
+        index.remove("pentesting")
+        self.assertEqual(index.similar("pentseting"), [])
+
+
+class PrefixIndexTestCase(TestCase):
+    def test_suggestions_are_weighted_and_match_any_word(self):
+        index = PrefixIndex()
+        index.add("job_role", "Malware Analyst", 2)
+        index.add("job_role", "SOC Analyst", 5)
+        index.add("location", "Amsterdam", 3)
+        index.add("company", "Analytica", 3)
+
+        self.assertEqual(
+            index.suggest("ana"),
+            [
+                ("job_role", "SOC Analyst", 5),
+                ("company", "Analytica", 3),
+                ("job_role", "Malware Analyst", 2),
+            ],
+        )
+        self.assertEqual(index.suggest("  SOC  an", limit=1), [("job_role", "SOC Analyst", 5)])
+        self.assertEqual(index.suggest("am"), [("location", "Amsterdam", 3)])
+
+        index.add("job_role", "SOC Analyst", -5)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.suggest("soc"), [])
+
+
+class JobAutocompleteTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        search.get_backend().rebuild()
+        self.company = create_company(create_employer(), name="Secure Corp")
+        self.engineer = self.create_job("Security Engineer", "Remote")
+        self.create_job("Security Engineer", "Pune")
+        self.create_job("Software Developer", "Seattle")
+        self.client = APIClient()
+
+    def create_job(self, job_role, location, is_active=True):
+        return create_job(self.company, job_role=job_role, location=location, is_active=is_active)
+
+    def suggest(self, query):
+        response = self.client.get(f"/jobs/autocomplete/?q={query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            (suggestion["kind"], suggestion["text"], suggestion["count"])
+            for suggestion in response.data["suggestions"]
+        ]
+
+    def test_suggestions_are_weighted_by_posting_count(self):
+        self.assertEqual(
+            self.suggest("se"),
+            [
+                ("company", "Secure Corp", 3),
+                ("job_role", "Security Engineer", 2),
+                ("location", "Seattle", 1),
+            ],
+        )
+        self.assertEqual(self.suggest("eng"), [("job_role", "Security Engineer", 2)])
+        self.assertEqual(
+            self.client.get("/jobs/autocomplete/?q=se&limit=0").status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_suggestions_follow_job_and_company_changes(self):
+        self.suggest("se")
+
+        with self.assertNumQueries(0):
+            self.suggest("se")
+
+        self.engineer.job_role = "Penetration Tester"
+        self.engineer.save()
+        self.company.name = "Pentest Labs"
+        self.company.save()
+        self.assertEqual(
+            self.suggest("pe"),
+            [
+                ("company", "Pentest Labs", 3),
+                ("job_role", "Penetration Tester", 1),
+            ],
+        )
+
+        # soft deleted without save(), e.g. from another worker
+        Job.objects.filter(location="Seattle").update(
+            is_deleted=True, updated_at=timezone.now()
+        )
+        self.assertEqual(self.suggest("se"), [("job_role", "Security Engineer", 1)])
+
+    def test_inactive_jobs_are_not_counted(self):
+        self.create_job("Security Analyst", "Seoul", is_active=False)
+        self.assertEqual(
+            self.suggest("se"),
+            [
+                ("company", "Secure Corp", 3),
+                ("job_role", "Security Engineer", 2),
+                ("location", "Seattle", 1),
+            ],
+        )
+
+        # expired without save(), e.g. by the expire_jobs command
+        Job.objects.filter(location="Pune").update(is_active=False, updated_at=timezone.now())
+        self.assertEqual(self.suggest("security"), [("job_role", "Security Engineer", 1)])
+        self.assertEqual(self.suggest("secure"), [("company", "Secure Corp", 2)])
+
+
+class SkillMatrixTestCase(TestCase):
+    def test_rarer_shared_skills_score_higher(self):
+        matrix = SkillMatrix()
+        matrix.add("web", ["python", "django"], 2)
+        matrix.add("security", ["python", "burp suite"], 2)
+        matrix.add("cloud", ["aws", "kubernetes"], 2)
+
+        ranked = matrix.score({"python": 1.0, "burp suite": 1.0}, 3)
+        self.assertEqual([key for key, _ in ranked], ["security", "web"])
+        self.assertAlmostEqual(ranked[0][1], 1.0 - 0.3 * 0.02, places=6)
+        self.assertEqual(matrix.score({"go": 1.0}, 3), [])
+
+    def test_experience_fit_and_updates(self):
+        matrix = SkillMatrix()
+        matrix.add("junior", ["python"], 1)
+        matrix.add("senior", ["python"], 10)
+        self.assertEqual([key for key, _ in matrix.score({"python": 1.0}, 2)], ["junior", "senior"])
+        self.assertEqual(
+            [key for key, _ in matrix.score({"python": 1.0}, 10, limit=1)], ["senior"]
+        )
+
+        matrix.add("junior", ["go"], 1)
+        matrix.remove("senior")
+        matrix.compact()
+        self.assertEqual(matrix.score({"python": 1.0}, 2), [])
+        self.assertEqual([key for key, _ in matrix.score({"go": 1.0}, 2)], ["junior"])
+
+
+class JobRecommendationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        recommendations.get_recommender().rebuild()
+        self.employer = create_employer()
+        self.company = create_company(self.employer)
+        self.pentester = self.create_job("Penetration Tester", "Burp Suite, Nmap, Python", 3)
+        self.developer = self.create_job("Python Developer", "python, django", 2)
+        self.architect = self.create_job("Security Architect", "nmap, threat modeling", 12)
+        self.create_job("Designer", "figma", 0)
+        self.create_job("Closed Pentest", "burp suite, nmap", 3, is_active=False)
+
+        self.seeker = User.objects.create_user(
+            email="seeker@testing.com", name="Seeker", user_type="Job Seeker"
+        )
+        self.profile = UserProfile.objects.create(
+            user=self.seeker,
+            experience="4",
+            professional_skills=[
+                {"skill_name": "burp suite", "total_yoe": 3, "last_used": timezone.now().year},
+                {"skill_name": "Nmap", "total_yoe": 4, "last_used": timezone.now().year},
+                {"skill_name": "python", "total_yoe": 1, "last_used": 2010},
+            ],
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def create_job(self, job_role, skills_required, experience, is_active=True):
+        return create_job(
+            self.company,
+            job_role=job_role,
+            skills_required=skills_required,
+            experience=experience,
+            is_active=is_active,
+        )
+
+    def recommended(self):
+        response = self.client.get("/jobs/recommended/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job["job_role"] for job in response.data["results"]]
+
+    def test_active_jobs_are_ranked_by_skills_and_experience(self):
+        self.assertEqual(
+            self.recommended(), ["Penetration Tester", "Security Architect", "Python Developer"]
+        )
+
+        self.client.force_authenticate(self.employer)
+        self.assertEqual(
+            self.client.get("/jobs/recommended/").status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    def test_recommendations_follow_job_changes(self):
+        self.recommended()
+
+        self.developer.skills_required = "burp suite, nmap, python"
+        self.developer.experience = 4
+        self.developer.save()
+        self.assertEqual(self.recommended()[:2], ["Python Developer", "Penetration Tester"])
+
+        # closed without save(), e.g. from another worker
+        Job.objects.filter(pk=self.pentester.pk).update(
+            is_active=False, updated_at=timezone.now()
+        )
+        self.assertNotIn("Penetration Tester", self.recommended())
+
+        self.architect.delete()
+        self.assertEqual(self.recommended(), ["Python Developer"])
+
+    def test_profile_without_skills(self):
+        UserProfile.objects.filter(pk=self.profile.pk).update(professional_skills=[])
+        self.assertEqual(self.recommended(), [])
+
+
+class MinHashTestCase(TestCase):
+    def test_similar_texts_share_buckets(self):
+        text = "Security Engineer python burp suite nmap threat modeling incident response"
+        same = minhash.signature(text)
+        close = minhash.signature(text + " kubernetes")
+        far = minhash.signature("Product Designer figma sketch user research prototyping")
+
+        self.assertEqual(minhash.similarity(same, minhash.signature(text)), 1.0)
+        self.assertGreater(minhash.similarity(same, close), 0.6)
+        self.assertLess(minhash.similarity(same, far), 0.2)
+        self.assertTrue(set(minhash.buckets(same)) & set(minhash.buckets(close)))
+        self.assertFalse(set(minhash.buckets(same)) & set(minhash.buckets(far)))
+        self.assertIsNone(minhash.signature("the and of"))
+
+    def test_loosely_related_texts_rarely_share_buckets(self):
+        # pairs of postings sharing 4 of their 20 words, a Jaccard similarity ~0.06
+        shared = 0
+        for pair in range(100):
+            common = [f"skill{pair}x{word}" for word in range(4)]
+            left = minhash.signature(" ".join(common + [f"left{pair}x{word}" for word in range(16)]))
+            right = minhash.signature(" ".join(common + [f"right{pair}x{word}" for word in range(16)]))
+            shared += bool(set(minhash.buckets(left)) & set(minhash.buckets(right)))
+        self.assertLessEqual(shared, 2)
+
+        # signatures computed with another number of permutations never match
+        self.assertEqual(minhash.similarity(left, left[: minhash.PERMUTATIONS // 2]), 0.0)
+
+
+class SimilarJobsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = create_company(create_employer())
+        about = "Protect our cloud platform, run penetration tests and triage incidents."
+        self.job = self.create_job("Security Engineer", "python, burp suite, nmap", about)
+        self.close = self.create_job("Security Engineer", "python, burp suite, nmap, aws", about)
+        self.related = self.create_job("Security Analyst", "nmap, splunk", about)
+        self.create_job("Product Designer", "figma, sketch", "Design delightful products.")
+        self.closed = self.create_job(
+            "Security Engineer", "python, burp suite, nmap", about, is_active=False
+        )
+        self.client = APIClient()
+
+    def create_job(self, job_role, skills_required, about, is_active=True):
+        return create_job(
+            self.company,
+            job_role=job_role,
+            skills_required=skills_required,
+            about=about,
+            is_active=is_active,
+        )
+
+    def similar(self, job):
+        response = self.client.get(f"/jobs/{job.job_id}/similar/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result["job_id"] for result in response.data["results"]]
+
+    def test_similar_active_jobs_most_similar_first(self):
+        self.assertEqual(
+            self.similar(self.job), [str(self.close.job_id), str(self.related.job_id)]
+        )
+        self.assertEqual(
+            self.client.get(f"/jobs/{uuid.uuid4()}/similar/").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_signatures_follow_saves_and_are_backfilled(self):
+        self.close.job_role = "Product Designer"
+        self.close.skills_required = "figma, sketch"
+        self.close.about = "Design delightful products."
+        self.close.save()
+        self.assertEqual(self.similar(self.job), [str(self.related.job_id)])
+
+        # saving without changing the text keeps the signature
+        with CaptureQueriesContext(connection) as queries:
+            self.job.vacancy_position = 2
+            self.job.save()
+        self.assertFalse(
+            [query for query in queries.captured_queries if "tbl_job_signature" in query["sql"]]
+        )
+
+        JobSignature.objects.all().delete()
+        self.assertEqual(self.similar(self.job), [])
+
+        out = StringIO()
+        call_command("build_job_signatures", stdout=out)
+        self.assertIn("Done, 5 jobs signed", out.getvalue())
+        self.assertEqual(self.similar(self.job), [str(self.related.job_id)])
+
+
+class SimHashTestCase(TestCase):
+    def test_near_duplicates_share_a_band(self):
+        text = JobRepostTestCase.ABOUT
+        same = simhash.fingerprint(text)
+        close = simhash.fingerprint(text.replace("weekly", "monthly"))
+        far = simhash.fingerprint("Design delightful products with figma and user research.")
+
+        self.assertEqual(simhash.fingerprint(text), same)
+        self.assertLessEqual(simhash.distance(same, close), simhash.MAX_DISTANCE)
+        self.assertGreater(simhash.distance(same, far), simhash.MAX_DISTANCE)
+        self.assertTrue(set(simhash.bands(same)) & set(simhash.bands(close)))
+        self.assertEqual(simhash.distance(-1, 0), 64)
+        self.assertIsNone(simhash.fingerprint("the and of"))
+
+
+class JobRepostTestCase(TestCase):
+    ABOUT = (
+        "Protect our cloud platform and the data of our customers. You will run "
+        "penetration tests against new services, review the design of features "
+        "with product teams, triage the alerts raised by our detection pipeline, "
+        "lead the response to security incidents, write weekly reports for the "
+        "leadership team and mentor junior analysts in threat modeling."
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.employer = self.create_employer("employer@testing.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    @staticmethod
+    def create_employer(email):
+        employer = create_employer(email, is_profile_completed=True)
+        create_company(employer)
+        return employer
+
+    def post(self, query="", **overrides):
+        return self.client.post(
+            f"/jobs/{query}",
+            {
+                "job_role": "Security Engineer",
+                "location": "Remote",
+                "job_type": "full time",
+                "vacancy_position": 1,
+                "industry": "Security",
+                "about": self.ABOUT,
+                "is_active": True,
+                **overrides,
+            },
+            format="json",
+        )
+
+    def test_reposts_are_rejected_unless_allowed(self):
+        first = self.post()
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("duplicate_of", first.data)
+
+        repost = self.post(about=self.ABOUT.replace("weekly", "monthly"))
+        self.assertEqual(repost.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(repost.data["duplicate_of"], first.data["job_id"])
+        self.assertEqual(Job.objects.count(), 1)
+
+        allowed = self.post("?allow_duplicate=true")
+        self.assertEqual(allowed.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(allowed.data["duplicate_of"], first.data["job_id"])
+
+        other = self.post(job_role="Product Designer", about="Design delightful products.")
+        self.assertEqual(other.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("duplicate_of", other.data)
+
+        # another company posting the same job is not a repost
+        self.client.force_authenticate(self.create_employer("other@testing.com"))
+        self.assertEqual(self.post().status_code, status.HTTP_201_CREATED)
+
+    def test_deleted_jobs_and_backfilled_fingerprints(self):
+        job_id = self.post().data["job_id"]
+        JobFingerprint.objects.all().delete()
+        self.assertNotIn("duplicate_of", self.post(job_role="Security Lead").data)
+
+        out = StringIO()
+        call_command("build_job_fingerprints", stdout=out)
+        self.assertIn("Done, 1 jobs fingerprinted", out.getvalue())
+        self.assertEqual(self.post().data["duplicate_of"], job_id)
+
+        Job.objects.update(is_deleted=True, updated_at=timezone.now())
+        self.assertEqual(self.post().status_code, status.HTTP_201_CREATED)
+
+    def test_expired_jobs_can_be_posted_again(self):
+        job_id = self.post().data["job_id"]
+        Job.objects.filter(pk=job_id).update(
+            created_at=timezone.now() - timedelta(days=60), updated_at=timezone.now()
+        )
+        call_command("expire_jobs", "--days", "30", stdout=StringIO())
+        self.assertFalse(Job.objects.get(pk=job_id).is_active)
+
+        repost = self.post()
+        self.assertEqual(repost.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("duplicate_of", repost.data)
+
+
+class JobExportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = create_company(create_employer())
+        self.create_jobs(3)
+        self.create_jobs(1, is_active=False)
+        self.client = APIClient()
+
+    def create_jobs(self, count, is_active=True):
+        Job.objects.bulk_create(
+            build_job(
+                self.company,
+                job_role=f"Security Engineer {number}",
+                about="Protect our cloud platform, run penetration tests.",
+                is_active=is_active,
+            )
+            for number in range(count)
+        )
+
+    def export(self, query=""):
+        response = self.client.get(f"/jobs/export/{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_active_jobs_stream_as_ndjson(self):
+        response, content = self.export()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="jobs.ndjson"', response["Content-Disposition"])
+
+        jobs = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual({job["company_name"] for job in jobs}, {"Testing name"})
+        self.assertEqual(
+            jobs[0]["description"]["about"], "Protect our cloud platform, run penetration tests."
+        )
+        first = Job.objects.filter(is_active=True).order_by("job_id").first()
+        self.assertEqual(
+            {key: jobs[0][key] for key in ("job_id", "job_role", "created_at")},
+            {key: JobSerializer(first).data[key] for key in ("job_id", "job_role", "created_at")},
+        )
+
+    def test_csv_columns_follow_the_selected_fields(self):
+        response, content = self.export("?export_format=csv&fields=job_role,vacancy_position")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        header, *rows = content.splitlines()
+        self.assertEqual(header, "job_role,vacancy_position,company_name")
+        self.assertEqual(
+            sorted(rows), [f"Security Engineer {number},1,Testing name" for number in range(3)]
+        )
+
+        response = self.client.get("/jobs/export/?export_format=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch.object(values, "JOBS_EXPORT_CHUNK_SIZE", 2)
+    def test_searches_export_every_match(self):
+        with self.settings(JOBS_SEARCH_MAX_RESULTS=1):
+            _, content = self.export("?search=security&export_format=csv&fields=job_role")
+        header, *rows = content.splitlines()
+        self.assertEqual(
+            sorted(rows), [f"Security Engineer {number},Testing name" for number in range(3)]
+        )
+
+    @patch.object(values, "JOBS_EXPORT_CHUNK_SIZE", 50)
+    def test_peak_memory_does_not_grow_with_the_number_of_jobs(self):
+        def peak_memory():
+            response = self.client.get("/jobs/export/?export_format=csv")
+            tracemalloc.start()
+            lines = sum(chunk.count(b"\n") for chunk in response.streaming_content)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return lines, peak
+
+        self.create_jobs(97)
+        lines, small = peak_memory()
+        self.assertEqual(lines, 101)
+
+        self.create_jobs(1900)
+        lines, large = peak_memory()
+        self.assertEqual(lines, 2001)
+        self.assertLess(large, small * 1.5)
+
+
+class CompanyDirectoryTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.busy = self.create_company("Busy", active_jobs=3, closed_jobs=1)
+        self.quiet = self.create_company("Quiet", active_jobs=1, closed_jobs=2)
+        self.empty = self.create_company("Empty")
+
+    @staticmethod
+    def create_company(name, active_jobs=0, closed_jobs=0):
+        employer = create_employer(f"{name.lower()}@testing.com", name=name)
+        company = create_company(employer, name=name)
+        Job.objects.bulk_create(
+            build_job(company, is_active=number < active_jobs)
+            for number in range(active_jobs + closed_jobs)
+        )
+        return company
+
+    def directory(self, query=""):
+        response = self.client.get(f"/company/{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_companies_come_with_their_active_jobs_count(self):
+        Job.objects.filter(company=self.busy).update(
+            is_deleted=True, is_active=True, updated_at=timezone.now()
+        )
+        Company.objects.filter(pk=self.empty.pk).update(is_deleted=True)
+
+        data = self.directory()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(
+            [(company["name"], company["active_jobs_count"]) for company in data["results"]],
+            [("Busy", 0), ("Quiet", 1)],
+        )
+
+    def test_sorted_by_active_jobs_count(self):
+        data = self.directory("?ordering=-active_jobs_count")
+        self.assertEqual(
+            [(company["name"], company["active_jobs_count"]) for company in data["results"]],
+            [("Busy", 3), ("Quiet", 1), ("Empty", 0)],
+        )
+
+        data = self.directory("?ordering=active_jobs_count&limit=1&offset=1")
+        self.assertEqual(data["count"], 3)
+        self.assertEqual([company["name"] for company in data["results"]], ["Quiet"])
+
+    def test_query_count_does_not_depend_on_the_number_of_companies(self):
+        # the page and the total count
+        with self.assertNumQueries(2):
+            self.directory("?ordering=-active_jobs_count")
+
+        for number in range(20):
+            self.create_company(f"Company {number}", active_jobs=2, closed_jobs=1)
+        with self.assertNumQueries(2):
+            data = self.directory("?ordering=-active_jobs_count&limit=100")
+        self.assertEqual(len(data["results"]), 23)
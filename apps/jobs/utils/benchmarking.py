@@ -0,0 +1,184 @@
+"""
+Helpers shared by the benchmark and query plan management commands.
+
+The commands seed synthetic data inside a transaction that is rolled back
+once they are done, so they can be pointed at a development database
+without leaving anything behind.
+"""
+
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.applicants.models import Applicants
+from apps.jobs.constants.values import EMPLOYER, JOB_SEEKER, JOB_TYPE
+from apps.jobs.models import Company, Job
+from apps.userprofile.models import UserProfile
+
+CATEGORIES = ["security", "development", "analytics", "management", "design"]
+ROLES = [
+    "Security Engineer",
+    "Software Developer",
+    "Malware Analyst",
+    "SOC Analyst",
+    "Penetration Tester",
+    "Data Scientist",
+    "Product Manager",
+]
+LOCATIONS = ["Remote", "Bangalore", "Pune", "Mumbai", "Amsterdam", "New York"]
+SKILLS = [
+    "python",
+    "django",
+    "burp suite",
+    "nmap",
+    "reverse engineering",
+    "siem",
+    "aws",
+    "kubernetes",
+    "threat modeling",
+    "incident response",
+]
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back"""
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+@contextmanager
+def timer():
+    """Yield a dict whose `seconds` key is filled once the block exits"""
+
+    elapsed = {}
+    started = time.perf_counter()
+    yield elapsed
+    elapsed["seconds"] = time.perf_counter() - started
+
+
+def build_job(company, employer, rng, **overrides):
+    """Return an unsaved Job with randomized, realistic looking fields"""
+
+    fields = {
+        "company": company,
+        "employer": employer,
+        "job_role": rng.choice(ROLES),
+        "location": rng.choice(LOCATIONS),
+        "experience": rng.randint(0, 12),
+        "job_type": rng.choice(JOB_TYPE)[0],
+        "vacancy_position": rng.randint(1, 5),
+        "industry": "Security",
+        "category": rng.choice(CATEGORIES),
+        "is_active": rng.random() < 0.8,
+        "is_featured": rng.random() < 0.1,
+        "skills_required": ", ".join(rng.sample(SKILLS, 4)),
+        "about": "Synthetic job posting generated for benchmarking.",
+    }
+    fields.update(overrides)
+    return Job(**fields)
+
+
+def seed(jobs=1000, applications=0, companies=20, job_seekers=100, seed_value=0):
+    """
+    Bulk insert employers, companies, jobs, job seekers and applications.
+
+    Returns a dict with the created employers, companies and job seeker
+    users so callers can authenticate as one of them.
+    """
+
+    rng = random.Random(seed_value)
+    run = uuid.uuid4().hex[:8]
+
+    employers = User.objects.bulk_create(
+        User(email=f"employer-{run}-{i}@bench.local", name=f"Employer {i}", user_type=EMPLOYER)
+        for i in range(companies)
+    )
+    company_objects = Company.objects.bulk_create(
+        Company(
+            creator=employer,
+            name=f"Company {i}",
+            location=rng.choice(LOCATIONS),
+            about="Synthetic company",
+            founded_year=2000 + i % 20,
+        )
+        for i, employer in enumerate(employers)
+    )
+
+    job_objects = Job.objects.bulk_create(
+        (
+            build_job(company_objects[i % companies], employers[i % companies], rng)
+            for i in range(jobs)
+        ),
+        batch_size=1000,
+    )
+
+    # auto_now_add overrides created_at on insert, so spread the postings
+    # over the last year afterwards to get a realistic ordering
+    now = timezone.now()
+    for job in job_objects:
+        job.created_at = now - timedelta(minutes=rng.randint(0, 525600))
+    Job.objects.bulk_update(job_objects, ["created_at"], batch_size=1000)
+
+    seekers = User.objects.bulk_create(
+        User(email=f"seeker-{run}-{i}@bench.local", name=f"Seeker {i}", user_type=JOB_SEEKER)
+        for i in range(job_seekers)
+    )
+    profiles = UserProfile.objects.bulk_create(
+        UserProfile(
+            user=seeker,
+            experience=str(rng.randint(0, 12)),
+            professional_skills=[
+                {"skill_name": skill, "total_yoe": rng.randint(1, 6), "last_used": 2024}
+                for skill in rng.sample(SKILLS, 3)
+            ],
+        )
+        for seeker in seekers
+    )
+
+    pairs = set()
+    while len(pairs) < min(applications, jobs * job_seekers):
+        pairs.add((rng.randrange(jobs), rng.randrange(job_seekers)))
+
+    Applicants.objects.bulk_create(
+        (
+            Applicants(
+                job=job_objects[job_index],
+                user=profiles[profile_index],
+                status=rng.choice(["applied", "applied", "shortlisted", "rejected"]),
+            )
+            for job_index, profile_index in pairs
+        ),
+        batch_size=1000,
+    )
+
+    # bulk_create skips the receivers maintaining applicants_count
+    counts = {}
+    for job_index, _ in pairs:
+        counts[job_index] = counts.get(job_index, 0) + 1
+    for job_index, count in counts.items():
+        job_objects[job_index].applicants_count = count
+    Job.objects.bulk_update(job_objects, ["applicants_count"], batch_size=1000)
+
+    return {
+        "employers": employers,
+        "companies": company_objects,
+        "jobs": job_objects,
+        "job_seekers": seekers,
+    }
+
+
+def explain(sql):
+    """Return the database's plan for an already interpolated query"""
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+        return [" | ".join(str(column) for column in row) for row in cursor.fetchall()]
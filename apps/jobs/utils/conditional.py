@@ -0,0 +1,53 @@
+"""
+Conditional GET helpers for detail endpoints.
+
+Views read the few columns a representation's version depends on with a
+cheap primary key lookup, build validators from them and answer
+If-None-Match / If-Modified-Since with a 304 before running the full
+query and serializer.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+
+from apps.jobs.cache import normalize_query
+
+
+class Validators:
+    """ETag and Last-Modified of one representation of a resource"""
+
+    def __init__(self, request, last_modified, *version):
+        # the representation also depends on the query string (sparse
+        # fieldsets), the media type and, for has_applied, the user
+        user = request.user.pk if request.user.is_authenticated else ""
+        digest = hashlib.sha1(
+            "|".join(
+                [
+                    *(str(part) for part in version),
+                    last_modified.isoformat(),
+                    normalize_query(request.query_params),
+                    str(request.accepted_media_type),
+                    str(user),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+
+        # weak, the same data can be sent compressed or not
+        self.etag = f"W/{quote_etag(digest)}"
+        self.last_modified = int(last_modified.timestamp())
+
+    def not_modified(self, request):
+        """Return the 304 (or 412) response the request's conditions call for, or None"""
+
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+
+    def apply(self, response):
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response["ETag"] = self.etag
+            response["Last-Modified"] = http_date(self.last_modified)
+            patch_vary_headers(response, ["Authorization"])
+        return response
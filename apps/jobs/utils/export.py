@@ -0,0 +1,64 @@
+"""
+Streamed job exports. Rows are read a batch at a time and every line
+function turns an iterable of rows into an iterable of encoded lines, to
+be handed to a StreamingHttpResponse, so nothing but the current batch is
+held in memory.
+"""
+
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class Echo:
+    """File-like object handing back what csv.writer writes to it"""
+
+    def write(self, value):
+        return value
+
+
+def keyset_batches(queryset, key, batch_size):
+    """
+    The rows of a values() queryset ordered by key, read batch_size at a
+    time with key > the last key read. Unlike QuerySet.iterator(), which
+    the MySQL client library fetches whole, every batch is its own query.
+    """
+
+    queryset = queryset.order_by(key)
+    batch = list(queryset[:batch_size])
+    while batch:
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        batch = list(queryset.filter(**{f"{key}__gt": batch[-1][key]})[:batch_size])
+
+
+def ranked_batches(queryset, key, ranking, batch_size):
+    """
+    The rows of a values() queryset whose key is in ranking, in the
+    order of ranking, read batch_size keys at a time
+    """
+
+    for start in range(0, len(ranking), batch_size):
+        batch = ranking[start : start + batch_size]
+        position = {value: rank for rank, value in enumerate(batch)}
+        yield from sorted(
+            queryset.filter(**{f"{key}__in": batch}), key=lambda row: position[row[key]]
+        )
+
+
+def ndjson_lines(records):
+    """One JSON document per line"""
+
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for record in records:
+        yield encoder.encode(record) + "\n"
+
+
+def csv_lines(records, header):
+    """A header line, then one line per record with its header values"""
+
+    writer = csv.DictWriter(Echo(), fieldnames=header, extrasaction="ignore")
+    yield writer.writeheader()
+    for record in records:
+        yield writer.writerow(record)
@@ -0,0 +1,232 @@
+"""
+Trending keywords computed from the `search` parameter of /jobs/ requests.
+
+Every worker counts searches in a bounded Space-Saving sketch with forward
+exponential decay, and periodically merges what it counted into the
+TrendingKeyword table, which is what makes the counts survive restarts and
+shared across workers. The endpoint reads the top keywords from the cache,
+falling back to the static values.trending_keywords list while there is
+not enough traffic yet.
+"""
+
+import logging
+import math
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, transaction
+
+from apps.jobs.constants import values
+from apps.jobs.models import TrendingKeyword
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "jobs:trending-keywords"
+MAX_KEYWORD_LENGTH = 50
+MIN_KEYWORD_LENGTH = 2
+
+# keywords whose decayed count fell under 2 ** -PRUNE_BELOW are dropped
+PRUNE_BELOW = 10
+# forward decay weights are rescaled before they can overflow
+MAX_WEIGHT = 2.0**40
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters over exponentially decayed counts.
+
+    At most `capacity` keywords are tracked. A new keyword arriving when
+    the sketch is full replaces the smallest counter and inherits its
+    count, which bounds the overestimate of any keyword by that minimum.
+    Decay uses forward decay: an event at time t weighs
+    2 ** ((t - landmark) / half_life), so counters never need to be
+    touched as time passes.
+    """
+
+    def __init__(self, capacity, half_life, now=None):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.landmark = time.time() if now is None else now
+        self.counts = {}
+
+    def weight(self, now):
+        return 2.0 ** ((now - self.landmark) / self.half_life)
+
+    def offer(self, keyword, now, count=1.0):
+        """Count keyword count times, a decayed count as of now"""
+
+        if not self.counts:
+            self.landmark = now
+
+        weight = self.weight(now)
+        if weight > MAX_WEIGHT:
+            self.rescale(now)
+            weight = 1.0
+        weight *= count
+
+        if keyword in self.counts:
+            self.counts[keyword] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[keyword] = weight
+        else:
+            victim = min(self.counts, key=self.counts.get)
+            self.counts[keyword] = self.counts.pop(victim) + weight
+
+    def rescale(self, now):
+        scale = self.weight(now)
+        self.counts = {keyword: count / scale for keyword, count in self.counts.items()}
+        self.landmark = now
+
+    def drain(self, now):
+        """Return the decayed count of every keyword as of now and reset"""
+
+        scale = self.weight(now)
+        counts = {keyword: count / scale for keyword, count in self.counts.items()}
+        self.counts = {}
+        self.landmark = now
+        return counts
+
+
+class TrendingKeywords:
+    def __init__(
+        self,
+        capacity=values.TRENDING_KEYWORDS_CAPACITY,
+        half_life=values.TRENDING_KEYWORDS_HALF_LIFE,
+        flush_interval=values.TRENDING_KEYWORDS_FLUSH_INTERVAL,
+    ):
+        self.half_life = half_life
+        self.flush_interval = flush_interval
+        self.sketch = SpaceSaving(capacity, half_life)
+        self.last_flush = time.time()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize(term):
+        keyword = " ".join(str(term).split()).lower()
+        if MIN_KEYWORD_LENGTH <= len(keyword) <= MAX_KEYWORD_LENGTH:
+            return keyword
+        return None
+
+    def record(self, term, now=None):
+        """
+        Count one search for term, flushing to the database when due.
+        A failed flush is logged, never raised, the search it was
+        recorded for is served anyway.
+        """
+
+        keyword = self.normalize(term) if term else None
+        if keyword is None:
+            return
+
+        now = time.time() if now is None else now
+        with self.lock:
+            self.sketch.offer(keyword, now)
+            due = now - self.last_flush >= self.flush_interval
+
+        if due:
+            try:
+                self.flush(now)
+            except DatabaseError:
+                logger.warning("Could not flush the trending keywords", exc_info=True)
+
+    def flush(self, now=None):
+        """
+        Merge the counts gathered by this worker into TrendingKeyword.
+        When the merge fails the counts go back to the sketch, to be
+        merged by the next flush.
+        """
+
+        now = time.time() if now is None else now
+        with self.lock:
+            counts = self.sketch.drain(now)
+            self.last_flush = now
+
+        if not counts:
+            return
+
+        try:
+            self.save(counts, now)
+        except DatabaseError:
+            with self.lock:
+                for keyword, count in counts.items():
+                    self.sketch.offer(keyword, now, count)
+            raise
+
+        cache.delete(CACHE_KEY)
+
+    def save(self, counts, now):
+        """Merge keyword counts, decayed as of now, into their rows"""
+
+        # rank is log2(count at t) + t / half_life, see TrendingKeyword
+        epoch = now / self.half_life
+
+        def merge(row, count):
+            row.rank = math.log2(2.0 ** (row.rank - epoch) + count) + epoch
+            return row
+
+        # rows locked by the flush of another worker fail the merge right
+        # away instead of holding up the request that triggered it
+        with transaction.atomic():
+            existing = {
+                row.keyword: row
+                for row in TrendingKeyword.objects.select_for_update(nowait=True).filter(
+                    keyword__in=counts
+                )
+            }
+
+            updated = [
+                merge(existing[keyword], count)
+                for keyword, count in counts.items()
+                if keyword in existing
+            ]
+            created = [
+                TrendingKeyword(keyword=keyword, rank=math.log2(count) + epoch)
+                for keyword, count in counts.items()
+                if keyword not in existing
+            ]
+
+            try:
+                with transaction.atomic():
+                    TrendingKeyword.objects.bulk_create(created)
+            except IntegrityError:
+                # another worker created some of them since they were read,
+                # its counts are merged with this worker's one row at a time
+                for row in created:
+                    try:
+                        with transaction.atomic():
+                            row.save(force_insert=True)
+                    except IntegrityError:
+                        current = TrendingKeyword.objects.select_for_update(nowait=True).get(
+                            keyword=row.keyword
+                        )
+                        updated.append(merge(current, counts[row.keyword]))
+
+            TrendingKeyword.objects.bulk_update(updated, ["rank"])
+            TrendingKeyword.objects.filter(rank__lt=epoch - PRUNE_BELOW).delete()
+
+    def top(self, limit=values.TRENDING_KEYWORDS_LIMIT):
+        """
+        Return the current top keywords, padded with the static list
+        while there is not enough search traffic
+        """
+
+        keywords = cache.get(CACHE_KEY)
+        if keywords is None:
+            keywords = list(
+                TrendingKeyword.objects.order_by("-rank").values_list("keyword", flat=True)[
+                    :limit
+                ]
+            )
+            cache.set(CACHE_KEY, keywords, values.TRENDING_KEYWORDS_CACHE_TIMEOUT)
+
+        keywords = keywords[:limit]
+        if len(keywords) < limit:
+            seen = set(keywords)
+            keywords = keywords + [
+                keyword for keyword in values.trending_keywords if keyword.lower() not in seen
+            ][: limit - len(keywords)]
+        return keywords
+
+
+trending_keywords = TrendingKeywords()
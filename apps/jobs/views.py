@@ -1,25 +1,36 @@
-from django.db import connection
-from django.db.models import Count
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 import django_filters.rest_framework as df_filters
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import BooleanField, Case, Value, When
-from rest_framework import exceptions, parsers, status, viewsets, filters
+from rest_framework import exceptions, generics, parsers, status, viewsets, filters
 
 
 from apps.accounts.permissions import Moderator
+from apps.jobs import cache, recommendations, search, similarity
 from apps.jobs.constants import response, values
-from apps.userprofile.models import UserProfile
 from apps.applicants.models import Applicants
-from apps.jobs.models import Company, ContactMessage, Job
-from apps.accounts.permissions import IsEmployer, IsJobSeeker
-from apps.jobs.serializers import CompanySerializer, ContactUsSerializer, JobSerializer, JobsCountByCategoriesSerializer, CompanyStatsResponseSerializer
+from apps.jobs.models import Company, ContactMessage, Job, JobCategoryCount
+from apps.userprofile.models import UserProfile
+from apps.accounts.permissions import IsEmployer, IsJobSeeker, IsProfileCompleted
+from apps.jobs.serializers import AutocompleteQuerySerializer, AutocompleteSuggestionSerializer, BulkJobSerializer, BulkJobStatusSerializer, CompanyListSerializer, CompanySerializer, ContactUsSerializer, EmployerJobSerializer, JobSerializer, JobSummarySerializer, JobValuesSerializer, JobsCountByCategoriesSerializer, CompanyStatsResponseSerializer
+from apps.jobs.search.filters import JobSearchFilter
+from apps.jobs.utils import export
+from apps.jobs.utils.conditional import Validators
+from apps.jobs.utils.trending import trending_keywords
 from apps.jobs.utils.validators import validationClass
 from apps.utils.responses import InternalServerError
-from apps.utils.pagination import DefaultPagination
+from apps.utils.pagination import DefaultPagination, JobCursorPagination
+from apps.utils.serializers import ValuesSerializer
 
 from .utils.user_permissions import UserTypeCheck
 
@@ -35,6 +46,23 @@ class JobsFilter(df_filters.FilterSet):
         model = Job
         fields = ["category", "job_type", 'experience', "is_active", "is_featured"]
 
+
+class JobOrderingFilter(filters.OrderingFilter):
+    """
+    ?ordering= that also accepts the public names of denormalized
+    columns, total_applicants sorting on applicants_count
+    """
+
+    aliases = {"total_applicants": "applicants_count"}
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        renamed = []
+        for term in fields:
+            name = term.lstrip("-")
+            renamed.append(term[: len(term) - len(name)] + self.aliases.get(name, name))
+        return super().remove_invalid_fields(queryset, renamed, view, request)
+
+
 class JobViewSets(viewsets.ModelViewSet):
     """
     Job object viewsets
@@ -46,29 +74,381 @@ class JobViewSets(viewsets.ModelViewSet):
         4. create or update job
     """
 
-    queryset = Job.objects.annotate(total_applicants=Count("applicants")).order_by('-created_at')
+    queryset = Job.objects.order_by('-created_at')
     serializer_class = JobSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter, df_filters.DjangoFilterBackend]
-    search_fields = ["job_role", "location"]
+    # the search runs last, its results are capped after the other filters
+    filter_backends = [JobOrderingFilter, df_filters.DjangoFilterBackend, JobSearchFilter]
     filterset_class = JobsFilter
     pagination_class = DefaultPagination
+    cursor_pagination_class = JobCursorPagination
+
+    @property
+    def paginator(self):
+        """
+        Offset pagination stays the default, clients opt in to keyset
+        pagination with `?pagination=cursor` (or by sending a `cursor`
+        returned from a previous page) so deep pages stay cheap.
+        Searches keep offset pagination, the cursor's created_at order
+        would replace their relevance order.
+        """
+
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            params = request.query_params if request is not None else {}
+            if not params.get(api_settings.SEARCH_PARAM) and (
+                params.get(values.PAGINATION_QUERY_PARAM) == values.CURSOR_PAGINATION
+                or self.cursor_pagination_class.cursor_query_param in params
+            ):
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_serializer_class(self):
+        if (
+            self.action in ("list", "facets")
+            and self.request.query_params.get("view") == values.SUMMARY_VIEW
+        ):
+            return JobSummarySerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if self.request.user.is_authenticated and self.request.user.user_type != "Employer":
-            queryset = queryset.annotate(
-                has_applied=Case(
-                    When(applicants__user=UserProfile.objects.get(user=self.request.user), then=Value(True)),
-                    default=Value(False),
-                    output_field=BooleanField(),
+        # not reading the large description columns when
+        # the response is not going to contain them
+        if self.request.method == "GET":
+            serializer_class = self.get_serializer_class()
+            excluded = set(serializer_class.Meta.exclude)
+            deferred = [
+                field
+                for field in values.JOB_DESCRIPTION_FIELDS
+                if field in excluded
+                or not serializer_class.is_selected(field, self.request.query_params)
+            ]
+            if deferred:
+                queryset = queryset.defer(*deferred)
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        trending_keywords.record(request.query_params.get("search"))
+
+        cached_response = cache.lookup(request)
+        if cached_response is not None:
+            return cached_response
+
+        return self.list_rows(self.filter_queryset(self.get_queryset()))
+
+    def list_rows(self, queryset):
+        """
+        Paginated response of a read only listing, rendered from values()
+        rows instead of building a Job instance per row.
+
+        A search ranking left on the request by JobSearchFilter is paged
+        through in Python: only the jobs of the page are read, and put
+        in the order of the ranking.
+        """
+
+        serializer = self.get_values_serializer()
+        rows = serializer.values(queryset, *self.get_ordering_columns(queryset))
+
+        ranking = getattr(self.request, "search_ranking", None)
+        if ranking is not None:
+            page = self.paginate_queryset(ranking)
+            if page is not None:
+                position = {job_id: rank for rank, job_id in enumerate(page)}
+                rows = sorted(
+                    rows.filter(pk__in=page), key=lambda row: position[row[Job._meta.pk.attname]]
                 )
+                return self.get_paginated_response(serializer.serialize(rows))
+            rows = rows.order_by_ids(ranking)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        API: /jobs/facets
+        A page of the jobs matching the search and JobsFilter parameters,
+        like /jobs/, along with the number of matching jobs per category,
+        job type and experience bucket, counted with one grouped query
+        per facet. Anonymous responses go through the response cache.
+        """
+
+        trending_keywords.record(request.query_params.get("search"))
+
+        cached_response = cache.lookup(request)
+        if cached_response is not None:
+            return cached_response
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = self.list_rows(queryset)
+        response.data["facets"] = queryset.facet_counts()
+        return response
+
+    @action(detail=False, methods=["get"])
+    @extend_schema(
+        parameters=[AutocompleteQuerySerializer],
+        responses={200: AutocompleteSuggestionSerializer(many=True)},
+        tags=["jobs"]
+    )
+    def autocomplete(self, request):
+        """
+        API: /jobs/autocomplete?q=
+        Job roles, locations and company names starting with q, or with a
+        word starting with q, the ones with the most job postings first.
+        Answered from the search backend's in-memory index, without
+        querying the database.
+        """
+
+        serializer = AutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        suggestions = [
+            {"text": text, "kind": kind, "count": count}
+            for kind, text, count in search.get_backend().suggest(
+                serializer.validated_data["q"], serializer.validated_data["limit"]
             )
+        ]
+        return Response(
+            {"suggestions": AutocompleteSuggestionSerializer(suggestions, many=True).data}
+        )
 
-        return queryset
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated, IsJobSeeker]
+    )
+    def recommended(self, request):
+        """
+        API: /jobs/recommended
+        Active jobs ranked for the job seeker's profile: the TF-IDF
+        weighted similarity of the job's skills_required with the
+        profile's professional skills, blended with how well the profile's
+        experience fits the job's. Jobs sharing no skill with the profile
+        are left out.
+        """
+
+        profile = (
+            UserProfile.objects.filter(user=request.user)
+            .values("experience", "professional_skills")
+            .first()
+        )
+        job_ids = []
+        if profile is not None:
+            job_ids = recommendations.get_recommender().recommend(
+                profile, limit=values.JOBS_RECOMMENDED_MAX_RESULTS
+            )
+
+        return self.list_rows(
+            self.get_queryset().filter(pk__in=job_ids, is_active=True).order_by_ids(job_ids)
+        )
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        """
+        API: /jobs/{id}/similar
+        Active jobs whose role, skills and description are the most
+        similar to the job's, estimated from MinHash signatures. Only the
+        jobs sharing a locality sensitive hashing bucket with the job are
+        compared, see apps.jobs.similarity.
+        """
+
+        job = generics.get_object_or_404(Job.objects.only("pk"), pk=pk)
+
+        active = self.get_queryset().filter(is_active=True)
+        job_ids = similarity.similar_jobs(job.pk, active, values.JOBS_SIMILAR_LIMIT)
+        return self.list_rows(active.filter(pk__in=job_ids).order_by_ids(job_ids))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                values.EXPORT_FORMAT_QUERY_PARAM,
+                enum=values.EXPORT_FORMATS,
+                description="Format of the export, ndjson by default",
+            )
+        ],
+        responses={
+            (200, content_type): OpenApiTypes.STR
+            for content_type in values.EXPORT_CONTENT_TYPES.values()
+        },
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        API: /jobs/export
+        Every active job matching the search and JobsFilter parameters,
+        with its company name, streamed as NDJSON (one job per line, as
+        /jobs/ renders it) or, with ?export_format=csv, as CSV with one
+        column per field. ?fields= and ?omit= choose the fields. Jobs are
+        written in job_id order as they are read, JOBS_EXPORT_CHUNK_SIZE
+        at a time, so memory use does not grow with the number of jobs.
+        With ?search= every match is exported, not only the
+        JOBS_SEARCH_MAX_RESULTS a listing keeps, most relevant first.
+        """
+
+        export_format = request.query_params.get(
+            values.EXPORT_FORMAT_QUERY_PARAM, values.NDJSON_EXPORT
+        )
+        if export_format not in values.EXPORT_CONTENT_TYPES:
+            return response.create_response(
+                f"{values.EXPORT_FORMAT_QUERY_PARAM} must be one of "
+                + ", ".join(values.EXPORT_CONTENT_TYPES),
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(is_active=True)
+
+        if export_format == values.CSV_EXPORT:
+            serializer = ValuesSerializer(self.get_serializer())
+        else:
+            serializer = self.get_values_serializer()
+        # the company name is read with the same query, through a join
+        rows = serializer.values(queryset, "company__name", "job_id")
+        ranking = getattr(request, "search_ranking", None)
+        if ranking is None:
+            rows = export.keyset_batches(rows, "job_id", values.JOBS_EXPORT_CHUNK_SIZE)
+        else:
+            rows = export.ranked_batches(rows, "job_id", ranking, values.JOBS_EXPORT_CHUNK_SIZE)
+        records = (
+            {**serializer.to_representation(row), "company_name": row["company__name"]}
+            for row in rows
+        )
+
+        if export_format == values.CSV_EXPORT:
+            header = [name for name, *_ in serializer.fields] + ["company_name"]
+            lines = export.csv_lines(records, header)
+        else:
+            lines = export.ndjson_lines(records)
+
+        streamed = StreamingHttpResponse(
+            lines, content_type=values.EXPORT_CONTENT_TYPES[export_format]
+        )
+        streamed["Content-Disposition"] = f'attachment; filename="jobs.{export_format}"'
+        return streamed
+
+    @property
+    def search_capped(self):
+        """Whether ?search= keeps only the JOBS_SEARCH_MAX_RESULTS best matches"""
+
+        return self.action != "export"
+
+    def get_values_serializer(self):
+        return JobValuesSerializer(self.get_serializer())
+
+    def get_ordering_columns(self, queryset):
+        """
+        Columns the listing is sorted on, which the cursor pagination
+        needs on every row even when they are not part of the response
+        """
+
+        ordering = [
+            *(
+                JobOrderingFilter().get_ordering(self.request, queryset, self)
+                or queryset.query.order_by
+            ),
+            *getattr(self.paginator, "ordering", ()),
+        ]
+        columns = [Job._meta.pk.attname]
+        for field in ordering:
+            if not isinstance(field, str):
+                # e.g. the search relevance
+                continue
+            try:
+                model_field = Job._meta.get_field(field.lstrip("-"))
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete:
+                columns.append(model_field.attname)
+        return columns
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is not None:
+            not_modified = validators.not_modified(request)
+            if not_modified is not None:
+                return validators.apply(not_modified)
+
+        response = cache.lookup(request)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return validators.apply(response) if validators is not None else response
+
+    def get_validators(self):
+        """
+        ETag/Last-Modified of the requested job, read with a primary
+        key lookup of the two columns its version depends on
+        """
+
+        try:
+            version = (
+                Job.objects.filter(pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+                .values_list("updated_at", "applicants_count")
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            # left to get_object to turn into a 404
+            return None
+
+        if version is None:
+            return None
+        updated_at, applicants_count = version
+        return Validators(self.request, updated_at, applicants_count)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return cache.store(request, response)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.mark_applied_jobs(page)
+        return page
+
+    def get_object(self):
+        job = super().get_object()
+        self.mark_applied_jobs([job])
+        return job
+
+    def mark_applied_jobs(self, jobs):
+        """
+        Set has_applied on the jobs being returned to a job seeker.
+
+        The applied status is resolved for only the job ids on the current
+        page with one lookup on tbl_applicants, instead of joining the
+        applicants table into the listing query itself. jobs can be Job
+        instances or values() rows.
+        """
+
+        user = self.request.user
+        if not user.is_authenticated or user.user_type == values.EMPLOYER or not jobs:
+            return
+
+        rows = isinstance(jobs[0], dict)
+        job_ids = [job["job_id"] if rows else job.job_id for job in jobs]
+        applied_job_ids = set(
+            Applicants.objects.filter(user__user=user, job_id__in=job_ids).values_list(
+                "job_id", flat=True
+            )
+        )
+        for job, job_id in zip(jobs, job_ids):
+            if rows:
+                job["has_applied"] = job_id in applied_job_ids
+            else:
+                job.has_applied = job_id in applied_job_ids
 
     def create(self, request, *args, **kwargs):
-        """Overriding the create method to include permissions"""
+        """
+        Overriding the create method to include permissions.
+        A job whose role and description are a near-duplicate of a live
+        job of the company (SimHash fingerprints, see apps.jobs.similarity)
+        is rejected with 409 and the id of that job, ?allow_duplicate=true
+        posts it anyway and returns duplicate_of with the new job_id.
+        """
 
         # validate if the user is eligible to create a job posting or not
         if (
@@ -88,11 +468,179 @@ class JobViewSets(viewsets.ModelViewSet):
         request.data["employer"] = request.user
 
         job = Job(**request.data)
+
+        # reposts of an active job of the company are rejected, unless asked for
+        duplicate_of = similarity.find_duplicate(
+            job.company_id,
+            {field: getattr(job, field) for field in similarity.FINGERPRINT_FIELDS},
+            Job.objects.filter(is_active=True),
+        )
+        if duplicate_of is not None and not self.allows_duplicates():
+            return Response(
+                {
+                    "error": {
+                        "message": "A near-duplicate of this job is already posted,"
+                        f" pass ?{values.ALLOW_DUPLICATE_QUERY_PARAM}=true to post it anyway"
+                    },
+                    "duplicate_of": duplicate_of,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
         job.save()
 
-        return Response(
-            {"msg": "Created", "job_id": job.job_id}, status=status.HTTP_201_CREATED
+        data = {"msg": "Created", "job_id": job.job_id}
+        if duplicate_of is not None:
+            data["duplicate_of"] = duplicate_of
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        permission_classes=[IsAuthenticated, IsEmployer, IsProfileCompleted],
+    )
+    def bulk_create(self, request):
+        """
+        API: POST /jobs/bulk
+        Create several job postings from a list. Every posting is validated
+        with BulkJobSerializer first; if any of them is invalid nothing is
+        created and the errors are returned per posting, in request order.
+        Valid lists are inserted with bulk_create in one transaction.
+
+        Postings are checked for reposts like single ones, against the
+        company's active jobs and the earlier postings of the list. When
+        one is a near-duplicate nothing is created: 409 with, per
+        posting, null or the job_id (duplicate_of) or list position
+        (duplicate_of_posting) it repeats. ?allow_duplicate=true creates
+        them anyway and returns duplicates_of, the job_id every posting
+        repeats or null.
+        """
+
+        if not isinstance(request.data, list) or not request.data:
+            return response.create_response(
+                "Expected a non empty list of jobs", status.HTTP_400_BAD_REQUEST
+            )
+        if len(request.data) > values.JOBS_BULK_CREATE_LIMIT:
+            return response.create_response(
+                f"At most {values.JOBS_BULK_CREATE_LIMIT} jobs can be created at once",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            company = Company.objects.get(creator=request.user)
+        except Company.DoesNotExist:
+            raise exceptions.PermissionDenied("Create a company before posting jobs")
+
+        serializer = BulkJobSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        duplicates = similarity.find_duplicates(
+            company.pk,
+            [
+                {field: job.get(field) for field in similarity.FINGERPRINT_FIELDS}
+                for job in serializer.validated_data
+            ],
+            Job.objects.filter(is_active=True),
         )
+        has_duplicates = any(duplicate is not None for duplicate in duplicates)
+        if has_duplicates and not self.allows_duplicates():
+            return Response(
+                {
+                    "error": {
+                        "message": "Some of these jobs are near-duplicates of posted jobs,"
+                        f" pass ?{values.ALLOW_DUPLICATE_QUERY_PARAM}=true to post them anyway"
+                    },
+                    "duplicates": [
+                        None
+                        if duplicate is None
+                        else {"duplicate_of_posting": duplicate}
+                        if isinstance(duplicate, int)
+                        else {"duplicate_of": duplicate}
+                        for duplicate in duplicates
+                    ],
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        jobs = Job.objects.bulk_create(
+            [
+                Job(company=company, employer=request.user, **job)
+                for job in serializer.validated_data
+            ],
+            batch_size=values.JOBS_BULK_CREATE_BATCH_SIZE,
+        )
+
+        data = {"msg": "Created", "job_ids": [job.job_id for job in jobs]}
+        if has_duplicates:
+            data["duplicates_of"] = [
+                jobs[duplicate].job_id if isinstance(duplicate, int) else duplicate
+                for duplicate in duplicates
+            ]
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def allows_duplicates(self):
+        """Whether ?allow_duplicate=true asks to post near-duplicates anyway"""
+
+        return self.request.query_params.get(
+            values.ALLOW_DUPLICATE_QUERY_PARAM, ""
+        ).lower() in ("true", "1")
+
+    @extend_schema(request=BulkJobStatusSerializer)
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_status(self, request):
+        """
+        API: POST /jobs/bulk_status
+        Close (deactivate) or soft delete several jobs at once. Employers
+        can only change their own jobs, moderators any job. Ownership is
+        checked with one query, the jobs are changed with one UPDATE and
+        the outcome is reported for every job id.
+        """
+
+        is_moderator = Moderator().has_permission(request, self)
+        if not (is_moderator or request.user.user_type == values.EMPLOYER):
+            raise exceptions.PermissionDenied()
+
+        serializer = BulkJobStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job_ids = list(dict.fromkeys(serializer.validated_data["job_ids"]))
+        delete = serializer.validated_data["operation"] == values.DELETE_JOBS
+
+        with transaction.atomic():
+            jobs = {
+                job["job_id"]: job
+                for job in Job.all_objects.select_for_update()
+                .filter(job_id__in=job_ids)
+                .values("job_id", "employer_id", "is_active", "is_deleted")
+            }
+
+            outcomes, changed = [], []
+            for job_id in job_ids:
+                job = jobs.get(job_id)
+                if job is None or (job["is_deleted"] and not delete):
+                    outcome = values.JOB_NOT_FOUND
+                elif not is_moderator and job["employer_id"] != request.user.id:
+                    outcome = values.JOB_FORBIDDEN
+                elif job["is_deleted"]:
+                    outcome = values.JOB_ALREADY_DELETED
+                elif not delete and not job["is_active"]:
+                    outcome = values.JOB_ALREADY_CLOSED
+                else:
+                    outcome = values.JOB_DELETED if delete else values.JOB_CLOSED
+                    changed.append(job_id)
+                outcomes.append({"job_id": job_id, "status": outcome})
+
+            if changed:
+                fields = {"is_active": False}
+                if delete:
+                    fields.update(is_created=False, is_deleted=True)
+                # update() doesn't touch auto_now fields
+                Job.all_objects.filter(job_id__in=changed).update(
+                    updated_at=timezone.now(), **fields
+                )
+
+        return Response({"updated": len(changed), "results": outcomes})
 
     def update(self, request, *args, **kwargs):
         """
@@ -136,7 +684,7 @@ class JobViewSets(viewsets.ModelViewSet):
 
         # check if the job is already deleted or not
         if validationClass.is_valid_uuid(pk):
-            job = Job.objects.filter(job_id=pk, is_created=False, is_deleted=True)
+            job = Job.all_objects.filter(job_id=pk, is_created=False, is_deleted=True)
             if job.exists():
                 return response.create_response(
                     "Given job_id does not exist or already deleted",
@@ -150,8 +698,10 @@ class JobViewSets(viewsets.ModelViewSet):
         # if user is employer don't remove the job from the db table
         # else, set is_created=False and is_deleted=True
         try:
-            updated_job_data = Job.objects.filter(job_id=pk)
-            updated_job_data.update(is_created=False, is_deleted=True, is_active=False)
+            updated_job_data = Job.all_objects.filter(job_id=pk)
+            updated_job_data.update(
+                is_created=False, is_deleted=True, is_active=False, updated_at=timezone.now()
+            )
             serialized_updated_job_data = JobSerializer(updated_job_data, many=True)
             return response.create_response(
                 serialized_updated_job_data.data, status.HTTP_200_OK
@@ -165,25 +715,57 @@ class JobViewSets(viewsets.ModelViewSet):
     def get_trending_keywords(self, request):
         """
         API: /get_trending_keywords
-        This API returns a list of trending keywords
+        This API returns a list of trending keywords, the most
+        searched ones recently, or the static list on a cold start
         """
 
         try:
             return response.create_response(
-                {"trending_keywords": values.trending_keywords}, status.HTTP_200_OK
+                {"trending_keywords": trending_keywords.top()}, status.HTTP_200_OK
             )
         except Exception:
             return response.create_response(
                 response.SOMETHING_WENT_WRONG, status.HTTP_400_BAD_REQUEST
             )
 
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated, Moderator]
+    )
+    def cache_stats(self, request):
+        """
+        API: /jobs/cache_stats
+        Hit/miss counters and table versions of the anonymous response cache
+        """
+
+        return Response(cache.get_stats())
+
     @action(detail=False, methods=["get"])
     @extend_schema(
         responses={200: JobsCountByCategoriesSerializer(many=True)},
+        parameters=[OpenApiParameter("live", bool, description="Only count active jobs")],
         tags=["jobs"]
     )
     def get_count_by_categories(self, request):
-        category_job_counts = Job.objects.values('category').annotate(count=Count('job_id'))
+        """
+        API: /jobs/get_count_by_categories
+        Number of jobs per category, read from the category rollup.
+        Pass ?live=true to only count active jobs; without it soft deleted
+        jobs are counted too, see JobCategoryCount.
+        """
+
+        counts = JobCategoryCount.objects.all()
+        if request.query_params.get("live", "").lower() in ("true", "1"):
+            counts = counts.filter(is_active=True)
+
+        category_job_counts = [
+            {"category": row["category"] or None, "count": row["count"]}
+            for row in counts.values("category")
+            .annotate(count=Sum("jobs_count"))
+            .filter(count__gt=0)
+            .order_by("category")
+        ]
         return Response(JobsCountByCategoriesSerializer(category_job_counts, many=True).data)
     
     
@@ -193,8 +775,30 @@ class JobViewSets(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated, IsEmployer]
     )
     def employer(self, request):
-        jobs = Job.objects.filter(employer = request.user).order_by('-created_at')
-        return Response(JobSerializer(jobs, many=True).data)
+        """
+        API: /jobs/employer
+        Paginated jobs of the employer, supporting the listing's filters,
+        with the number of applicants per application status. The page is
+        read with one query, plus the count of the offset pagination.
+        """
+
+        # the employer's live jobs, soft deleted ones are gone from the dashboard
+        jobs = self.filter_queryset(
+            Job.objects.filter(employer=request.user)
+            .order_by('-created_at')
+            .with_applicants_by_status()
+        )
+        serializer = JobValuesSerializer(
+            EmployerJobSerializer(context=self.get_serializer_context())
+        )
+        rows = serializer.values(
+            jobs, *self.get_ordering_columns(jobs), "applicants_by_status"
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
 
 
     
@@ -215,28 +819,71 @@ class CompanyViewSets(viewsets.ModelViewSet):
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
 
     # Basic filters
-    filter_backends = [df_filters.DjangoFilterBackend]
+    filter_backends = [df_filters.DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["name", "location"]
+    ordering_fields = ["active_jobs_count", "name", "founded_year"]
+    ordering = ["name"]
+    pagination_class = DefaultPagination
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return CompanyListSerializer
+        return super().get_serializer_class()
 
     def list(self, request):
         """
-        Method to return a list of companies available,
-        Along with the count of active jobs present in the company
+        Method to return a page of the companies available,
+        Along with the count of active jobs present in the company.
+        The count is a subquery of the listing's query, so a page costs
+        the same two queries (the page and the total) for any number of
+        companies. ?ordering=-active_jobs_count lists the companies
+        with the most active jobs first.
         """
 
+        active_jobs = (
+            Job.objects.filter(company=OuterRef("pk"), is_active=True)
+            .order_by()
+            .values("company")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        queryset = self.filter_queryset(
+            self.get_queryset()
+            .filter(is_deleted=False)
+            .annotate(active_jobs_count=Coalesce(Subquery(active_jobs), Value(0)))
+        )
+        # the pk breaks ties, so pages don't overlap when counts are equal
+        queryset = queryset.order_by(*queryset.query.order_by, "pk")
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is not None:
+            not_modified = validators.not_modified(request)
+            if not_modified is not None:
+                return validators.apply(not_modified)
+
+        response = super().retrieve(request, *args, **kwargs)
+        return validators.apply(response) if validators is not None else response
+
+    def get_validators(self):
+        """ETag/Last-Modified of the requested company, from its updated_at"""
+
         try:
-            company_data = self.queryset.filter(is_deleted=False)
-            serialized_company_data = self.serializer_class(
-                company_data, many=True, context={"request": request}
+            updated_at = (
+                Company.objects.filter(pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+                .values_list("updated_at", flat=True)
+                .first()
             )
+        except (TypeError, ValueError, ValidationError):
+            return None
 
-            return response.create_response(
-                serialized_company_data.data, status.HTTP_200_OK
-            )
-        except Exception:
-            return response.create_response(
-                response.SOMETHING_WENT_WRONG, status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        if updated_at is None:
+            return None
+        return Validators(self.request, updated_at)
 
     @extend_schema(exclude=True)
     def update(self, request, *args, **kwargs):
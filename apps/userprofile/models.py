@@ -22,6 +22,10 @@ class UserProfile(models.Model):
 
     class Meta:
         db_table = constants.DB_TABLE_USER_PROFILE
+        indexes = [
+            # UserProfileFilter profession/experience lookups
+            models.Index(fields=["profession", "experience"], name="profile_profession_exp_idx"),
+        ]
 
     # why are uuid fields used instead of the realtions in django
     # this should have been user relation to the accounts in the end
@@ -58,6 +62,10 @@ class UserProfile(models.Model):
     website = models.URLField(default=None, null=True)
     social_handles = models.URLField(default=None, null=True)
 
+    # changes when the profile is saved, so the cached match scores of
+    # the jobs it applied to are recomputed (apps.applicants.ranking)
+    updated_at = models.DateTimeField(auto_now=True)
+
 
 class FavoriteProfiles(models.Model):
     """
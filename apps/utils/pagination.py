@@ -1,7 +1,194 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
 
 class DefaultPagination(pagination.LimitOffsetPagination):
     default_limit = 10
     max_limit = 100
 
-    
\ No newline at end of file
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Cursor pagination over a composite, unique sort key.
+
+    DRF's CursorPagination only keys on the first ordering field and falls
+    back to an offset for ties. Here the whole ordering (plus `unique_field`
+    as a tie breaker) is encoded in the cursor and applied as a row
+    comparison in the WHERE clause, so every page costs the same index range
+    scan no matter how deep the client scrolls, and no COUNT(*) is issued.
+    """
+
+    page_size = 10
+    max_page_size = 100
+    page_size_query_param = "limit"
+    ordering = ("-created_at",)
+    unique_field = "pk"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor["reverse"]
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self._position_filter(ordering, self.cursor["position"])
+            )
+
+        # fetching one extra row tells us if there is another page
+        # in the direction we are moving without running a COUNT(*)
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the requested ordering restricted to plain, non-nullable
+        model fields, with the unique field appended as a tie breaker.
+        """
+
+        ordering = None
+        for filter_cls in getattr(view, "filter_backends", []):
+            if hasattr(filter_cls, "get_ordering"):
+                ordering = filter_cls().get_ordering(request, queryset, view)
+                break
+
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        fields = [field for field in ordering or () if self._is_keyset_field(field)]
+        if not fields:
+            fields = list(self.ordering)
+
+        unique_field = self.model._meta.pk.name if self.unique_field == "pk" else self.unique_field
+        if unique_field not in [field.lstrip("-") for field in fields]:
+            fields.append(unique_field)
+
+        return tuple(fields)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._build_link(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            if len(cursor["p"]) != len(self.ordering):
+                raise ValueError("cursor does not match the ordering")
+            position = [
+                self._get_field(field).to_python(value)
+                for field, value in zip(self.ordering, cursor["p"])
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return {"position": position, "reverse": bool(cursor.get("r"))}
+
+    def encode_cursor(self, cursor):
+        encoded = urlsafe_b64encode(
+            json.dumps({"p": cursor["position"], "r": int(cursor["reverse"])}).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def _build_link(self, row, reverse):
+        position = [self._serialize_value(self._row_value(row, field)) for field in self.ordering]
+        return self.encode_cursor({"position": position, "reverse": reverse})
+
+    def _position_filter(self, ordering, position):
+        """
+        Build `(a, b, c) > (x, y, z)` as
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`,
+        with the comparison flipped for descending fields.
+        """
+
+        condition = Q()
+        equal_prefix = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        return condition
+
+    def _is_keyset_field(self, field):
+        try:
+            model_field = self._get_field(field)
+        except FieldDoesNotExist:
+            return False
+        return model_field.concrete and not model_field.is_relation and not model_field.null
+
+    def _get_field(self, field):
+        return self.model._meta.get_field(field.lstrip("-"))
+
+    def _row_value(self, row, field):
+        name = self._get_field(field).attname
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def _serialize_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return value
+        return str(value)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+
+class JobCursorPagination(KeysetPagination):
+    """Keyset pagination for the job listing, newest first"""
+
+    ordering = ("-created_at", "job_id")
+    unique_field = "job_id"
@@ -0,0 +1,151 @@
+from rest_framework import serializers
+
+# fields whose to_representation returns the value values() gives back
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    serializers.URLField,
+)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin letting GET requests choose the fields they get back.
+
+    ?fields=a,b keeps only the listed fields and ?omit=c,d drops the listed
+    ones. `field_groups` maps a name clients can use to several fields,
+    e.g. a nested block built in to_representation.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+    field_groups = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        for name in list(self.fields):
+            if not self.is_selected(name, request.query_params):
+                self.fields.pop(name)
+
+    @classmethod
+    def parse_names(cls, value):
+        names = set()
+        for name in (value or "").split(","):
+            name = name.strip()
+            if name:
+                names.update(cls.field_groups.get(name, (name,)))
+        return names
+
+    @classmethod
+    def is_selected(cls, name, query_params):
+        """Whether the field `name` is part of the response for these params"""
+
+        fields = cls.parse_names(query_params.get(cls.fields_query_param))
+        omit = cls.parse_names(query_params.get(cls.omit_query_param))
+        return (not fields or name in fields) and name not in omit
+
+
+def get_converter(field):
+    """
+    Return the function turning a value read with QuerySet.values() into
+    what field.to_representation returns for it, or None when the value
+    can be used as is
+    """
+
+    if isinstance(field, serializers.RelatedField):
+        # a primary key related field renders the pk, which values()
+        # already returns for the <name>_id column
+        return None
+    if type(field) in IDENTITY_FIELDS:
+        return None
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path rendering QuerySet.values() rows into exactly the
+    data a ModelSerializer renders for the same model instances.
+
+    The fields of a bound serializer (so after sparse fieldsets and the
+    like were applied) are compiled once into (name, column, converter)
+    entries. Serializing a row is then a loop over those entries, without
+    building model instances or walking the DRF field machinery per row.
+    Nested serializers are compiled with their source as a column prefix,
+    using their `values_serializer_class` when they define one.
+
+    Fields that are not model columns (e.g. has_applied) are read from the
+    row when present and left out otherwise, like DRF does with attributes
+    that are missing on an instance.
+    """
+
+    def __init__(self, serializer, prefix=""):
+        model = serializer.Meta.model
+        columns = {field.name: field for field in model._meta.concrete_fields}
+
+        self.prefix = prefix
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.BaseSerializer):
+                nested_class = getattr(field, "values_serializer_class", ValuesSerializer)
+                nested = nested_class(field, prefix=f"{prefix}{field.source}__")
+                self.fields.append((name, None, nested, True))
+            elif field.source in columns:
+                column = prefix + columns[field.source].attname
+                self.fields.append((name, column, get_converter(field), True))
+            else:
+                self.fields.append((name, prefix + name, get_converter(field), False))
+
+    @property
+    def columns(self):
+        """The values() lookups needed to render a row"""
+
+        columns = []
+        for _, column, converter, required in self.fields:
+            if isinstance(converter, ValuesSerializer):
+                columns.extend(converter.columns)
+            elif required:
+                columns.append(column)
+        return columns
+
+    def values(self, queryset, *extra):
+        """Return queryset.values() with the columns to render, plus extra"""
+
+        return queryset.values(*dict.fromkeys([*self.columns, *extra]))
+
+    def to_representation(self, row):
+        data = {}
+        for name, column, converter, required in self.fields:
+            if isinstance(converter, ValuesSerializer):
+                data[name] = converter.to_representation(row)
+                continue
+
+            if not required and column not in row:
+                continue
+
+            value = row[column]
+            if value is None or converter is None:
+                data[name] = value
+            else:
+                data[name] = converter(value)
+
+        return self.finalize(data)
+
+    def finalize(self, data):
+        """Hook for the changes a serializer's to_representation makes"""
+
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
@@ -110,6 +110,38 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The version counters of apps.jobs.cache live in this cache. They
+# invalidate the cached /jobs/ responses and keep the search indexes and
+# the recommendations of every worker fresh, so with several workers
+# CACHE_BACKEND/CACHE_LOCATION must point to a shared backend (redis,
+# memcached): with locmem a write on one worker is never seen by the
+# others. A process local backend is refused at startup unless
+# JOBS_CACHE_ALLOW_LOCAL is set, for single process runs.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "null-jobs"),
+    }
+}
+
+JOBS_CACHE_ALLOW_LOCAL = os.getenv("JOBS_CACHE_ALLOW_LOCAL", str(DEBUG)) == "True"
+
+# seconds an anonymous /jobs/ response stays in the cache
+JOBS_RESPONSE_CACHE_TIMEOUT = int(os.getenv("JOBS_RESPONSE_CACHE_TIMEOUT", 300))
+
+# search backend of /jobs/?search=, a subclass of apps.jobs.search.backends.SearchBackend
+JOBS_SEARCH_BACKEND = os.getenv(
+    "JOBS_SEARCH_BACKEND", "apps.jobs.search.backends.InvertedIndexBackend"
+)
+
+# most relevant jobs, among those passing the other filters, kept for a /jobs/?search=
+JOBS_SEARCH_MAX_RESULTS = int(os.getenv("JOBS_SEARCH_MAX_RESULTS", 1000))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -2,3 +2,6 @@ from .settings import *
 
 DATABASES["default"]["ENGINE"] = "django.db.backends.sqlite3"
 DATABASES["default"]["NAME"] = "mytestdatabase"
+
+# the test runner is a single process
+JOBS_CACHE_ALLOW_LOCAL = True